@@ -4,10 +4,14 @@ Script to create/update a GitHub Gist with metrics data
 """
 
 import os
+import sys
 import json
-import requests
 from datetime import datetime, timezone
 
+# Reuse the tracker's pooled HTTP transport from the repository root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from github_metrics_tracker import create_transport  # noqa: E402
+
 GIST_TOKEN = os.environ.get('GITHUB_TOKEN')  # Fallback to GITHUB_TOKEN if GIST_TOKEN not set
 GIST_ID = os.environ.get('GIST_ID')  # Optional: specify existing gist ID
 
@@ -90,10 +94,13 @@ Generated by [GitHub Metrics Tracker](https://github.com/amuzetnoM/amuzetnoM)
         'Accept': 'application/vnd.github.v3+json'
     }
     
+    transport = create_transport()
+    
     try:
         if GIST_ID:
             # Update existing gist
-            response = requests.patch(
+            response = transport.request(
+                'PATCH',
                 f'https://api.github.com/gists/{GIST_ID}',
                 headers=headers,
                 json=gist_data
@@ -110,7 +117,8 @@ Generated by [GitHub Metrics Tracker](https://github.com/amuzetnoM/amuzetnoM)
                 print(response.text)
         else:
             # Create new gist
-            response = requests.post(
+            response = transport.request(
+                'POST',
                 'https://api.github.com/gists',
                 headers=headers,
                 json=gist_data
@@ -131,6 +139,8 @@ Generated by [GitHub Metrics Tracker](https://github.com/amuzetnoM/amuzetnoM)
     
     except Exception as e:
         print(f"❌ Error creating/updating gist: {e}")
+    finally:
+        transport.close()
 
 if __name__ == '__main__':
     create_or_update_gist()
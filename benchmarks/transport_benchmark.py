@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Transport Benchmark - per-request latency of bare requests.get vs the pooled transport
+
+Starts a local stub API server and times the same sequence of GET requests
+made through a fresh connection each time (the tracker's old behaviour) and
+through the keep-alive HTTPTransport. With --tls the stub serves HTTPS using a
+throwaway self-signed certificate, which makes the saved handshakes visible.
+"""
+
+import argparse
+import json
+import os
+import socket
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import warnings
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from github_metrics_tracker import HTTPTransport  # noqa: E402
+
+PAYLOAD = json.dumps({'name': 'repo', 'stargazers_count': 42, 'topics': ['a'] * 50}).encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answer every GET with a small JSON body over a keep-alive connection."""
+    
+    protocol_version = 'HTTP/1.1'
+    
+    def setup(self):
+        super().setup()
+        # Headers and body are written separately; avoid Nagle/delayed-ACK stalls
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(tls: bool):
+    """Start the stub server on an ephemeral port and return (server, base_url)."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    scheme = 'http'
+    if tls:
+        cert_dir = tempfile.mkdtemp()
+        cert, key = os.path.join(cert_dir, 'cert.pem'), os.path.join(cert_dir, 'key.pem')
+        subprocess.run(
+            ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+             '-subj', '/CN=127.0.0.1', '-keyout', key, '-out', cert],
+            check=True, capture_output=True
+        )
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert, key)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        scheme = 'https'
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'{scheme}://127.0.0.1:{server.server_address[1]}'
+
+
+def time_requests(get, url: str, count: int) -> float:
+    """Return the mean latency in milliseconds of `count` sequential GETs."""
+    get(url)  # warm up
+    start = time.perf_counter()
+    for _ in range(count):
+        get(url).json()
+    return (time.perf_counter() - start) / count * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the pooled HTTP transport against bare requests.get')
+    parser.add_argument('--requests', type=int, default=500, help='Requests per transport (default: 500)')
+    parser.add_argument('--tls', action='store_true', help='Serve the stub over HTTPS (requires openssl)')
+    args = parser.parse_args()
+    
+    warnings.filterwarnings('ignore', message='Unverified HTTPS request')
+    server, base_url = start_server(args.tls)
+    url = f'{base_url}/repos/user/repo'
+    
+    transport = HTTPTransport()
+    transport.session.verify = False
+    transport.session.trust_env = False  # keep CA bundle env vars from re-enabling verification
+    
+    bare = time_requests(lambda u: requests.get(u, verify=False), url, args.requests)
+    pooled = time_requests(transport.get, url, args.requests)
+    
+    transport.close()
+    server.shutdown()
+    
+    print(f"Stub server:      {base_url} ({args.requests} requests each)")
+    print(f"requests.get:     {bare:.3f} ms/request")
+    print(f"HTTPTransport:    {pooled:.3f} ms/request")
+    print(f"Speedup:          {bare / pooled:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
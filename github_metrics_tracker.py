@@ -5,32 +5,2753 @@ Tracks all GitHub metrics exhaustively across all repositories
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from array import array
+import asyncio
+import functools
+import gzip
+import hashlib
 import json
 import csv
+import heapq
+import itertools
 import os
+import sqlite3
 import sys
-from datetime import datetime, timedelta, timezone
-from collections import defaultdict
-from typing import Dict, List, Any, Optional
+from datetime import date, datetime, timedelta, timezone
+from html import escape
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Any, Optional, Tuple
+from urllib.parse import urlencode, urlparse, parse_qs
+import re
+import shutil
+import tempfile
+import threading
 import time
 
+try:
+    import httpx
+    import h2  # noqa: F401  (httpx only negotiates HTTP/2 when h2 is installed)
+except ImportError:
+    httpx = None
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+class HTTPTransport:
+    """
+    Pooled keep-alive HTTP transport.
+    
+    Holds one persistent session, so TLS connections to api.github.com are
+    reused across requests instead of being re-established for each one.
+    """
+    
+    # Exceptions raised by this transport for network and HTTP status errors
+    errors = (requests.exceptions.RequestException,)
+    
+    def __init__(self, pool_size: int = 10):
+        """
+        Initialize the transport.
+        
+        Args:
+            pool_size: Maximum number of keep-alive connections held per host
+        """
+        self.pool_size = pool_size
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers['Accept-Encoding'] = 'gzip, deflate'
+    
+    def request(self, method: str, url: str, headers: Optional[Dict] = None,
+                params: Optional[Dict] = None, json: Optional[Any] = None):
+        """Send a request over the pooled session and return the response."""
+        return self.session.request(method, url, headers=headers, params=params, json=json)
+    
+    def get(self, url: str, headers: Optional[Dict] = None, params: Optional[Dict] = None):
+        """Send a GET request over the pooled session and return the response."""
+        return self.request('GET', url, headers=headers, params=params)
+    
+    def close(self):
+        """Close all pooled connections."""
+        self.session.close()
+
+
+class HTTP2Transport(HTTPTransport):
+    """
+    HTTP/2 transport backed by httpx.
+    
+    Multiplexes concurrent requests over a single connection per host.
+    Requires `httpx` and `h2` to be installed.
+    """
+    
+    def __init__(self, pool_size: int = 10):
+        """
+        Initialize the transport.
+        
+        Args:
+            pool_size: Maximum number of connections held per host
+        """
+        if httpx is None:
+            raise RuntimeError('HTTP/2 transport requires httpx and h2 (pip install "httpx[http2]")')
+        self.pool_size = pool_size
+        # httpx responses raise a plain json.JSONDecodeError (a ValueError) on bad bodies, where
+        # requests raises its own RequestException subclass
+        self.errors = (httpx.HTTPError, ValueError)
+        self.session = httpx.Client(
+            http2=True,
+            follow_redirects=True,
+            headers={'Accept-Encoding': 'gzip, deflate'},
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        )
+
+
+def create_transport(pool_size: int = 10, http2: bool = False) -> HTTPTransport:
+    """Create the best available transport, falling back to HTTP/1.1 when HTTP/2 is unavailable."""
+    if http2:
+        if httpx is not None:
+            return HTTP2Transport(pool_size=pool_size)
+        print("Warning: httpx[http2] is not installed, falling back to HTTP/1.1 keep-alive transport")
+    return HTTPTransport(pool_size=pool_size)
+
+
+class ConditionalRequestCache:
+    """
+    Persistent HTTP cache for conditional requests.
+    
+    Stores the ETag/Last-Modified validators and body of every cacheable
+    response in a SQLite file, keyed by URL, query parameters, Accept
+    header and the account the token authenticates as, so a body fetched for
+    one account is never served to another, while a fresh token of the same
+    account (GITHUB_TOKEN changes every job) still finds its entries. Later
+    runs send the validators back; GitHub answers unchanged
+    resources with 304 Not Modified, which does not count against the rate
+    limit, and the cached body is served instead. The total body size is
+    capped, evicting least recently used entries first.
+    """
+    
+    # Response headers replayed alongside a cached body (pagination needs Link)
+    PRESERVED_HEADERS = ('Link',)
+    
+    def __init__(self, path: str, max_bytes: int = 100 * 1024 * 1024):
+        """
+        Open (or create) the cache.
+        
+        Args:
+            path: SQLite file holding the cache
+            max_bytes: Maximum total size of cached bodies before LRU eviction
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body TEXT, size INTEGER, last_used REAL, '
+            'headers TEXT)'
+        )
+        columns = [row[1] for row in self._db.execute('PRAGMA table_info(responses)')]
+        if 'headers' not in columns:
+            self._db.execute('ALTER TABLE responses ADD COLUMN headers TEXT')
+        self._db.execute('CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)')
+        self._total_bytes = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+    
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+                 identity: Optional[str] = None) -> str:
+        """Build the cache key for a request, given its headers and the account its token authenticates as."""
+        key = url
+        if params:
+            key += '?' + urlencode(sorted(params.items()))
+        accept = (headers or {}).get('Accept')
+        if accept:
+            key += f'|{accept}'
+        if identity:
+            key += f'|{identity}'
+        return key
+    
+    def validators(self, key: str) -> Dict[str, str]:
+        """Return the conditional request headers for a cached entry (empty if not cached)."""
+        with self._lock:
+            row = self._db.execute('SELECT etag, last_modified FROM responses WHERE key = ?', (key,)).fetchone()
+        if not row:
+            return {}
+        headers = {}
+        if row[0]:
+            headers['If-None-Match'] = row[0]
+        if row[1]:
+            headers['If-Modified-Since'] = row[1]
+        return headers
+    
+    def get(self, key: str) -> Optional[Tuple[Any, Dict[str, str]]]:
+        """Return the cached body and preserved headers for a 304 response, marking the entry as recently used."""
+        with self._lock:
+            row = self._db.execute('SELECT body, headers FROM responses WHERE key = ?', (key,)).fetchone()
+            if not row:
+                return None
+            self._db.execute('UPDATE responses SET last_used = ? WHERE key = ?', (time.time(), key))
+            self._db.commit()
+            self.hits += 1
+        return json.loads(row[0]), json.loads(row[1] or '{}')
+    
+    def store(self, key: str, response_headers: Dict, data: Any):
+        """Store a 200 response if it carries a validator, evicting old entries past the size cap."""
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+        with self._lock:
+            self.misses += 1
+            if not etag and not last_modified:
+                return
+            body = json.dumps(data, separators=(',', ':'))
+            size = len(body)
+            if size > self.max_bytes:
+                return
+            
+            preserved = {name: response_headers[name] for name in self.PRESERVED_HEADERS if name in response_headers}
+            
+            old = self._db.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            if old:
+                self._total_bytes -= old[0]
+            self._db.execute(
+                'INSERT OR REPLACE INTO responses (key, etag, last_modified, body, size, last_used, headers) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, etag, last_modified, body, size, time.time(), json.dumps(preserved))
+            )
+            self._total_bytes += size
+            
+            # Evict least recently used entries until back under the cap
+            while self._total_bytes > self.max_bytes:
+                oldest = self._db.execute(
+                    'SELECT key, size FROM responses ORDER BY last_used LIMIT 1'
+                ).fetchone()
+                if not oldest:
+                    break
+                self._db.execute('DELETE FROM responses WHERE key = ?', (oldest[0],))
+                self._total_bytes -= oldest[1]
+            self._db.commit()
+    
+    def hit_rate(self) -> float:
+        """Fraction of cacheable requests served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+    
+    def close(self):
+        """Close the cache database."""
+        with self._lock:
+            self._db.close()
+
+
+class RateLimitGovernor:
+    """
+    Proactive, thread-safe pacing of API requests against GitHub's rate limits.
+    
+    Reads the X-RateLimit-* headers of every response and tracks the core,
+    search and graphql budgets separately. Once a budget drops below a
+    fraction of its limit, requests draw from a token bucket refilled at
+    remaining / seconds-until-reset, so the rest of the budget is spread over
+    the window instead of being burnt early and stalling until the reset.
+    Secondary rate limits are honoured through Retry-After.
+    """
+    
+    BUCKETS = ('core', 'search', 'graphql')
+    
+    def __init__(self, burst: int = 10, pace_below: float = 0.5):
+        """
+        Initialize the governor.
+        
+        Args:
+            burst: Requests a paced bucket may issue back to back
+            pace_below: Fraction of the limit below which a bucket's requests are paced
+        """
+        self.burst = burst
+        self.pace_below = pace_below
+        self._lock = threading.Lock()
+        self._buckets = {name: self._new_bucket() for name in self.BUCKETS}
+    
+    def _new_bucket(self) -> Dict[str, Any]:
+        return {'limit': None, 'remaining': None, 'reset_at': 0.0, 'rate': None,
+                'tokens': float(self.burst), 'refilled_at': time.time(), 'blocked_until': 0.0}
+    
+    @staticmethod
+    def bucket_for(url: str) -> str:
+        """Return the rate limit bucket a request URL is charged to."""
+        path = urlparse(url).path
+        if path.endswith('/graphql'):
+            return 'graphql'
+        if '/search/' in path:
+            return 'search'
+        return 'core'
+    
+    def _bucket(self, name: str) -> Dict[str, Any]:
+        if name not in self._buckets:
+            self._buckets[name] = self._new_bucket()
+        return self._buckets[name]
+    
+    def acquire(self, name: str):
+        """Block until the bucket allows another request."""
+        with self._lock:
+            bucket = self._bucket(name)
+            now = time.time()
+            # Count the request against the budget until the response reports the real figure
+            if bucket['remaining'] is not None:
+                bucket['remaining'] -= 1
+            if bucket['blocked_until'] > now:
+                wait_time = bucket['blocked_until'] - now
+            elif bucket['rate'] is None or (
+                    bucket['limit'] and bucket['remaining'] > bucket['limit'] * self.pace_below):
+                wait_time = 0.0
+            else:
+                bucket['tokens'] = min(self.burst, bucket['tokens'] + (now - bucket['refilled_at']) * bucket['rate'])
+                bucket['refilled_at'] = now
+                # Reserve a token even when none is available, so concurrent
+                # callers queue up behind each other instead of all waking at once
+                bucket['tokens'] -= 1
+                wait_time = -bucket['tokens'] / bucket['rate'] if bucket['tokens'] < 0 else 0.0
+        if wait_time > 10:
+            print(f"Pacing {name} rate limit budget. Waiting {int(wait_time)} seconds...")
+        if wait_time > 0:
+            time.sleep(wait_time)
+    
+    def set_budget(self, name: str, remaining: int, reset_at: float, limit: Optional[int] = None):
+        """Record a bucket's remaining budget and reset time, recomputing its refill rate."""
+        with self._lock:
+            bucket = self._bucket(name)
+            now = time.time()
+            bucket['remaining'] = remaining
+            bucket['reset_at'] = reset_at
+            if limit is not None:
+                bucket['limit'] = limit
+            if remaining <= 0:
+                bucket['blocked_until'] = max(bucket['blocked_until'], reset_at + 1)
+            bucket['rate'] = max(remaining, 1) / max(reset_at - now, 1.0)
+    
+    def update(self, name: str, headers) -> str:
+        """Update a bucket from response headers, returning the bucket actually charged."""
+        name = headers.get('X-RateLimit-Resource') or name
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        if remaining is not None and reset is not None:
+            try:
+                limit = headers.get('X-RateLimit-Limit')
+                self.set_budget(name, int(remaining), float(reset), int(limit) if limit else None)
+            except ValueError:
+                pass
+        return name
+    
+    def backoff(self, name: str, response) -> Optional[float]:
+        """
+        Block the bucket after a rate-limited response and return the wait in seconds.
+        
+        Returns None when the response was not rate limited.
+        """
+        if response.status_code not in (403, 429):
+            return None
+        
+        headers = response.headers
+        retry_after = headers.get('Retry-After')
+        if retry_after:
+            try:
+                wait_time = float(retry_after)
+            except ValueError:
+                wait_time = 60.0
+        elif headers.get('X-RateLimit-Remaining') == '0':
+            wait_time = max(float(headers.get('X-RateLimit-Reset', 0)) - time.time(), 0) + 1
+        elif 'rate limit' in response.text.lower():
+            # Secondary rate limit without Retry-After: GitHub asks for at least a minute
+            wait_time = 60.0
+        else:
+            return None
+        
+        with self._lock:
+            bucket = self._bucket(name)
+            bucket['blocked_until'] = max(bucket['blocked_until'], time.time() + wait_time)
+        return wait_time
+    
+    def remaining(self, name: str) -> Optional[int]:
+        """Return the last known remaining budget of a bucket."""
+        with self._lock:
+            return self._bucket(name)['remaining']
+    
+    def available(self, name: str) -> Tuple[bool, float]:
+        """
+        Return a sortable measure of a bucket's headroom: whether it is unblocked,
+        then its remaining budget (infinite while no response has reported one).
+        """
+        with self._lock:
+            bucket = self._bucket(name)
+            remaining = bucket['remaining']
+            return (bucket['blocked_until'] <= time.time(),
+                    float('inf') if remaining is None else float(remaining))
+
+
+class TokenPool:
+    """
+    A set of GitHub tokens, each paced by its own rate limit governor.
+    
+    Repository-scoped requests go to the token with the most remaining budget in
+    the request's bucket, so throughput grows with the number of tokens. Private
+    repositories are only routed to tokens known to see them. Requests that
+    depend on who is authenticated (/user, listings, search) always use the
+    primary token, the first one in the pool.
+    """
+    
+    REPOSITORY_PATH = re.compile(r'^/repos/([^/]+/[^/]+)')
+    
+    def __init__(self, tokens: List[Optional[str]]):
+        """
+        Initialize the pool.
+        
+        Args:
+            tokens: Tokens in priority order; [None] for unauthenticated requests
+        """
+        self.tokens = list(tokens) or [None]
+        self.governors = [RateLimitGovernor() for _ in self.tokens]
+        # Account each token authenticates as, resolved on first use by the tracker
+        self.identities = [None] * len(self.tokens)
+        self.identity_lock = threading.Lock()
+        self._visibility = {}
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self.tokens)
+    
+    @property
+    def primary(self) -> RateLimitGovernor:
+        """The governor of the primary token."""
+        return self.governors[0]
+    
+    def restrict(self, repo_full_name: str, token_indexes: List[int]):
+        """Route a private repository's requests only to the given tokens."""
+        with self._lock:
+            self._visibility[repo_full_name] = set(token_indexes)
+    
+    def select(self, url: str, repos: Optional[List[str]] = None) -> int:
+        """
+        Choose the token for a request and return its index.
+        
+        Args:
+            url: Request URL, used to find the bucket and the repository it targets
+            repos: Repositories the request touches, when not part of the URL (GraphQL)
+        """
+        if len(self.tokens) == 1:
+            return 0
+        
+        if repos is None:
+            match = self.REPOSITORY_PATH.match(urlparse(url).path)
+            if not match:
+                return 0
+            repos = [match.group(1)]
+        
+        candidates = set(range(len(self.tokens)))
+        with self._lock:
+            for repo in repos:
+                candidates &= self._visibility.get(repo, candidates)
+        if not candidates:
+            return 0
+        
+        bucket = RateLimitGovernor.bucket_for(url)
+        return max(sorted(candidates), key=lambda index: self.governors[index].available(bucket))
+
+
+class IssueCounterStore:
+    """
+    Persistent per-repository issue and pull request counters.
+    
+    Each repository entry holds the last known state of every issue and pull
+    request, counters per state, and a high-water mark of the latest
+    `updated_at` seen. Later runs only fetch items updated since the watermark
+    and apply their state transitions to the counters, so a run downloads the
+    changes since the last run instead of every issue ever opened.
+    
+    Entry layout (one per kind, 'issues' or 'pulls')::
+    
+        {'watermark': '2026-01-01T00:00:00Z',
+         'states': {'42': 'issue_open', ...},
+         'counts': {'issue_open': 3, ...}}
+    """
+    
+    def __init__(self, path: str):
+        """
+        Load the counter state file, if it exists.
+        
+        Args:
+            path: JSON file holding the counters between runs
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._repositories = {}
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self._repositories = json.load(f).get('repositories', {})
+            except (OSError, ValueError) as e:
+                print(f"Warning: could not load issue counters from {path} ({e}), rebuilding them")
+    
+    def get(self, repo_full_name: str, kind: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of a repository's stored counters for 'issues' or 'pulls'."""
+        with self._lock:
+            entry = self._repositories.get(repo_full_name, {}).get(kind)
+            if entry is None:
+                return None
+            return {'watermark': entry['watermark'], 'states': dict(entry['states']), 'counts': dict(entry['counts'])}
+    
+    def put(self, repo_full_name: str, kind: str, entry: Dict[str, Any]):
+        """Store a repository's counters for 'issues' or 'pulls'."""
+        with self._lock:
+            self._repositories.setdefault(repo_full_name, {})[kind] = entry
+    
+    @staticmethod
+    def apply(entry: Dict[str, Any], items: List[Dict[str, Any]], classify) -> Dict[str, Any]:
+        """
+        Apply the state of updated items to an entry's counters.
+        
+        Re-applying an item already in its current state is a no-op, so
+        overlapping fetches at the watermark are harmless.
+        """
+        states = entry['states']
+        counts = entry['counts']
+        for item in items:
+            number = str(item['number'])
+            new_state = classify(item)
+            old_state = states.get(number)
+            if old_state != new_state:
+                if old_state:
+                    counts[old_state] -= 1
+                counts[new_state] = counts.get(new_state, 0) + 1
+                states[number] = new_state
+            entry['watermark'] = max(entry['watermark'], item.get('updated_at') or '')
+        return entry
+    
+    def save(self):
+        """Write the counters to disk atomically."""
+        with self._lock:
+            tmp_path = f'{self.path}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump({'repositories': self._repositories}, f, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+
+
+class RunCheckpoint:
+    """
+    Checkpoint of a collection run, so an interrupted run can be resumed.
+    
+    The first line of the file is the run header: timestamp, user info,
+    settings and the repository listing in order. Each completed repository
+    record is appended as one JSON line, and the file is flushed and fsynced
+    every few records and when the run stops. A line torn by a crash is dropped
+    on load, so the checkpoint always reads back as the header plus whole
+    records; the repositories still pending are the listing minus those.
+    """
+    
+    VERSION = 1
+    
+    def __init__(self, path: str, every: int = 10):
+        """
+        Args:
+            path: Checkpoint file
+            every: Records appended between two fsyncs
+        """
+        self.path = path
+        self.every = max(1, every)
+        self._file = None
+        self._unsynced = 0
+        self._valid_bytes = 0
+    
+    def load(self) -> Optional[Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]]:
+        """
+        Read the checkpoint.
+        
+        Returns:
+            The run header and the completed records by repository name, or
+            None if there is no usable checkpoint
+        """
+        if not os.path.exists(self.path):
+            return None
+        header = None
+        records = {}
+        valid_bytes = 0
+        try:
+            with open(self.path, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break
+                    if header is None:
+                        if entry.get('checkpoint') != self.VERSION:
+                            break
+                        header = entry
+                    else:
+                        records[entry['repository']] = entry
+                    valid_bytes += len(line)
+        except OSError as e:
+            print(f"Warning: could not read checkpoint {self.path} ({e}), starting over")
+            return None
+        if header is None:
+            return None
+        self._valid_bytes = valid_bytes
+        return header, records
+    
+    def start(self, header: Dict[str, Any]):
+        """Begin a new checkpoint with the run header, replacing any previous one."""
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(json.dumps(dict(header, checkpoint=self.VERSION), separators=(',', ':')) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, 'a')
+    
+    def resume(self):
+        """Continue the checkpoint that was loaded, dropping a torn last line."""
+        with open(self.path, 'r+b') as f:
+            f.truncate(self._valid_bytes)
+        self._file = open(self.path, 'a')
+    
+    def add(self, record: Dict[str, Any]):
+        """Append a completed repository record."""
+        self._file.write(json.dumps(record, separators=(',', ':')) + '\n')
+        self._unsynced += 1
+        if self._unsynced >= self.every:
+            self.sync()
+    
+    def sync(self):
+        """Make the appended records durable."""
+        if self._file:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+    
+    def close(self):
+        """Sync and close the checkpoint, keeping it for a later resume."""
+        if self._file:
+            self.sync()
+            self._file.close()
+            self._file = None
+    
+    def discard(self):
+        """Remove the checkpoint once the run's output is written."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """
+    Parse a shard given as INDEX/COUNT, e.g. '2/4' for the second of four shards.
+    
+    Raises:
+        ValueError: If the spec is malformed or INDEX is not between 1 and COUNT
+    """
+    index, _, count = spec.partition('/')
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        raise ValueError(f"Invalid shard '{spec}', expected INDEX/COUNT such as 1/4") from None
+    if not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{spec}', INDEX must be between 1 and COUNT")
+    return index, count
+
+
+def shard_repositories(repos: List[Dict[str, Any]], index: int, count: int) -> List[Dict[str, Any]]:
+    """
+    Select the repositories of one shard out of a repository listing.
+    
+    Every runner given the same listing computes the same partition, whatever
+    the listing's order. Repositories are laid out in the order of a stable
+    hash of their name and the line is cut into count ranges of equal total
+    weight, so shards get a similar amount of work, and a repository added,
+    removed or changing weight between two runners' listings only moves the
+    repositories next to a cut. The weight grows with the number of binary
+    digits of the size, since the request count of a repository grows far
+    slower than its size.
+    
+    Args:
+        repos: Repository listing, as returned by the API
+        index: Shard to select, from 1 to count
+        count: Number of shards
+    
+    Returns:
+        The shard's repositories, in listing order
+    """
+    ordered = sorted(repos, key=lambda repo: hashlib.sha256(repo['full_name'].lower().encode()).digest())
+    weights = [1 + max(0, repo.get('size') or 0).bit_length() for repo in ordered]
+    total = sum(weights)
+    selected = set()
+    position = 0
+    for repo, weight in zip(ordered, weights):
+        # A repository belongs to the range holding its midpoint
+        if (2 * position + weight) * count // (2 * total) == index - 1:
+            selected.add(repo['full_name'])
+        position += weight
+    return [repo for repo in repos if repo['full_name'] in selected]
+
+
+class SnapshotStore:
+    """
+    Append-only history of runs in a SQLite file, for trends over time.
+    
+    Every recorded run adds one row per repository with its scalar metrics,
+    plus the run's summary totals, to indexed tables. Weekly statistics are
+    keyed by week rather than by run, so the year of weeks every run repeats
+    is stored once and later runs only update the weeks that changed; the
+    seven daily commit counts of a week are packed into a small int32 blob.
+    Queries read the indexes directly and never touch old JSON files.
+    """
+    
+    # Per-repository scalars: column name -> (section, field); a None section reads the record itself
+    REPOSITORY_FIELDS = {
+        'stars': ('basic', 'stargazers_count'),
+        'forks': ('basic', 'forks_count'),
+        'watchers': ('basic', 'watchers_count'),
+        'size_kb': ('basic', 'size'),
+        'open_issues': ('issues', 'open_count'),
+        'closed_issues': ('issues', 'closed_count'),
+        'open_prs': ('pull_requests', 'open_count'),
+        'merged_prs': ('pull_requests', 'merged_count'),
+        'releases': ('releases', 'total_releases'),
+        'contributors': (None, 'contributor_count'),
+        'commits_last_year': ('commit_activity', 'total_commits_last_year'),
+        'code_additions': ('code_frequency', 'total_additions'),
+        'code_deletions': ('code_frequency', 'total_deletions'),
+    }
+    
+    WEEKLY_SERIES = ('commits', 'additions', 'deletions')
+    
+    def __init__(self, path: str):
+        """
+        Open (or create) the snapshot store.
+        
+        Args:
+            path: SQLite file holding the history
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        columns = ', '.join(f'{name} INTEGER' for name in self.REPOSITORY_FIELDS)
+        self._db.executescript(
+            'CREATE TABLE IF NOT EXISTS runs ('
+            'id INTEGER PRIMARY KEY, taken_at TEXT NOT NULL, username TEXT);'
+            'CREATE INDEX IF NOT EXISTS runs_taken_at ON runs (taken_at);'
+            'CREATE TABLE IF NOT EXISTS run_totals ('
+            'run_id INTEGER NOT NULL, metric TEXT NOT NULL, value INTEGER, '
+            'PRIMARY KEY (metric, run_id)) WITHOUT ROWID;'
+            'CREATE TABLE IF NOT EXISTS repositories ('
+            'id INTEGER PRIMARY KEY, full_name TEXT UNIQUE NOT NULL);'
+            'CREATE TABLE IF NOT EXISTS repository_snapshots ('
+            f'repository_id INTEGER NOT NULL, taken_at TEXT NOT NULL, run_id INTEGER NOT NULL, {columns}, '
+            'PRIMARY KEY (repository_id, taken_at)) WITHOUT ROWID;'
+            'CREATE INDEX IF NOT EXISTS repository_snapshots_run ON repository_snapshots (run_id);'
+            'CREATE TABLE IF NOT EXISTS weekly ('
+            'repository_id INTEGER NOT NULL, series TEXT NOT NULL, week INTEGER NOT NULL, '
+            'value INTEGER NOT NULL, days BLOB, '
+            'PRIMARY KEY (repository_id, series, week)) WITHOUT ROWID;'
+        )
+        self._db.commit()
+    
+    def _repository_id(self, full_name: str) -> int:
+        self._db.execute('INSERT OR IGNORE INTO repositories (full_name) VALUES (?)', (full_name,))
+        return self._db.execute('SELECT id FROM repositories WHERE full_name = ?', (full_name,)).fetchone()[0]
+    
+    @classmethod
+    def _repository_row(cls, repo_metrics: Dict[str, Any]) -> List[Optional[int]]:
+        row = []
+        for section, field in cls.REPOSITORY_FIELDS.values():
+            source = repo_metrics if section is None else repo_metrics.get(section)
+            row.append(source.get(field) if source else None)
+        return row
+    
+    @staticmethod
+    def _weekly_rows(repo_metrics: Dict[str, Any]) -> List[Tuple[str, int, int, Optional[bytes]]]:
+        rows = []
+        for week in (repo_metrics.get('commit_activity') or {}).get('weekly_activity') or []:
+            days = (list(week.get('days') or []) + [0] * 7)[:7]
+            rows.append(('commits', week.get('week', 0), week.get('total', 0), array('i', days).tobytes()))
+        for week, additions, deletions in (repo_metrics.get('code_frequency') or {}).get('weekly_data') or []:
+            rows.append(('additions', week, additions, None))
+            rows.append(('deletions', week, abs(deletions), None))
+        return rows
+    
+    def _run_id(self, taken_at: str, username: Optional[str] = None) -> int:
+        # Recording the same run again reuses it instead of duplicating it
+        existing = self._db.execute('SELECT id FROM runs WHERE taken_at = ?', (taken_at,)).fetchone()
+        if existing:
+            if username:
+                self._db.execute('UPDATE runs SET username = ? WHERE id = ?', (username, existing[0]))
+            return existing[0]
+        return self._db.execute(
+            'INSERT INTO runs (taken_at, username) VALUES (?, ?)', (taken_at, username)
+        ).lastrowid
+    
+    def _insert_repository(self, run_id: int, taken_at: str, repo_metrics: Dict[str, Any]):
+        repository_id = self._repository_id(repo_metrics['repository'])
+        placeholders = ', '.join('?' * (len(self.REPOSITORY_FIELDS) + 3))
+        self._db.execute(
+            f'INSERT OR REPLACE INTO repository_snapshots '
+            f'(repository_id, taken_at, run_id, {", ".join(self.REPOSITORY_FIELDS)}) '
+            f'VALUES ({placeholders})',
+            [repository_id, taken_at, run_id] + self._repository_row(repo_metrics)
+        )
+        self._db.executemany(
+            'INSERT OR REPLACE INTO weekly (repository_id, series, week, value, days) '
+            'VALUES (?, ?, ?, ?, ?)',
+            [(repository_id,) + row for row in self._weekly_rows(repo_metrics)]
+        )
+    
+    def _insert_totals(self, run_id: int, summary: Dict[str, Any]):
+        self._db.executemany(
+            'INSERT OR REPLACE INTO run_totals (run_id, metric, value) VALUES (?, ?, ?)',
+            [(run_id, metric, value) for metric, value in summary.items()
+             if isinstance(value, int) and not isinstance(value, bool)]
+        )
+    
+    @classmethod
+    def _run_key(cls, metrics: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+        taken_at = cls._timestamp(metrics.get('timestamp') or datetime.now(timezone.utc).isoformat())
+        username = (metrics.get('user_info') or {}).get('basic_info', {}).get('login')
+        return taken_at, username
+    
+    def record(self, metrics: Dict[str, Any]) -> int:
+        """
+        Append a run's metrics to the history and return the run id.
+        
+        Runs are identified by their timestamp, so recording the same metrics
+        twice keeps a single run.
+        
+        Args:
+            metrics: Metrics as returned by track_all_repositories() or track_summary_only()
+        """
+        taken_at, username = self._run_key(metrics)
+        with self._lock, self._db:
+            run_id = self._run_id(taken_at, username)
+            self._insert_totals(run_id, metrics.get('summary') or {})
+            for repo_metrics in metrics.get('repositories', []):
+                self._insert_repository(run_id, taken_at, repo_metrics)
+        return run_id
+    
+    def record_repository(self, taken_at: str, repo_metrics: Dict[str, Any]):
+        """Append one repository record to the run taken at the given timestamp."""
+        taken_at = self._timestamp(taken_at)
+        with self._lock, self._db:
+            self._insert_repository(self._run_id(taken_at), taken_at, repo_metrics)
+    
+    def record_totals(self, metrics: Dict[str, Any]) -> int:
+        """Record a run's summary totals (but not its repositories) and return the run id."""
+        taken_at, username = self._run_key(metrics)
+        with self._lock, self._db:
+            run_id = self._run_id(taken_at, username)
+            self._insert_totals(run_id, metrics.get('summary') or {})
+        return run_id
+    
+    def repository_series(self, repo_full_name: str, field: str, since: Optional[str] = None,
+                          until: Optional[str] = None) -> List[Tuple[str, Optional[int]]]:
+        """
+        Return (timestamp, value) pairs of one repository scalar, oldest first.
+        
+        Args:
+            repo_full_name: Repository full name, e.g. 'owner/name'
+            field: One of REPOSITORY_FIELDS
+            since: ISO date or timestamp (UTC unless it has an offset); earlier snapshots are left out
+            until: ISO date (which includes that whole day) or timestamp; later snapshots are left out
+        """
+        if field not in self.REPOSITORY_FIELDS:
+            raise ValueError(f"Unknown field {field!r} (available: {', '.join(self.REPOSITORY_FIELDS)})")
+        low, high = self._timestamp_bounds(since, until)
+        with self._lock:
+            return self._db.execute(
+                f'SELECT s.taken_at, s.{field} FROM repository_snapshots s '
+                'JOIN repositories r ON r.id = s.repository_id '
+                'WHERE r.full_name = ? AND s.taken_at >= ? AND s.taken_at <= ? ORDER BY s.taken_at',
+                (repo_full_name, low, high)
+            ).fetchall()
+    
+    def total_series(self, metric: str, since: Optional[str] = None,
+                     until: Optional[str] = None) -> List[Tuple[str, int]]:
+        """
+        Return (timestamp, value) pairs of one summary total (e.g. 'total_stars'), oldest first.
+        
+        since and until are as in repository_series.
+        """
+        low, high = self._timestamp_bounds(since, until)
+        with self._lock:
+            return self._db.execute(
+                'SELECT r.taken_at, t.value FROM run_totals t JOIN runs r ON r.id = t.run_id '
+                'WHERE t.metric = ? AND r.taken_at >= ? AND r.taken_at <= ? ORDER BY r.taken_at',
+                (metric, low, high)
+            ).fetchall()
+    
+    def weekly_series(self, repo_full_name: str, series: str = 'commits', since: Optional[str] = None,
+                      until: Optional[str] = None) -> List[Tuple[int, int]]:
+        """
+        Return (week start as Unix time, value) pairs of a repository's weekly statistics.
+        
+        Args:
+            series: 'commits', 'additions' or 'deletions'
+            since: ISO date or timestamp (UTC unless it has an offset); earlier weeks are left out
+            until: ISO date (which includes that whole day) or timestamp; later weeks are left out
+        """
+        if series not in self.WEEKLY_SERIES:
+            raise ValueError(f"Unknown weekly series {series!r} (available: {', '.join(self.WEEKLY_SERIES)})")
+        low = int(self._moment(since).timestamp()) if since else 0
+        high = int(self._moment(until, end=True).timestamp()) if until else 2 ** 62
+        with self._lock:
+            return self._db.execute(
+                'SELECT w.week, w.value FROM weekly w JOIN repositories r ON r.id = w.repository_id '
+                'WHERE r.full_name = ? AND w.series = ? AND w.week >= ? AND w.week <= ? ORDER BY w.week',
+                (repo_full_name, series, low, high)
+            ).fetchall()
+    
+    @staticmethod
+    def _moment(value: str, end: bool = False) -> datetime:
+        """
+        Parse an ISO date or timestamp into a UTC datetime.
+        
+        Timestamps without an offset are taken as UTC, and a trailing 'Z' is
+        accepted. A date alone stands for the start of that day, or its last
+        microsecond with end=True.
+        """
+        if value[-1:] in ('Z', 'z'):
+            value = value[:-1] + '+00:00'
+        try:
+            day = date.fromisoformat(value)
+        except ValueError:
+            moment = datetime.fromisoformat(value)
+        else:
+            moment = datetime(day.year, day.month, day.day)
+            if end:
+                moment += timedelta(days=1, microseconds=-1)
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return moment.astimezone(timezone.utc)
+    
+    @classmethod
+    def _timestamp(cls, value: str) -> str:
+        """Normalize a timestamp to the UTC ISO format taken_at is stored and compared in."""
+        return cls._moment(value).isoformat()
+    
+    @classmethod
+    def _timestamp_bounds(cls, since: Optional[str], until: Optional[str]) -> Tuple[str, str]:
+        """taken_at bounds of a query, as UTC ISO strings that compare correctly with stored values."""
+        low = cls._timestamp(since) if since else ''
+        high = cls._moment(until, end=True).isoformat() if until else '\uffff'
+        return low, high
+    
+    def weekly_days(self, repo_full_name: str, week: int) -> Optional[List[int]]:
+        """Return the daily commit counts (Sunday first) of one week, if recorded."""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT w.days FROM weekly w JOIN repositories r ON r.id = w.repository_id '
+                "WHERE r.full_name = ? AND w.series = 'commits' AND w.week = ?",
+                (repo_full_name, week)
+            ).fetchone()
+        if not row or row[0] is None:
+            return None
+        days = array('i')
+        days.frombytes(row[0])
+        return days.tolist()
+    
+    def repositories(self) -> List[str]:
+        """Return the names of every repository with recorded history."""
+        with self._lock:
+            return [row[0] for row in self._db.execute('SELECT full_name FROM repositories ORDER BY full_name')]
+    
+    def close(self):
+        """Close the snapshot database."""
+        with self._lock:
+            self._db.close()
+
+
+class SnapshotRecordWriter:
+    """Record writer that appends each repository to a SnapshotStore as soon as it is collected."""
+    
+    def __init__(self, store: SnapshotStore, taken_at: str):
+        """
+        Args:
+            store: Open snapshot store
+            taken_at: Timestamp of the run the records belong to
+        """
+        self.store = store
+        self.taken_at = taken_at
+        self.filename = store.path
+        self.run_id = None
+    
+    def write(self, repo_metrics: Dict[str, Any]):
+        """Append one repository record."""
+        self.store.record_repository(self.taken_at, repo_metrics)
+    
+    def close(self, metrics: Dict[str, Any]):
+        """Record the summary totals of the run; the store itself stays open."""
+        self.run_id = self.store.record_totals(metrics)
+
+
+class StatsPrefetcher:
+    """
+    Warm-up and polling scheduler for the /stats/* endpoints.
+    
+    GitHub computes repository statistics in the background and answers 202
+    Accepted until they are ready. The prefetcher requests the statistics of
+    every repository at the start of a run, then re-polls the pending ones with
+    exponential backoff on a background thread while the rest of the
+    collection proceeds. Polling goes on for as long as the collection does;
+    once finish() is called, results still pending after the deadline are
+    given up.
+    """
+    
+    ENDPOINTS = ('commit_activity', 'code_frequency', 'participation')
+    
+    def __init__(self, tracker: 'GitHubMetricsTracker', deadline: float = 120.0,
+                 initial_delay: float = 2.0, max_delay: float = 30.0, concurrency: int = 4,
+                 endpoints: Optional[List[str]] = None):
+        """
+        Initialize the prefetcher.
+        
+        Args:
+            tracker: Tracker whose transport, cache and rate limit handling the requests go through
+            deadline: Seconds after finish() at which pending statistics are given up
+            initial_delay: Seconds before the first re-poll of a 202 response
+            max_delay: Upper bound of the exponential re-poll delay
+            concurrency: Number of statistics requests in flight at once
+            endpoints: Statistics to prefetch (default: all of ENDPOINTS)
+        """
+        self.tracker = tracker
+        self.endpoints = tuple(endpoints) if endpoints is not None else self.ENDPOINTS
+        self.deadline = deadline
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.concurrency = concurrency
+        self._results = {}
+        self._pending = {}  # (repo, endpoint) -> (next poll time, current delay)
+        self._repo_names = []
+        self._deadline_at = float('inf')
+        self._cond = threading.Condition()
+        self._thread = None
+    
+    def start(self, repo_names: List[str]):
+        """Queue the statistics of every repository and start polling in the background."""
+        self._repo_names = list(repo_names)
+        with self._cond:
+            for repo_name in self._repo_names:
+                for endpoint in self.endpoints:
+                    self._pending[(repo_name, endpoint)] = (0.0, self.initial_delay)
+        self._thread = threading.Thread(target=self._run, name='stats-prefetcher', daemon=True)
+        self._thread.start()
+    
+    def _poll(self, key: Tuple[str, str]) -> Tuple[Optional[int], Optional[Any]]:
+        """Request one statistics endpoint, returning the status code and body."""
+        repo_name, endpoint = key
+        data, _, status = self.tracker._request(f'{self.tracker.base_url}/repos/{repo_name}/stats/{endpoint}')
+        return status, data
+    
+    def _run(self):
+        """Poll due endpoints until nothing is pending or the deadline passes."""
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while True:
+                with self._cond:
+                    now = time.time()
+                    if not self._pending or now >= self._deadline_at:
+                        self._cond.notify_all()
+                        return
+                    due = [key for key, (poll_at, _) in self._pending.items() if poll_at <= now]
+                    if not due:
+                        # finish() and close() notify, so waiting for the next poll is enough
+                        next_poll = min(poll_at for poll_at, _ in self._pending.values())
+                        self._cond.wait(next_poll - now)
+                        continue
+                
+                outcomes = list(executor.map(self._poll, due))
+                
+                with self._cond:
+                    now = time.time()
+                    for key, (status, data) in zip(due, outcomes):
+                        if status == 202:
+                            delay = self._pending[key][1]
+                            self._pending[key] = (now + delay, min(delay * 2, self.max_delay))
+                        else:
+                            # Ready, or failed in a way re-polling will not fix
+                            self._results[key] = data
+                            del self._pending[key]
+                    self._cond.notify_all()
+    
+    def get(self, repo_name: str, endpoint: str) -> Optional[Any]:
+        """Return the statistics for a repository if they are ready, without waiting."""
+        with self._cond:
+            return self._results.get((repo_name, endpoint))
+    
+    def pop(self, repo_name: str, endpoint: str) -> Optional[Any]:
+        """Return the statistics for a repository if they are ready and release them."""
+        with self._cond:
+            return self._results.pop((repo_name, endpoint), None)
+    
+    def ready(self, repo_name: str) -> bool:
+        """Whether no statistic of a repository is pending any more."""
+        with self._cond:
+            return not any((repo_name, endpoint) in self._pending for endpoint in self.endpoints)
+    
+    def finish(self):
+        """Start the deadline: the collection is done, and pending statistics get deadline more seconds."""
+        with self._cond:
+            self._deadline_at = min(self._deadline_at, time.time() + self.deadline)
+            self._cond.notify_all()
+    
+    def close(self):
+        """Stop polling right away."""
+        with self._cond:
+            self._deadline_at = 0.0
+            self._cond.notify_all()
+    
+    def _remaining(self) -> Optional[float]:
+        # Called with the lock held; None waits without a timeout until finish()
+        if self._deadline_at == float('inf'):
+            return None
+        return self._deadline_at - time.time()
+    
+    def wait_for(self, repo_name: str):
+        """Block until every statistic of one repository is ready or the deadline has passed."""
+        keys = [(repo_name, endpoint) for endpoint in self.endpoints]
+        with self._cond:
+            while any(key in self._pending for key in keys) and time.time() < self._deadline_at:
+                self._cond.wait(self._remaining())
+    
+    def wait(self):
+        """Block until every statistic is ready or the deadline has passed."""
+        with self._cond:
+            while self._pending and time.time() < self._deadline_at:
+                self._cond.wait(self._remaining())
+    
+    def pending_fraction(self) -> float:
+        """Fraction of repositories with at least one statistic still pending."""
+        if not self._repo_names:
+            return 0.0
+        with self._cond:
+            pending_repos = {repo_name for repo_name, _ in self._pending}
+        return len(pending_repos) / len(self._repo_names)
+
+
+class Collector:
+    """
+    One per-repository metrics section in the collector registry.
+    
+    The tracker method named by `method` is called with the repository name
+    followed by the sections listed in `depends`, and its return value becomes
+    the section. `cost` is the minimum number of API requests per repository
+    (paginated listings cost more on large repositories; 0 means the section is
+    derived from other sections), and `endpoints` lists the REST endpoints read.
+    """
+    
+    def __init__(self, name: str, method: str, endpoints: Tuple[str, ...] = (), cost: int = 1,
+                 depends: Tuple[str, ...] = ()):
+        self.name = name
+        self.method = method
+        self.endpoints = endpoints
+        self.cost = cost
+        self.depends = depends
+    
+    def __repr__(self) -> str:
+        return f'Collector({self.name!r})'
+
+
+class SummaryAggregator:
+    """
+    Running summary statistics over repository records, fed one record at a time.
+    
+    Keeps counters, per-language byte totals and the most starred and forked
+    repositories in bounded heaps, so records can be released as soon as they
+    are added and memory stays flat however many repositories there are.
+    Produces the same summary as computing it over the full list of records.
+    """
+    
+    # Summary total -> (section, field); a None section reads the record itself
+    TOTALS = {
+        'total_stars': ('basic', 'stargazers_count'),
+        'total_forks': ('basic', 'forks_count'),
+        'total_watchers': ('basic', 'watchers_count'),
+        'total_open_issues': ('issues', 'open_count'),
+        'total_contributors': (None, 'contributor_count'),
+        'total_releases': ('releases', 'total_releases'),
+        'total_commits': ('commit_activity', 'total_commits_last_year'),
+        'total_code_additions': ('code_frequency', 'total_additions'),
+        'total_code_deletions': ('code_frequency', 'total_deletions'),
+        'total_open_prs': ('pull_requests', 'open_count'),
+        'total_merged_prs': ('pull_requests', 'merged_count'),
+    }
+    
+    # Repository counters -> (section, flag)
+    FLAGS = {
+        'active_repositories': ('custom', 'is_active'),
+        'archived_repositories': ('basic', 'archived'),
+        'private_repositories': ('basic', 'private'),
+        'forked_repositories': ('basic', 'fork'),
+    }
+    
+    def __init__(self, top_n: int = 10, aggregates: Optional[List[Tuple[str, str]]] = None):
+        """
+        Initialize an empty aggregator.
+        
+        Args:
+            top_n: Length of the most starred and most forked lists
+            aggregates: Extra (field, statistic) pairs from parse_aggregates;
+                only the fields named here are kept per repository
+        """
+        self.top_n = top_n
+        self.aggregates = aggregates or []
+        self._aggregate_columns = {field: array('q') for field, _ in self.aggregates}
+        self.count = 0
+        self.sections = set()
+        self.totals = defaultdict(int)
+        self.languages = defaultdict(int)
+        # Min-heaps of (value, -sequence, name): ties keep the earliest repository
+        self._most_starred = []
+        self._most_forked = []
+    
+    def _push(self, heap: List[Tuple[int, int, str]], value: int, name: str):
+        entry = (value, -self.count, name)
+        if len(heap) < self.top_n:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+    
+    def add(self, repo_metrics: Dict[str, Any]):
+        """Fold one repository record into the summary."""
+        self.sections.update(repo_metrics)
+        for key, (section, field) in self.TOTALS.items():
+            source = repo_metrics if section is None else repo_metrics.get(section)
+            if source:
+                self.totals[key] += source.get(field, 0)
+        for key, (section, flag) in self.FLAGS.items():
+            if (repo_metrics.get(section) or {}).get(flag, False):
+                self.totals[key] += 1
+        for lang, bytes_count in repo_metrics.get('languages', {}).items():
+            self.languages[lang] += bytes_count
+        for field, column in self._aggregate_columns.items():
+            section, key = SnapshotStore.REPOSITORY_FIELDS[field]
+            source = repo_metrics if section is None else repo_metrics.get(section)
+            if source and source.get(key) is not None:
+                column.append(source[key])
+        
+        if 'basic' in repo_metrics:
+            basic = repo_metrics['basic'] or {}
+            self._push(self._most_starred, basic.get('stargazers_count', 0), repo_metrics['repository'])
+            self._push(self._most_forked, basic.get('forks_count', 0), repo_metrics['repository'])
+        self.count += 1
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        Return the summary of the records added so far.
+        
+        Totals of sections that were not collected are left out rather than
+        reported as zero.
+        """
+        if not self.count:
+            return {}
+        summary = self.assemble(
+            self.count, self.sections, self.totals, self.languages,
+            [(name, stars) for stars, _, name in sorted(self._most_starred, reverse=True)],
+            [(name, forks) for forks, _, name in sorted(self._most_forked, reverse=True)])
+        if self.aggregates:
+            summary['aggregates'] = compute_aggregates(self.aggregates, self._aggregate_columns)
+        return summary
+    
+    @staticmethod
+    def assemble(count: int, sections: set, totals: Dict[str, int], languages: Dict[str, int],
+                 most_starred: List[Tuple[str, int]], most_forked: List[Tuple[str, int]]) -> Dict[str, Any]:
+        """
+        Lay out computed totals as the summary dictionary.
+        
+        Shared by the online and columnar engines so both produce the same keys
+        in the same order.
+        """
+        def collected(section: str) -> bool:
+            return section in sections
+        
+        summary = {'total_repositories': count}
+        if collected('basic'):
+            for key in ('total_stars', 'total_forks', 'total_watchers'):
+                summary[key] = totals[key]
+        if collected('issues'):
+            summary['total_open_issues'] = totals['total_open_issues']
+        if collected('contributor_count'):
+            summary['total_contributors'] = totals['total_contributors']
+        if collected('releases'):
+            summary['total_releases'] = totals['total_releases']
+        if collected('commit_activity'):
+            summary['total_commits'] = totals['total_commits']
+        if collected('code_frequency'):
+            summary['total_code_additions'] = totals['total_code_additions']
+            summary['total_code_deletions'] = totals['total_code_deletions']
+        if collected('custom'):
+            summary['active_repositories'] = totals['active_repositories']
+        if collected('basic'):
+            summary['archived_repositories'] = totals['archived_repositories']
+            summary['private_repositories'] = totals['private_repositories']
+            summary['public_repositories'] = count - totals['private_repositories']
+            summary['forked_repositories'] = totals['forked_repositories']
+        if collected('pull_requests'):
+            summary['total_open_prs'] = totals['total_open_prs']
+            summary['total_merged_prs'] = totals['total_merged_prs']
+        
+        # Language distribution
+        total_bytes = sum(languages.values())
+        summary['languages'] = {
+            lang: {
+                'bytes': bytes_count,
+                'percentage': round((bytes_count / total_bytes * 100), 2) if total_bytes > 0 else 0
+            }
+            for lang, bytes_count in sorted(languages.items(), key=lambda x: x[1], reverse=True)
+        }
+        
+        # Most popular repositories
+        if collected('basic'):
+            summary['most_starred'] = [{'name': name, 'stars': stars} for name, stars in most_starred]
+            summary['most_forked'] = [{'name': name, 'forks': forks} for name, forks in most_forked]
+        
+        return summary
+
+
+AGGREGATE_STATISTICS = ('min', 'max', 'mean', 'median')
+
+
+def parse_aggregates(specs: List[str]) -> List[Tuple[str, str]]:
+    """
+    Parse extra summary aggregates given as FIELD:STAT.
+    
+    FIELD is one of the per-repository fields of SnapshotStore.REPOSITORY_FIELDS
+    and STAT one of min, max, mean, median or a percentile such as p90.
+    
+    Raises:
+        ValueError: If a field or statistic is unknown
+    """
+    aggregates = []
+    for spec in specs:
+        field, _, stat = spec.partition(':')
+        if field not in SnapshotStore.REPOSITORY_FIELDS:
+            raise ValueError(f"Unknown aggregate field '{field}'. "
+                             f"Choose from: {', '.join(SnapshotStore.REPOSITORY_FIELDS)}")
+        if stat not in AGGREGATE_STATISTICS:
+            try:
+                valid = stat.startswith('p') and 0 <= float(stat[1:]) <= 100
+            except ValueError:
+                valid = False
+            if not valid:
+                raise ValueError(f"Unknown aggregate statistic '{stat}' for {field}. "
+                                 f"Choose from: {', '.join(AGGREGATE_STATISTICS)} or pNN")
+        if (field, stat) not in aggregates:
+            aggregates.append((field, stat))
+    return aggregates
+
+
+def _percentile(ordered, percent: float) -> float:
+    """Linear-interpolation percentile of a sorted sequence (NumPy's default method)."""
+    position = (len(ordered) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def compute_aggregates(aggregates: List[Tuple[str, str]], columns: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Compute parsed aggregates over per-field value columns.
+    
+    Columns hold only the repositories where the field was collected; a field
+    with no values reports None for each statistic.
+    """
+    result = {}
+    ordered = {}
+    for field, stat in aggregates:
+        values = columns.get(field)
+        if values is None or not len(values):
+            result.setdefault(field, {})[stat] = None
+            continue
+        if field not in ordered:
+            ordered[field] = numpy.sort(values) if numpy is not None else sorted(values)
+        column = ordered[field]
+        if stat == 'min':
+            value = int(column[0])
+        elif stat == 'max':
+            value = int(column[-1])
+        elif stat == 'mean':
+            value = round(float(column.mean() if numpy is not None else sum(column) / len(column)), 2)
+        else:
+            percent = 50.0 if stat == 'median' else float(stat[1:])
+            if numpy is not None:
+                value = round(float(numpy.percentile(column, percent)), 2)
+            else:
+                value = round(float(_percentile(column, percent)), 2)
+        result.setdefault(field, {})[stat] = value
+    return result
+
+
+class ColumnarSummary:
+    """
+    Summary statistics computed column-wise over a complete list of records.
+    
+    A single pass pulls every per-repository scalar into a typed column
+    (NumPy arrays when NumPy is installed, stdlib arrays otherwise); totals are
+    then column sums and the most starred and forked lists come from a partial
+    selection rather than a full sort. Produces the same summary as
+    SummaryAggregator, plus any requested extra aggregates.
+    """
+    
+    # Summary total -> column in SnapshotStore.REPOSITORY_FIELDS
+    TOTAL_COLUMNS = {
+        'total_stars': 'stars',
+        'total_forks': 'forks',
+        'total_watchers': 'watchers',
+        'total_open_issues': 'open_issues',
+        'total_contributors': 'contributors',
+        'total_releases': 'releases',
+        'total_commits': 'commits_last_year',
+        'total_code_additions': 'code_additions',
+        'total_code_deletions': 'code_deletions',
+        'total_open_prs': 'open_prs',
+        'total_merged_prs': 'merged_prs',
+    }
+    
+    def __init__(self, repos: List[Dict[str, Any]], aggregates: Optional[List[Tuple[str, str]]] = None):
+        """
+        Extract the columns of a list of repository records.
+        
+        Args:
+            repos: Repository records, in listing order
+            aggregates: Extra (field, statistic) pairs from parse_aggregates
+        """
+        self.aggregates = aggregates or []
+        wanted = {name: SnapshotStore.REPOSITORY_FIELDS[name] for name in self.TOTAL_COLUMNS.values()}
+        wanted.update(SummaryAggregator.FLAGS)
+        wanted.update((field, SnapshotStore.REPOSITORY_FIELDS[field]) for field, _ in self.aggregates)
+        values = {name: array('q') for name in wanted}
+        # Aggregates only count repositories where the field was collected
+        present = {field: array('b') for field, _ in self.aggregates}
+        # Columns grouped by section so each section is looked up once per record
+        plan = defaultdict(list)
+        for name, (section, field) in wanted.items():
+            plan[section].append((field, values[name].append, present[name].append if name in present else None))
+        plan = list(plan.items())
+        
+        self.count = len(repos)
+        self.names = []
+        self.sections = set()
+        self.languages = defaultdict(int)
+        has_basic = array('b')
+        for repo in repos:
+            self.names.append(repo['repository'])
+            self.sections.update(repo)
+            for section, fields in plan:
+                source = repo if section is None else repo.get(section)
+                if source:
+                    for field, add, mark in fields:
+                        value = source.get(field)
+                        add(value or 0)
+                        if mark:
+                            mark(value is not None)
+                else:
+                    for field, add, mark in fields:
+                        add(0)
+                        if mark:
+                            mark(False)
+            for lang, bytes_count in repo.get('languages', {}).items():
+                self.languages[lang] += bytes_count
+            has_basic.append('basic' in repo)
+        
+        if numpy is not None:
+            self.values = {name: numpy.frombuffer(column, dtype=numpy.int64) for name, column in values.items()}
+            self.present = {name: numpy.frombuffer(column, dtype=numpy.int8).astype(bool)
+                            for name, column in present.items()}
+            self.has_basic = numpy.frombuffer(has_basic, dtype=numpy.int8).astype(bool)
+        else:
+            self.values, self.present, self.has_basic = values, present, has_basic
+    
+    def column(self, name: str):
+        """Values of a field for the repositories where it was collected."""
+        values, present = self.values[name], self.present[name]
+        if numpy is not None:
+            return values[present]
+        return array('q', itertools.compress(values, present))
+    
+    def top(self, name: str, top_n: int = 10) -> List[Tuple[str, int]]:
+        """
+        The top_n repositories with a basic section by a field, highest first.
+        
+        Ties keep the earlier repository, as a stable sort would.
+        """
+        values = self.values[name]
+        if numpy is None:
+            candidates = itertools.compress(range(self.count), self.has_basic)
+            indexes = heapq.nlargest(top_n, candidates, key=values.__getitem__)
+        else:
+            candidates = numpy.flatnonzero(self.has_basic)
+            scores = values[candidates]
+            if len(candidates) > top_n:
+                # Everything above the top_n-th value, then the earliest of the ties
+                threshold = numpy.partition(scores, len(scores) - top_n)[len(scores) - top_n]
+                keep = candidates[scores > threshold]
+                ties = candidates[scores == threshold][:top_n - len(keep)]
+                candidates = numpy.concatenate((keep, ties))
+                scores = values[candidates]
+            indexes = candidates[numpy.lexsort((candidates, -scores))].tolist()
+        return [(self.names[i], int(values[i])) for i in indexes]
+    
+    def summary(self, top_n: int = 10) -> Dict[str, Any]:
+        """
+        Return the summary of the records.
+        
+        Args:
+            top_n: Length of the most starred and most forked lists
+        """
+        if not self.count:
+            return {}
+        columns = dict(self.TOTAL_COLUMNS, **{key: key for key in SummaryAggregator.FLAGS})
+        totals = {key: int(sum(self.values[name])) if numpy is None else int(self.values[name].sum())
+                  for key, name in columns.items()}
+        summary = SummaryAggregator.assemble(
+            self.count, self.sections, totals, self.languages,
+            self.top('stars', top_n), self.top('forks', top_n))
+        if self.aggregates:
+            summary['aggregates'] = compute_aggregates(
+                self.aggregates, {field: self.column(field) for field, _ in self.aggregates})
+        return summary
+
+
+class JSONRecordWriter:
+    """
+    Write a metrics document one repository record at a time.
+    
+    The output is byte-for-byte what json.dump(metrics, indent=2) produces for
+    the same metrics, but only one record is held in memory at a time: the
+    records go first and the summary, timestamp and user info are appended
+    by close(). The document is written to a temporary file that replaces
+    filename on close(); abort() discards it, keeping the previous file.
+    """
+    
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._temporary = f'{filename}.tmp'
+        self._file = open(self._temporary, 'w')
+        self._file.write('{\n  "repositories": [')
+        self._empty = True
+    
+    @staticmethod
+    def _dumps(value: Any, depth: int) -> str:
+        return json.dumps(value, indent=2).replace('\n', '\n' + '  ' * depth)
+    
+    def write(self, repo_metrics: Dict[str, Any]):
+        """Append one repository record."""
+        self._file.write(('\n    ' if self._empty else ',\n    ') + self._dumps(repo_metrics, 2))
+        self._empty = False
+    
+    def close(self, metrics: Dict[str, Any]):
+        """Finish the document with the other top-level keys of metrics and close the file."""
+        self._file.write(']' if self._empty else '\n  ]')
+        for key, value in metrics.items():
+            if key != 'repositories':
+                self._file.write(f',\n  {json.dumps(key)}: {self._dumps(value, 1)}')
+        self._file.write('\n}')
+        self._file.close()
+        os.replace(self._temporary, self.filename)
+    
+    def abort(self):
+        """Discard the document, leaving the previous file in place."""
+        self._file.close()
+        os.remove(self._temporary)
+
+
+class NDJSONRecordWriter:
+    """
+    Write repository records as newline-delimited JSON, one compact record per line.
+    
+    Records go to a temporary file that replaces filename on close(); abort()
+    discards it, keeping the previous file.
+    """
+    
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._temporary = f'{filename}.tmp'
+        self._file = open(self._temporary, 'w')
+    
+    def write(self, repo_metrics: Dict[str, Any]):
+        """Append one repository record."""
+        self._file.write(json.dumps(repo_metrics, separators=(',', ':')) + '\n')
+    
+    def close(self, metrics: Optional[Dict[str, Any]] = None):
+        """Close the file and put it in place."""
+        self._file.close()
+        os.replace(self._temporary, self.filename)
+    
+    def abort(self):
+        """Discard the records, leaving the previous file in place."""
+        self._file.close()
+        os.remove(self._temporary)
+
+
+class CSVRecordWriter:
+    """
+    Write one CSV row of headline metrics per repository record.
+    
+    Rows go to a temporary file that replaces filename on close(); abort()
+    discards it, keeping the previous file.
+    """
+    
+    HEADERS = [
+        'repository', 'stars', 'forks', 'watchers', 'open_issues',
+        'language', 'size_kb', 'contributors', 'commits_last_year',
+        'open_prs', 'merged_prs', 'releases', 'age_days', 'is_active',
+        'has_wiki', 'has_pages', 'archived', 'private'
+    ]
+    
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._temporary = f'{filename}.tmp'
+        self._file = open(self._temporary, 'w', newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=self.HEADERS)
+        self._writer.writeheader()
+    
+    @staticmethod
+    def row(repo: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the CSV row of a repository record."""
+        # Sections that were not collected leave their columns empty
+        basic = repo.get('basic') or {}
+        row = {'repository': repo['repository']}
+        if 'basic' in repo:
+            row.update({
+                'stars': basic.get('stargazers_count', 0),
+                'forks': basic.get('forks_count', 0),
+                'watchers': basic.get('watchers_count', 0),
+                'language': basic.get('language', 'N/A'),
+                'size_kb': basic.get('size', 0),
+                'has_wiki': basic.get('has_wiki', False),
+                'has_pages': basic.get('has_pages', False),
+                'archived': basic.get('archived', False),
+                'private': basic.get('private', False),
+            })
+        if 'issues' in repo:
+            row['open_issues'] = repo['issues'].get('open_count', 0)
+        if 'contributor_count' in repo:
+            row['contributors'] = repo['contributor_count']
+        if 'commit_activity' in repo:
+            row['commits_last_year'] = repo['commit_activity'].get('total_commits_last_year', 0)
+        if 'pull_requests' in repo:
+            row['open_prs'] = repo['pull_requests'].get('open_count', 0)
+            row['merged_prs'] = repo['pull_requests'].get('merged_count', 0)
+        if 'releases' in repo:
+            row['releases'] = repo['releases'].get('total_releases', 0)
+        if 'custom' in repo:
+            row['age_days'] = repo['custom'].get('age_days', 0)
+            row['is_active'] = repo['custom'].get('is_active', False)
+        return row
+    
+    def write(self, repo_metrics: Dict[str, Any]):
+        """Append one repository row."""
+        self._writer.writerow(self.row(repo_metrics))
+    
+    def close(self, metrics: Optional[Dict[str, Any]] = None):
+        """Close the file and put it in place."""
+        self._file.close()
+        os.replace(self._temporary, self.filename)
+    
+    def abort(self):
+        """Discard the rows, leaving the previous file in place."""
+        self._file.close()
+        os.remove(self._temporary)
+
+
+class HTMLReportWriter:
+    """
+    Write the HTML report one repository record at a time.
+    
+    Markup is written to the files in chunks as records arrive rather than built
+    up as one string. The summary at the top of the report is only known at the
+    end, so the repository list is spooled to a temporary file and copied in
+    after it by close(). With page_size, the list goes to numbered page files
+    instead and the report stays a small index linking to them; with
+    detail_pages, each repository also gets its own page, rendered on a thread
+    pool. Every file is written under a temporary name and put in place by
+    close(), along with removing the pages of a previous, longer report;
+    abort() discards them, keeping the previous report.
+    """
+    
+    STYLE = """
+        * {
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
+            background: #0d1117;
+            color: #c9d1d9;
+            padding: 20px;
+            line-height: 1.6;
+        }
+        .container {
+            max-width: 1200px;
+            margin: 0 auto;
+        }
+        h1, h2, h3 {
+            color: #58a6ff;
+            margin: 20px 0 10px;
+        }
+        h1 {
+            font-size: 2.5em;
+            border-bottom: 2px solid #21262d;
+            padding-bottom: 10px;
+        }
+        .metric-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+            gap: 20px;
+            margin: 20px 0;
+        }
+        .metric-card {
+            background: #161b22;
+            border: 1px solid #30363d;
+            border-radius: 6px;
+            padding: 20px;
+            transition: transform 0.2s;
+        }
+        .metric-card:hover {
+            transform: translateY(-2px);
+            border-color: #58a6ff;
+        }
+        .metric-value {
+            font-size: 2em;
+            font-weight: bold;
+            color: #58a6ff;
+        }
+        .metric-label {
+            color: #8b949e;
+            font-size: 0.9em;
+            margin-top: 5px;
+        }
+        .repo-list {
+            list-style: none;
+        }
+        .repo-item {
+            background: #161b22;
+            border: 1px solid #30363d;
+            border-radius: 6px;
+            padding: 15px;
+            margin: 10px 0;
+        }
+        .repo-name {
+            color: #58a6ff;
+            font-weight: bold;
+            font-size: 1.1em;
+        }
+        .repo-stats {
+            display: flex;
+            gap: 20px;
+            margin-top: 10px;
+            color: #8b949e;
+        }
+        .language-bar {
+            background: #161b22;
+            border: 1px solid #30363d;
+            border-radius: 6px;
+            padding: 15px;
+            margin: 10px 0;
+        }
+        .language-item {
+            display: flex;
+            justify-content: space-between;
+            margin: 8px 0;
+        }
+        .timestamp {
+            color: #8b949e;
+            font-size: 0.9em;
+            margin: 20px 0;
+        }
+        table {
+            width: 100%;
+            border-collapse: collapse;
+            margin: 20px 0;
+        }
+        th, td {
+            padding: 12px;
+            text-align: left;
+            border-bottom: 1px solid #30363d;
+        }
+        th {
+            background: #161b22;
+            color: #58a6ff;
+            font-weight: bold;
+        }
+        tr:hover {
+            background: #161b22;
+        }
+        .pagination {
+            display: flex;
+            gap: 20px;
+            margin: 20px 0;
+        }
+        a {
+            color: #58a6ff;
+            text-decoration: none;
+        }
+"""
+    
+    def __init__(self, filename: str, page_size: int = 0, detail_pages: bool = False, workers: int = 4):
+        """
+        Open the report for writing.
+        
+        Args:
+            filename: Report file; page files and the detail page directory are named after it
+            page_size: Repositories per list page (default: 0, the whole list in the report)
+            detail_pages: Also write one page per repository
+            workers: Threads rendering detail pages
+        """
+        self.filename = filename
+        self.page_size = max(0, page_size)
+        self.workers = max(1, workers)
+        stem = os.path.splitext(filename)[0]
+        self._index = os.path.basename(filename)
+        self._page_name = os.path.basename(stem) + '_page_{}.html'
+        self._directory = os.path.dirname(filename)
+        self._detail_dir = f'{stem}_repos' if detail_pages else None
+        self._detail_staging = f'{self._detail_dir}.tmp' if detail_pages else None
+        
+        # Entries of [page file, first repository, last repository]
+        self._pages = []
+        self._page = None
+        self._page_count = 0
+        self._list = None if self.page_size else tempfile.TemporaryFile('w+', encoding='utf-8')
+        
+        self._executor = None
+        self._rendering = deque()
+        if self._detail_dir:
+            # Left behind by a run that was killed
+            shutil.rmtree(self._detail_staging, ignore_errors=True)
+            os.makedirs(self._detail_staging)
+            self._executor = ThreadPoolExecutor(max_workers=self.workers)
+    
+    @classmethod
+    def _head(cls, title: str) -> str:
+        return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{escape(title, quote=False)}</title>
+    <style>{cls.STYLE}    </style>
+</head>
+<body>
+    <div class="container">
+"""
+    
+    _FOOT = """    </div>
+</body>
+</html>
+"""
+    
+    @staticmethod
+    def detail_filename(repo_name: str) -> str:
+        """File name of a repository's detail page."""
+        return repo_name.replace('/', '__') + '.html'
+    
+    def _detail_link(self, repo_name: str, prefix: str = '') -> str:
+        name = escape(repo_name, quote=False)
+        if not self._detail_dir:
+            return name
+        href = f'{prefix}{os.path.basename(self._detail_dir)}/{self.detail_filename(repo_name)}'
+        return f'<a href="{escape(href)}">{name}</a>'
+    
+    @staticmethod
+    def _repo_stats(repo: Dict[str, Any]) -> str:
+        basic = repo.get('basic') or {}
+        return f"""                <div>{escape(str(basic.get('description') or 'No description'), quote=False)}</div>
+                <div class="repo-stats">
+                    <span>⭐ {basic.get('stargazers_count', 0)}</span>
+                    <span>🔱 {basic.get('forks_count', 0)}</span>
+                    <span>👁️ {basic.get('watchers_count', 0)}</span>
+                    <span>📝 {(repo.get('issues') or {}).get('open_count', 0)} issues</span>
+                    <span>💻 {escape(str(basic.get('language') or 'N/A'), quote=False)}</span>
+                </div>
+"""
+    
+    def _repo_item(self, repo: Dict[str, Any]) -> str:
+        return f"""            <li class="repo-item">
+                <div class="repo-name">{self._detail_link(repo['repository'])}</div>
+{self._repo_stats(repo)}            </li>
+"""
+    
+    def _nav(self, number: int, has_next: bool) -> str:
+        links = [f'<a href="{escape(self._index)}">← Report</a>']
+        if number > 1:
+            links.append(f'<a href="{escape(self._page_name.format(number - 1))}">Previous</a>')
+        if has_next:
+            links.append(f'<a href="{escape(self._page_name.format(number + 1))}">Next</a>')
+        return f'        <nav class="pagination">{" ".join(links)}</nav>\n'
+    
+    def _open_page(self, repo_name: str):
+        if self._page:
+            self._close_page(has_next=True)
+        number = len(self._pages) + 1
+        page_file = self._page_name.format(number)
+        self._pages.append([page_file, repo_name, repo_name])
+        self._page = open(os.path.join(self._directory, page_file + '.tmp'), 'w', encoding='utf-8')
+        self._page_count = 0
+        self._page.write(self._head(f'GitHub Metrics Report - Repositories, page {number}'))
+        self._page.write(f'        <h1>📦 Repositories, page {number}</h1>\n')
+        self._page.write(self._nav(number, has_next=False))
+        self._page.write('        <ul class="repo-list">\n')
+    
+    def _close_page(self, has_next: bool):
+        self._page.write('        </ul>\n')
+        self._page.write(self._nav(len(self._pages), has_next))
+        self._page.write(self._FOOT)
+        self._page.close()
+        self._page = None
+    
+    def _write_detail_page(self, repo: Dict[str, Any]):
+        """Write the page of one repository: headline stats, then a table per section."""
+        path = os.path.join(self._detail_staging, self.detail_filename(repo['repository']))
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self._head(f"{repo['repository']} - GitHub Metrics"))
+            f.write(f'        <nav class="pagination"><a href="../{escape(self._index)}">← Report</a></nav>\n')
+            f.write(f"        <h1>{escape(repo['repository'], quote=False)}</h1>\n")
+            f.write(self._repo_stats(repo))
+            for section, value in repo.items():
+                if section == 'repository':
+                    continue
+                if not isinstance(value, dict):
+                    value = {'value': value}
+                f.write(f'        <h2>{escape(section, quote=False)}</h2>\n        <table>\n            <tbody>\n')
+                for key, item in value.items():
+                    if isinstance(item, (dict, list)):
+                        # Nested listings are summarized; the JSON output has them in full
+                        item = f'{len(item)} entries'
+                    f.write(f'                <tr><th>{escape(str(key), quote=False)}</th><td>{escape(str(item), quote=False)}</td></tr>\n')
+                f.write('            </tbody>\n        </table>\n')
+            f.write(self._FOOT)
+    
+    def write(self, repo_metrics: Dict[str, Any]):
+        """Append one repository to the list, and render its detail page."""
+        if self._executor:
+            # Bound the records waiting to be rendered, as the collection window does
+            while len(self._rendering) >= self.workers * 2:
+                self._rendering.popleft().result()
+            self._rendering.append(self._executor.submit(self._write_detail_page, repo_metrics))
+        
+        if not self.page_size:
+            self._list.write(self._repo_item(repo_metrics))
+            return
+        if self._page is None or self._page_count == self.page_size:
+            self._open_page(repo_metrics['repository'])
+        self._page.write(self._repo_item(repo_metrics))
+        self._page_count += 1
+        self._pages[-1][2] = repo_metrics['repository']
+    
+    def close(self, metrics: Optional[Dict[str, Any]] = None):
+        """Finish the pages, write the report with the summary of metrics and put every file in place."""
+        if self._page:
+            self._close_page(has_next=False)
+        if self._executor:
+            try:
+                for future in self._rendering:
+                    future.result()
+            finally:
+                self._executor.shutdown(wait=True)
+        try:
+            with open(f'{self.filename}.tmp', 'w', encoding='utf-8') as f:
+                self._write_report(f, metrics or {})
+        finally:
+            if self._list:
+                self._list.close()
+        
+        for page_file, _, _ in self._pages:
+            path = os.path.join(self._directory, page_file)
+            os.replace(path + '.tmp', path)
+        for page_file in self._stale_pages():
+            os.remove(os.path.join(self._directory, page_file))
+        if self._detail_dir:
+            previous = f'{self._detail_dir}.old'
+            shutil.rmtree(previous, ignore_errors=True)
+            if os.path.isdir(self._detail_dir):
+                os.rename(self._detail_dir, previous)
+            os.rename(self._detail_staging, self._detail_dir)
+            shutil.rmtree(previous, ignore_errors=True)
+        os.replace(f'{self.filename}.tmp', self.filename)
+    
+    def abort(self):
+        """Discard the pages written so far, leaving the previous report in place."""
+        if self._page:
+            self._page.close()
+            self._page = None
+        if self._executor:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        if self._list:
+            self._list.close()
+        for page_file, _, _ in self._pages:
+            os.remove(os.path.join(self._directory, page_file + '.tmp'))
+        if self._detail_staging:
+            shutil.rmtree(self._detail_staging, ignore_errors=True)
+    
+    def _stale_pages(self) -> List[str]:
+        """Page files of a previous report that this report does not have."""
+        prefix, suffix = self._page_name.split('{}')
+        pattern = re.compile(re.escape(prefix) + r'(\d+)' + re.escape(suffix) + '$')
+        stale = []
+        for name in os.listdir(self._directory or '.'):
+            match = pattern.match(name)
+            if match and int(match.group(1)) > len(self._pages):
+                stale.append(name)
+        return stale
+    
+    def _write_report(self, f, metrics: Dict[str, Any]):
+        summary = metrics.get('summary', {})
+        user_info = metrics.get('user_info', {})
+        
+        def stat(key: str, thousands: bool = False) -> str:
+            # Totals of sections that were not collected are missing from the summary
+            value = summary.get(key)
+            if value is None:
+                return 'N/A'
+            return f'{value:,}' if thousands else str(value)
+        
+        f.write(self._head('GitHub Metrics Report'))
+        f.write(f"""        <h1>📊 GitHub Metrics Report</h1>
+        <p class="timestamp">Generated: {metrics.get('timestamp', 'N/A')}</p>
+        
+        <h2>👤 User Information</h2>
+        <div class="metric-grid">
+            <div class="metric-card">
+                <div class="metric-value">{escape(str(user_info.get('basic_info', {}).get('login', 'N/A')), quote=False)}</div>
+                <div class="metric-label">Username</div>
+            </div>
+            <div class="metric-card">
+                <div class="metric-value">{user_info.get('account_metrics', {}).get('followers', 0)}</div>
+                <div class="metric-label">Followers</div>
+            </div>
+            <div class="metric-card">
+                <div class="metric-value">{user_info.get('account_metrics', {}).get('following', 0)}</div>
+                <div class="metric-label">Following</div>
+            </div>
+            <div class="metric-card">
+                <div class="metric-value">{user_info.get('account_metrics', {}).get('public_repos', 0)}</div>
+                <div class="metric-label">Public Repos</div>
+            </div>
+        </div>
+        
+        <h2>📈 Repository Overview</h2>
+        <div class="metric-grid">
+            <div class="metric-card">
+                <div class="metric-value">{stat('total_repositories')}</div>
+                <div class="metric-label">Total Repositories</div>
+            </div>
+            <div class="metric-card">
+                <div class="metric-value">{stat('total_stars')}</div>
+                <div class="metric-label">Total Stars</div>
+            </div>
+            <div class="metric-card">
+                <div class="metric-value">{stat('total_forks')}</div>
+                <div class="metric-label">Total Forks</div>
+            </div>
+            <div class="metric-card">
+                <div class="metric-value">{stat('total_watchers')}</div>
+                <div class="metric-label">Total Watchers</div>
+            </div>
+            <div class="metric-card">
+                <div class="metric-value">{stat('total_contributors')}</div>
+                <div class="metric-label">Total Contributors</div>
+            </div>
+            <div class="metric-card">
+                <div class="metric-value">{stat('total_commits')}</div>
+                <div class="metric-label">Commits (Last Year)</div>
+            </div>
+            <div class="metric-card">
+                <div class="metric-value">{stat('total_releases')}</div>
+                <div class="metric-label">Total Releases</div>
+            </div>
+            <div class="metric-card">
+                <div class="metric-value">{stat('active_repositories')}</div>
+                <div class="metric-label">Active Repositories</div>
+            </div>
+        </div>
+        
+        <h2>💻 Code Statistics</h2>
+        <div class="metric-grid">
+            <div class="metric-card">
+                <div class="metric-value">{stat('total_code_additions', thousands=True)}</div>
+                <div class="metric-label">Total Lines Added</div>
+            </div>
+            <div class="metric-card">
+                <div class="metric-value">{stat('total_code_deletions', thousands=True)}</div>
+                <div class="metric-label">Total Lines Deleted</div>
+            </div>
+            <div class="metric-card">
+                <div class="metric-value">{stat('total_open_issues')}</div>
+                <div class="metric-label">Open Issues</div>
+            </div>
+            <div class="metric-card">
+                <div class="metric-value">{stat('total_open_prs')}</div>
+                <div class="metric-label">Open Pull Requests</div>
+            </div>
+        </div>
+        
+        <h2>🌐 Language Distribution</h2>
+        <div class="language-bar">
+""")
+        
+        for lang, stats in list(summary.get('languages', {}).items())[:10]:
+            f.write(f"""            <div class="language-item">
+                <span>{escape(lang, quote=False)}</span>
+                <span>{stats.get('percentage', 0)}%</span>
+            </div>
+""")
+        f.write('        </div>\n')
+        
+        for title, key, column, label in (('⭐ Most Starred Repositories', 'most_starred', 'stars', 'Stars'),
+                                          ('🔱 Most Forked Repositories', 'most_forked', 'forks', 'Forks')):
+            f.write(f"""        
+        <h2>{title}</h2>
+        <table>
+            <thead>
+                <tr>
+                    <th>Repository</th>
+                    <th>{label}</th>
+                </tr>
+            </thead>
+            <tbody>
+""")
+            for repo in summary.get(key, [])[:10]:
+                f.write(f"""                <tr>
+                    <td>{self._detail_link(repo['name'])}</td>
+                    <td>{repo[column]}</td>
+                </tr>
+""")
+            f.write('            </tbody>\n        </table>\n')
+        
+        f.write('        \n        <h2>📦 All Repositories</h2>\n        <ul class="repo-list">\n')
+        if self._list:
+            self._list.seek(0)
+            shutil.copyfileobj(self._list, f)
+        else:
+            for number, (page_file, first, last) in enumerate(self._pages, 1):
+                f.write(f"""            <li class="repo-item">
+                <div class="repo-name"><a href="{escape(page_file)}">Page {number}</a></div>
+                <div>{escape(first, quote=False)} … {escape(last, quote=False)}</div>
+            </li>
+""")
+        f.write('        </ul>\n')
+        f.write(self._FOOT)
+
+
+class ShardedJSONWriter:
+    """
+    Write the metrics as small JSON files for the live dashboard.
+    
+    The directory gets a summary.json (summary, user info and timestamp), a
+    repos.json index with the headline numbers of every repository, and one
+    shard per repository under repos/, each with a gzip-compressed .gz twin for
+    servers that serve precompressed files. manifest.json is written last and
+    holds the content hashes of the summary and the index; the index holds the
+    hash of every shard. A client revalidates only the manifest and fetches
+    everything else with its hash in the URL, so unchanged files are served
+    from its cache.
+    """
+    
+    def __init__(self, directory: str):
+        """
+        Prepare the output directory.
+        
+        Args:
+            directory: Directory for the summary, index, shards and manifest
+        """
+        self.directory = directory
+        self.filename = directory
+        os.makedirs(os.path.join(directory, 'repos'), exist_ok=True)
+        self._index = []
+        self._shards = set()
+    
+    @staticmethod
+    def content_hash(data: bytes) -> str:
+        """Short hex digest identifying a file's content."""
+        return hashlib.sha256(data).hexdigest()[:16]
+    
+    @staticmethod
+    def _encode(document: Any) -> bytes:
+        return json.dumps(document, separators=(',', ':')).encode('utf-8')
+    
+    def _write_file(self, name: str, data: bytes) -> Dict[str, Any]:
+        """Write a file and its .gz twin, returning its manifest entry."""
+        compressed = gzip.compress(data, compresslevel=9, mtime=0)
+        path = os.path.join(self.directory, name)
+        for target, content in ((path, data), (f'{path}.gz', compressed)):
+            temporary = f'{target}.tmp'
+            with open(temporary, 'wb') as f:
+                f.write(content)
+            os.replace(temporary, target)
+        return {'hash': self.content_hash(data), 'bytes': len(data), 'gzip_bytes': len(compressed)}
+    
+    def write(self, repo_metrics: Dict[str, Any]):
+        """Write the shard of one repository and add it to the index."""
+        shard = f"repos/{repo_metrics['repository'].replace('/', '__')}.json"
+        entry = self._write_file(shard, self._encode(repo_metrics))
+        # collected_at changes on every run; leaving it out of the hash keeps the
+        # URL of a repository whose metrics did not change
+        entry['hash'] = self.content_hash(self._encode(
+            {key: value for key, value in repo_metrics.items() if key != 'collected_at'}))
+        
+        basic = repo_metrics.get('basic') or {}
+        self._index.append({
+            'name': repo_metrics['repository'],
+            'stars': basic.get('stargazers_count'),
+            'forks': basic.get('forks_count'),
+            'language': basic.get('language'),
+            'shard': shard,
+            'hash': entry['hash'],
+            'bytes': entry['bytes'],
+        })
+        self._shards.add(shard)
+    
+    def abort(self):
+        """
+        Stop after a failed run without publishing it.
+        
+        The previous summary, index and manifest stay in place and no shard is
+        removed, so the dashboard keeps showing the last complete run; shards
+        rewritten before the failure only hold newer metrics of the same
+        repositories.
+        """
+    
+    def close(self, metrics: Optional[Dict[str, Any]] = None):
+        """Write the summary, index and manifest, and remove shards of repositories no longer listed."""
+        metrics = metrics or {}
+        shards_dir = os.path.join(self.directory, 'repos')
+        for name in os.listdir(shards_dir):
+            shard = 'repos/' + (name[:-3] if name.endswith('.gz') else name)
+            if shard not in self._shards:
+                os.remove(os.path.join(shards_dir, name))
+        
+        timestamp = metrics.get('timestamp')
+        files = {
+            'summary.json': self._write_file('summary.json', self._encode({
+                'timestamp': timestamp,
+                'user_info': metrics.get('user_info', {}),
+                'summary': metrics.get('summary', {}),
+            })),
+            'repos.json': self._write_file('repos.json', self._encode({
+                'timestamp': timestamp,
+                'repositories': self._index,
+            })),
+        }
+        
+        # The manifest goes last, so clients never see it point at missing files
+        temporary = os.path.join(self.directory, 'manifest.json.tmp')
+        with open(temporary, 'w') as f:
+            json.dump({'timestamp': timestamp, 'repositories': len(self._index), 'files': files}, f, indent=2)
+        os.replace(temporary, os.path.join(self.directory, 'manifest.json'))
+
+
+class ColumnarTable:
+    """
+    Rows of one flattened table, spooled to a file as they arrive.
+    
+    Only the column names, the kinds of values seen in each and their
+    non-null counts are kept in memory; batches() reads the rows back
+    column-wise once the table is complete.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.rows = 0
+        self._kinds = {}
+        self._filled = {}
+        self._file = open(path, 'w', encoding='utf-8')
+    
+    def _add_column(self, name: str):
+        if name not in self._kinds:
+            self._kinds[name] = set()
+            self._filled[name] = 0
+    
+    def append(self, row: Dict[str, Any]):
+        for name, value in row.items():
+            self._add_column(name)
+            if value is not None:
+                self._kinds[name].add(type(value))
+                self._filled[name] += 1
+        self._file.write(json.dumps(row, separators=(',', ':'), default=str) + '\n')
+        self.rows += 1
+    
+    def extend(self, columns: Dict[str, Any], count: int):
+        """Append count rows given column-wise."""
+        names = list(columns)
+        for name in names:
+            self._add_column(name)
+        for values in zip(*columns.values()):
+            self.append(dict(zip(names, values)))
+    
+    @property
+    def column_types(self) -> Dict[str, str]:
+        """Type of every column, in order of first appearance."""
+        return {name: self.kinds_type(kinds) for name, kinds in self._kinds.items()}
+    
+    def nullable(self, name: str) -> bool:
+        """Whether some row lacks a value for the column."""
+        return self._filled[name] < self.rows
+    
+    def batches(self, size: int) -> Iterator[Dict[str, List[Any]]]:
+        """Read the rows back in batches of up to size rows, as column name -> values padded with None."""
+        self._file.close()
+        with open(self.path, encoding='utf-8') as f:
+            for lines in iter(lambda: list(itertools.islice(f, size)), []):
+                rows = [json.loads(line) for line in lines]
+                yield {name: [row.get(name) for row in rows] for name in self._kinds}
+    
+    def discard(self):
+        """Close and remove the spool file."""
+        self._file.close()
+        os.remove(self.path)
+    
+    @staticmethod
+    def kinds_type(kinds: set) -> str:
+        """Narrowest of bool, int64, float64 and string holding values of the given Python types."""
+        if not kinds or kinds == {bool}:
+            return 'bool'
+        if kinds <= {int}:
+            return 'int64'
+        if kinds <= {int, float}:
+            return 'float64'
+        return 'string'
+
+
+class ColumnarWriter:
+    """
+    Write repository records as flattened, typed columnar tables.
+    
+    Each record becomes one row of the repositories table, with a column per
+    scalar under a dotted path (basic.stargazers_count, community.files.readme).
+    Nested data goes to child tables keyed by repository: one per list
+    (contributors, releases.releases, workflows.workflows, basic.topics, ...),
+    one per keyed map (languages, alert counts by severity and state), and one
+    per weekly series. Tables are written as Parquet files when pyarrow is
+    installed, and otherwise as one little-endian binary file per column with a
+    schema.json describing them; load_columnar_table() reads either.
+    
+    Rows are spooled to a staging directory beside the output as records
+    arrive, so memory does not grow with the number of repositories. A
+    column's type is only known once every row is in, so close() converts the
+    tables in row groups of ROW_GROUP_ROWS into a new directory and then swaps
+    it in for the previous one, dropping tables the run no longer produced;
+    abort() drops the staging directory and leaves the previous tables alone.
+    """
+    
+    # Dicts whose keys are data rather than field names -> (key column, value column)
+    MAP_PATHS = {
+        'languages': ('language', 'bytes'),
+        'dependabot_alerts.by_severity': ('severity', 'count'),
+        'dependabot_alerts.by_state': ('state', 'count'),
+        'code_scanning_alerts.by_severity': ('severity', 'count'),
+        'code_scanning_alerts.by_state': ('state', 'count'),
+    }
+    
+    # Weekly statistics, written as one row per week with the daily commit counts as columns
+    WEEKLY_PATHS = ('commit_activity.weekly_activity', 'code_frequency.weekly_data')
+    
+    # Binary layout of the stdlib fallback
+    ARRAY_TYPECODES = {'bool': 'b', 'int64': 'q', 'float64': 'd'}
+    
+    # Rows converted at once when the tables are written
+    ROW_GROUP_ROWS = 10000
+    
+    def __init__(self, directory: str, parquet: Optional[bool] = None):
+        """
+        Prepare the output directory.
+        
+        Args:
+            directory: Directory for the tables
+            parquet: Write Parquet (default: when pyarrow is installed)
+        """
+        self.directory = directory
+        self.filename = directory
+        self.parquet = pyarrow is not None if parquet is None else parquet
+        if self.parquet and pyarrow is None:
+            raise ValueError("Parquet output requires pyarrow (pip install pyarrow)")
+        parent = os.path.dirname(os.path.abspath(directory))
+        os.makedirs(parent, exist_ok=True)
+        self._staging = tempfile.mkdtemp(prefix=f'.{os.path.basename(os.path.abspath(directory))}.staging-',
+                                         dir=parent)
+        self.tables = {}
+    
+    def _table(self, name: str) -> ColumnarTable:
+        table = self.tables.get(name)
+        if table is None:
+            table = self.tables[name] = ColumnarTable(os.path.join(self._staging, f'{len(self.tables)}.rows'))
+        return table
+    
+    def _flatten(self, repository: str, path: str, value: Any, row: Dict[str, Any],
+                 column: Optional[str] = None):
+        """
+        Add the scalars under value to row, sending nested collections to child tables.
+        
+        path names the value within the record and so the child tables under
+        it; column names it within row, which differs inside child rows.
+        """
+        column = path if column is None else column
+        if path in self.WEEKLY_PATHS:
+            self._add_weekly(repository, path, value or [])
+        elif path in self.MAP_PATHS and isinstance(value, dict):
+            key_column, value_column = self.MAP_PATHS[path]
+            for key, item in value.items():
+                self._table(path).append({'repository': repository, key_column: key, value_column: item})
+        elif isinstance(value, dict):
+            for key, item in value.items():
+                self._flatten(repository, f'{path}.{key}', item, row, f'{column}.{key}')
+        elif isinstance(value, list):
+            for position, item in enumerate(value):
+                child = {'repository': repository, 'position': position}
+                if isinstance(item, dict):
+                    for key, field in item.items():
+                        self._flatten(repository, f'{path}.{key}', field, child, key)
+                else:
+                    child['value'] = item
+                self._table(path).append(child)
+        else:
+            row[column] = value
+    
+    def _add_weekly(self, repository: str, path: str, series: List[Any]):
+        count = len(series)
+        columns = {'repository': [repository] * count}
+        if path == 'commit_activity.weekly_activity':
+            days = [(list(week.get('days') or []) + [0] * 7)[:7] for week in series]
+            columns['week'] = [week.get('week', 0) for week in series]
+            columns['total'] = [week.get('total', 0) for week in series]
+            for day in range(7):
+                columns[f'day_{day}'] = [counts[day] for counts in days]
+        else:
+            columns['week'] = [row[0] for row in series]
+            columns['additions'] = [row[1] for row in series]
+            columns['deletions'] = [row[2] for row in series]
+        self._table(path).extend(columns, count)
+    
+    def write(self, repo_metrics: Dict[str, Any]):
+        """Flatten one repository record into the tables."""
+        row = {}
+        for key, value in repo_metrics.items():
+            if key == 'repository':
+                row[key] = value
+            else:
+                self._flatten(repo_metrics['repository'], key, value, row)
+        self._table('repositories').append(row)
+    
+    def abort(self):
+        """Drop the rows of a failed run, leaving the previous tables in place."""
+        for table in self.tables.values():
+            table.discard()
+        shutil.rmtree(self._staging, ignore_errors=True)
+    
+    def close(self, metrics: Optional[Dict[str, Any]] = None):
+        """Write every table, then replace the previous directory with them."""
+        timestamp = (metrics or {}).get('timestamp')
+        output = os.path.join(self._staging, 'tables')
+        os.mkdir(output)
+        for name, table in self.tables.items():
+            if self.parquet:
+                self._write_parquet(os.path.join(output, f'{name}.parquet'), table, timestamp)
+            else:
+                self._write_arrays(os.path.join(output, name), name, table, timestamp)
+            table.discard()
+        previous = f'{self.directory}.old'
+        shutil.rmtree(previous, ignore_errors=True)
+        if os.path.isdir(self.directory):
+            os.rename(self.directory, previous)
+        os.rename(output, self.directory)
+        shutil.rmtree(previous, ignore_errors=True)
+        shutil.rmtree(self._staging, ignore_errors=True)
+    
+    def _write_parquet(self, path: str, table: ColumnarTable, timestamp: Optional[str]):
+        types = {'bool': pyarrow.bool_(), 'int64': pyarrow.int64(), 'float64': pyarrow.float64(),
+                 'string': pyarrow.string()}
+        column_types = table.column_types
+        schema = pyarrow.schema([(name, types[column_type]) for name, column_type in column_types.items()],
+                                metadata={'timestamp': timestamp or ''})
+        with pyarrow.parquet.ParquetWriter(path, schema) as writer:
+            for batch in table.batches(self.ROW_GROUP_ROWS):
+                arrays = []
+                for name, values in batch.items():
+                    if column_types[name] == 'string':
+                        values = [None if value is None else str(value) for value in values]
+                    elif column_types[name] == 'float64':
+                        values = [None if value is None else float(value) for value in values]
+                    arrays.append(pyarrow.array(values, type=types[column_types[name]]))
+                writer.write_table(pyarrow.Table.from_arrays(arrays, schema=schema))
+    
+    def _write_arrays(self, table_dir: str, name: str, table: ColumnarTable, timestamp: Optional[str]):
+        os.makedirs(table_dir)
+        columns = []
+        files = {}
+        for index, (column_name, column_type) in enumerate(table.column_types.items()):
+            entry = {'name': column_name, 'type': column_type, 'data': f'c{index}.data'}
+            if column_type == 'string':
+                entry['offsets'] = f'c{index}.offsets'
+            if table.nullable(column_name):
+                entry['validity'] = f'c{index}.valid'
+            columns.append(entry)
+            files[column_name] = {key: open(os.path.join(table_dir, entry[key]), 'wb')
+                                  for key in ('data', 'offsets', 'validity') if key in entry}
+        
+        try:
+            # String offsets run on across row groups
+            ends = {entry['name']: 0 for entry in columns if entry['type'] == 'string'}
+            for entry in columns:
+                if entry['type'] == 'string':
+                    self._write_array(files[entry['name']]['offsets'], array('q', [0]))
+            for batch in table.batches(self.ROW_GROUP_ROWS):
+                for entry in columns:
+                    values = batch[entry['name']]
+                    column_files = files[entry['name']]
+                    if entry['type'] == 'string':
+                        encoded = [b'' if value is None else str(value).encode('utf-8') for value in values]
+                        offsets = array('q')
+                        for chunk in encoded:
+                            ends[entry['name']] += len(chunk)
+                            offsets.append(ends[entry['name']])
+                        self._write_array(column_files['offsets'], offsets)
+                        column_files['data'].write(b''.join(encoded))
+                    else:
+                        cast = float if entry['type'] == 'float64' else int
+                        self._write_array(column_files['data'], array(
+                            self.ARRAY_TYPECODES[entry['type']], [0 if value is None else cast(value) for value in values]))
+                    if 'validity' in column_files:
+                        self._write_array(column_files['validity'], array('b', [value is not None for value in values]))
+        finally:
+            for column_files in files.values():
+                for f in column_files.values():
+                    f.close()
+        
+        with open(os.path.join(table_dir, 'schema.json'), 'w') as f:
+            json.dump({'table': name, 'rows': table.rows, 'timestamp': timestamp,
+                       'byteorder': 'little', 'columns': columns}, f, indent=2)
+    
+    @staticmethod
+    def _write_array(f: Any, values: array):
+        if sys.byteorder == 'big':
+            values.byteswap()
+        values.tofile(f)
+
+
+def load_columnar_table(path: str, columns: Optional[List[str]] = None) -> Dict[str, List[Any]]:
+    """
+    Load a table written by ColumnarWriter, reading only the requested columns.
+    
+    Args:
+        path: A table's .parquet file, or its directory in the stdlib layout
+        columns: Columns to load (default: all)
+    
+    Returns:
+        Column name -> list of values, with None for missing values
+    """
+    if path.endswith('.parquet'):
+        if pyarrow is None:
+            raise ValueError("Reading Parquet requires pyarrow (pip install pyarrow)")
+        return pyarrow.parquet.read_table(path, columns=columns).to_pydict()
+    
+    with open(os.path.join(path, 'schema.json')) as f:
+        schema = json.load(f)
+    entries = {entry['name']: entry for entry in schema['columns']}
+    unknown = [name for name in columns or [] if name not in entries]
+    if unknown:
+        raise ValueError(f"Unknown column(s) in {path}: {', '.join(unknown)}")
+    
+    def read(filename: str, typecode: str) -> array:
+        values = array(typecode)
+        with open(os.path.join(path, filename), 'rb') as f:
+            values.frombytes(f.read())
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return values
+    
+    result = {}
+    for name in columns or list(entries):
+        entry = entries[name]
+        if entry['type'] == 'string':
+            offsets = read(entry['offsets'], 'q')
+            with open(os.path.join(path, entry['data']), 'rb') as f:
+                data = f.read()
+            values = [data[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(schema['rows'])]
+        else:
+            values = read(entry['data'], ColumnarWriter.ARRAY_TYPECODES[entry['type']]).tolist()
+            if entry['type'] == 'bool':
+                values = [bool(value) for value in values]
+        if 'validity' in entry:
+            values = [value if valid else None for value, valid in zip(values, read(entry['validity'], 'b'))]
+        result[name] = values
+    return result
+
 
 class GitHubMetricsTracker:
     """
     Comprehensive GitHub metrics tracking system that collects and analyzes
     all available GitHub metrics plus additional custom metrics.
     """
+    
+    # Per-repository scalar metrics available from one GraphQL query. Counts use
+    # totalCount connections, so no issue or pull request objects are downloaded.
+    GRAPHQL_REPOSITORY_FRAGMENT = """
+fragment RepositoryMetrics on Repository {
+  name
+  nameWithOwner
+  description
+  isPrivate
+  isFork
+  createdAt
+  updatedAt
+  pushedAt
+  diskUsage
+  stargazerCount
+  forkCount
+  watchers { totalCount }
+  defaultBranchRef { name }
+  primaryLanguage { name }
+  hasIssuesEnabled
+  hasProjectsEnabled
+  hasWikiEnabled
+  hasDiscussionsEnabled
+  isArchived
+  isDisabled
+  visibility
+  licenseInfo { name }
+  repositoryTopics(first: 100) { nodes { topic { name } } }
+  homepageUrl
+  openIssues: issues(states: OPEN) { totalCount }
+  closedIssues: issues(states: CLOSED) { totalCount }
+  openPullRequests: pullRequests(states: OPEN) { totalCount }
+  closedPullRequests: pullRequests(states: CLOSED) { totalCount }
+  mergedPullRequests: pullRequests(states: MERGED) { totalCount }
+  releases(first: 100, orderBy: {field: CREATED_AT, direction: DESC}) {
+    totalCount
+    nodes {
+      tagName
+      name
+      publishedAt
+      isDraft
+      isPrerelease
+      releaseAssets(first: 100) { totalCount nodes { downloadCount } }
+    }
+  }
+  branches: refs(refPrefix: "refs/heads/", first: 100) {
+    totalCount
+    nodes { name branchProtectionRule { id } }
+  }
+  tags: refs(refPrefix: "refs/tags/", first: 10, orderBy: {field: TAG_COMMIT_DATE, direction: DESC}) {
+    totalCount
+    nodes { name }
+  }
+}
+"""
+    
+    # Sections of a repository record that the GraphQL backend fills
+    GRAPHQL_SECTIONS = ('basic', 'issues', 'pull_requests', 'releases', 'branches', 'tags')
+    
+    # Per-repository sections in record order; dependencies come before their dependents
+    COLLECTORS = (
+        Collector('basic', 'get_repository_basic_metrics', ('/repos/{repo}',)),
+        Collector('languages', 'get_languages', ('/repos/{repo}/languages',)),
+        Collector('contributors', 'get_contributors', ('/repos/{repo}/contributors',)),
+        Collector('contributor_count', '_count_contributors', cost=0, depends=('contributors',)),
+        Collector('commit_activity', 'get_commit_activity', ('/repos/{repo}/stats/commit_activity',)),
+        Collector('code_frequency', 'get_code_frequency', ('/repos/{repo}/stats/code_frequency',)),
+        Collector('participation', 'get_participation', ('/repos/{repo}/stats/participation',)),
+        Collector('issues', 'get_issues_metrics', ('/repos/{repo}/issues',), cost=2),
+        Collector('pull_requests', 'get_pull_requests_metrics', ('/repos/{repo}/pulls',), cost=2),
+        Collector('releases', 'get_releases_metrics', ('/repos/{repo}/releases',)),
+        Collector('branches', 'get_branches_metrics', ('/repos/{repo}/branches',)),
+        Collector('tags', 'get_tags_metrics', ('/repos/{repo}/tags',)),
+        Collector('traffic', 'get_traffic_metrics',
+                  ('/repos/{repo}/traffic/views', '/repos/{repo}/traffic/clones',
+                   '/repos/{repo}/traffic/popular/referrers', '/repos/{repo}/traffic/popular/paths'), cost=4),
+        Collector('community', 'get_community_metrics', ('/repos/{repo}/community/profile',)),
+        Collector('dependabot_alerts', 'get_dependabot_alerts', ('/repos/{repo}/dependabot/alerts',)),
+        Collector('code_scanning_alerts', 'get_code_scanning_alerts', ('/repos/{repo}/code-scanning/alerts',)),
+        Collector('workflows', 'get_workflows_metrics',
+                  ('/repos/{repo}/actions/workflows', '/repos/{repo}/actions/runs'), cost=2),
+        Collector('custom', 'get_custom_metrics', cost=0, depends=('basic',)),
+    )
+    
+    # Most runs the workflow runs listing returns for one filtered query
+    WORKFLOW_RUNS_LIMIT = 1000
+    
+    # Listing fields that change whenever a repository needs re-collecting
+    INCREMENTAL_FIELDS = ('pushed_at', 'updated_at', 'stargazers_count', 'forks_count',
+                          'watchers_count', 'open_issues_count')
+    
+    # Sections covering a window that moves with time, collected again for unchanged repositories
+    WINDOWED_COLLECTORS = ('commit_activity', 'code_frequency', 'participation', 'traffic', 'workflows')
 
-    def __init__(self, token: Optional[str] = None, username: Optional[str] = None):
+    def __init__(self, token: Optional[str] = None, username: Optional[str] = None, workers: int = 1,
+                 transport: Optional[HTTPTransport] = None, cache: Optional[ConditionalRequestCache] = None,
+                 page_concurrency: int = 4, backend: str = 'rest', graphql_batch_size: int = 10,
+                 stats_deadline: float = 120.0, previous_metrics: Optional[Dict[str, Any]] = None,
+                 counter_store: Optional[IssueCounterStore] = None, tokens: Optional[List[str]] = None,
+                 metrics: Optional[List[str]] = None, skip_metrics: Optional[List[str]] = None,
+                 collector_concurrency: int = 1, aggregates: Optional[List[str]] = None,
+                 partial_summary_path: Optional[str] = None, partial_summary_every: int = 10,
+                 checkpoint: Optional[RunCheckpoint] = None, resume: bool = False,
+                 org: Optional[str] = None, shard: Optional[str] = None, workflow_run_window: int = 30):
         """
         Initialize the GitHub Metrics Tracker.
         
         Args:
             token: GitHub personal access token (optional, but required for private repos and higher rate limits)
             username: GitHub username to track (if not provided, will track authenticated user)
+            workers: Number of repositories to collect concurrently (default: 1, sequential)
+            transport: HTTP transport to send requests through (default: pooled keep-alive session)
+            cache: Conditional request cache for ETag/Last-Modified revalidation (default: no caching)
+            page_concurrency: Maximum number of pages fetched concurrently per API host (default: 4)
+            backend: 'rest', or 'graphql' to batch per-repository scalar metrics into GraphQL queries
+            graphql_batch_size: Repositories fetched per GraphQL query (default: 10)
+            stats_deadline: Seconds to keep polling /stats/* endpoints that answer 202 (0 disables prefetching)
+            previous_metrics: Metrics of a previous run; unchanged repositories are carried over from it,
+                except for their time-windowed sections
+            counter_store: Persistent issue/PR counters; only items updated since the last run are fetched
+            tokens: Additional tokens to spread repository requests over; the first token is the primary one
+            metrics: Collectors to run (default: all); their dependencies are added automatically
+            skip_metrics: Collectors not to run, along with the collectors that depend on them
+            collector_concurrency: Collectors of one repository run concurrently (default: 1, sequential)
+            aggregates: Extra summary aggregates as FIELD:STAT, e.g. 'stars:median' or 'open_issues:p95'
+            partial_summary_path: JSON file the running summary is written to during the run
+            partial_summary_every: Repositories collected between two writes of partial_summary_path
+            checkpoint: Checkpoint completed repositories are recorded in as the run goes
+            resume: Continue the run recorded in checkpoint instead of starting over
+            org: Organization to track instead of a user
+            shard: Slice of the repositories to collect as INDEX/COUNT, e.g. '2/4'
+            workflow_run_window: Days of workflow runs the run statistics cover (default: 30)
         """
-        self.token = token or os.environ.get('GITHUB_TOKEN')
-        self.username = username
+        tokens = [t for t in [token] + list(tokens or []) if t]
+        if not tokens and os.environ.get('GITHUB_TOKEN'):
+            tokens = [os.environ['GITHUB_TOKEN']]
+        self.token = tokens[0] if tokens else None
+        self.org = org
+        self.username = org or username
+        self.workers = max(1, workers)
+        self.page_concurrency = max(1, page_concurrency)
+        self.transport = transport or create_transport(pool_size=max(10, self.workers + self.page_concurrency))
+        self.cache = cache
         self.headers = {
             'Accept': 'application/vnd.github+json',
             'X-GitHub-Api-Version': '2022-11-28'
@@ -39,58 +2760,270 @@ class GitHubMetricsTracker:
             self.headers['Authorization'] = f'token {self.token}'
         
         self.base_url = 'https://api.github.com'
+        self.backend = backend
+        self.graphql_batch_size = max(1, graphql_batch_size)
+        self.stats_deadline = stats_deadline
+        self.stats_prefetcher = None
+        self.previous_metrics = previous_metrics
+        self.counter_store = counter_store
+        self.workflow_run_window = max(1, workflow_run_window)
+        self.checkpoint = checkpoint
+        self.resume = resume
+        self.collectors = self.select_collectors(metrics, skip_metrics)
+        self.collector_concurrency = max(1, collector_concurrency)
+        self.summary_aggregates = parse_aggregates(aggregates or [])
+        # Summary of the repositories collected so far, queryable mid-run
+        self.running_summary = SummaryAggregator(aggregates=self.summary_aggregates)
+        self._running_summary_lock = threading.Lock()
+        self._repositories_total = None
+        self.partial_summary_path = partial_summary_path
+        self.partial_summary_every = max(1, partial_summary_every)
+        self.shard = parse_shard(shard) if shard else None
         self.metrics = {
             'repositories': [],
             'summary': {},
             'timestamp': datetime.now(timezone.utc).isoformat(),
             'user_info': {}
         }
+        if self.shard:
+            self.metrics['shard'] = {'index': self.shard[0], 'count': self.shard[1]}
+        
+        # Rate limit budgets shared by all worker threads, one governor per token,
+        # so requests are paced across the whole run and one exhausted budget
+        # pauses every worker using that token
+        self.token_pool = TokenPool(list(dict.fromkeys(tokens)))
+        self.max_retries = 3
+        
+        # Remaining pages of paginated listings are fetched on a shared pool,
+        # bounded per API host
+        self._page_executor = ThreadPoolExecutor(max_workers=self.page_concurrency)
+        self._host_semaphores = defaultdict(lambda: threading.BoundedSemaphore(self.page_concurrency))
+        self._host_semaphores_lock = threading.Lock()
+        
+        # Independent collectors of a repository run on a shared pool
+        self._collector_executor = None
+        if self.collector_concurrency > 1:
+            self._collector_executor = ThreadPoolExecutor(max_workers=self.workers * self.collector_concurrency)
+        
+        # Sections prefetched by the GraphQL backend, keyed by repository full name
+        self._prefetched = {}
+        self.graphql_points_used = 0
+    
+    def close(self):
+        """Close the HTTP transport and its pooled connections, and the request cache."""
+        self._page_executor.shutdown(wait=False)
+        if self._collector_executor:
+            self._collector_executor.shutdown(wait=False)
+        self.transport.close()
+        if self.cache:
+            self.cache.close()
+    
+    @property
+    def rate_governor(self) -> RateLimitGovernor:
+        """The rate limit governor of the primary token."""
+        return self.token_pool.primary
+    
+    def _send(self, method: str, url: str, headers: Dict, params: Optional[Dict] = None,
+              json_body: Optional[Any] = None, repos: Optional[List[str]] = None,
+              token_index: Optional[int] = None, prepare: Optional[Callable[[Dict, int], None]] = None):
+        """
+        Send a request with the token that has the most budget left, paced by that
+        token's rate limit governor, retrying rate-limited responses.
+        
+        Args:
+            repos: Repositories the request touches when they are not in the URL
+            token_index: Send with this token instead of choosing one
+            prepare: Called with the headers and token index of every attempt once its token is set
+        """
+        headers = dict(headers)
+        for attempt in range(self.max_retries + 1):
+            index = token_index if token_index is not None else self.token_pool.select(url, repos)
+            token = self.token_pool.tokens[index]
+            governor = self.token_pool.governors[index]
+            if token:
+                headers['Authorization'] = f'token {token}'
+            else:
+                headers.pop('Authorization', None)
+            if prepare:
+                prepare(headers, index)
+            
+            bucket = governor.bucket_for(url)
+            governor.acquire(bucket)
+            response = self.transport.request(method, url, headers=headers, params=params, json=json_body)
+            bucket = governor.update(bucket, response.headers)
+            
+            wait_time = governor.backoff(bucket, response)
+            if wait_time is None or attempt == self.max_retries:
+                return response
+            if token_index is None and len(self.token_pool) > 1:
+                # Another token may have budget left; only wait if this one was the best choice
+                continue
+            print(f"Rate limit reached ({bucket}). Waiting {int(wait_time)} seconds...")
+        return response
+    
+    def _token_identity(self, index: int) -> Optional[str]:
+        """
+        Return the account token `index` authenticates as, resolved once per token.
+        
+        The request cache is keyed by this identity instead of the token, so a
+        token that changes every run still finds the entries of the previous one.
+        User tokens resolve to their login. Installation tokens (GITHUB_TOKEN)
+        cannot call /user and resolve to the repositories they can access. When
+        neither works, the token's own fingerprint is used.
+        """
+        pool = self.token_pool
+        token = pool.tokens[index]
+        if not token:
+            return None
+        with pool.identity_lock:
+            if pool.identities[index] is None:
+                pool.identities[index] = self._resolve_token_identity(index, token)
+            return pool.identities[index]
+    
+    def _resolve_token_identity(self, index: int, token: str) -> str:
+        """Ask the API which account a token authenticates as (see _token_identity)."""
+        try:
+            response = self._send('GET', f'{self.base_url}/user', self.headers, token_index=index)
+            if response.status_code == 200:
+                return 'user:' + response.json()['login'].lower()
+            
+            names = []
+            page = 1
+            while True:
+                response = self._send('GET', f'{self.base_url}/installation/repositories', self.headers,
+                                      params={'per_page': 100, 'page': page}, token_index=index)
+                if response.status_code != 200:
+                    break
+                repositories = response.json().get('repositories') or []
+                names.extend(repo['full_name'].lower() for repo in repositories)
+                if len(repositories) < 100:
+                    scope = hashlib.sha256('\n'.join(sorted(names)).encode('utf-8')).hexdigest()[:16]
+                    return f'installation:{scope}'
+                page += 1
+        except (*self.transport.errors, ValueError, KeyError, TypeError, AttributeError) as e:
+            print(f"Warning: could not resolve the account of token #{index + 1} "
+                  f"({e}); its cache entries are kept per token")
+        return 'token:' + hashlib.sha256(token.encode('utf-8')).hexdigest()[:16]
     
     def _make_request(self, url: str, params: Optional[Dict] = None, extra_headers: Optional[Dict] = None) -> Optional[Any]:
         """Make a request to the GitHub API with rate limit handling."""
+        return self._request(url, params, extra_headers)[0]
+    
+    def _request(self, url: str, params: Optional[Dict] = None,
+                 extra_headers: Optional[Dict] = None) -> Tuple[Optional[Any], CaseInsensitiveDict, Optional[int]]:
+        """
+        Make a request to the GitHub API.
+        
+        Returns the parsed body, the response headers and the status code (200 for
+        bodies served from the request cache, None when the request failed).
+        """
         try:
             # Merge extra headers if provided
             headers = self.headers.copy()
             if extra_headers:
                 headers.update(extra_headers)
             
-            response = requests.get(url, headers=headers, params=params)
+            # Revalidate cached responses; 304s do not count against the rate limit. The key
+            # depends on the token, which is only known once _send has picked one.
+            cache_key = None
             
-            # Handle rate limiting
-            if response.status_code == 403 and 'rate limit' in response.text.lower():
-                reset_time = int(response.headers.get('X-RateLimit-Reset', 0))
-                wait_time = max(reset_time - int(time.time()), 0) + 1
-                print(f"Rate limit reached. Waiting {wait_time} seconds...")
-                time.sleep(wait_time)
-                response = requests.get(url, headers=headers, params=params)
+            def revalidate(attempt_headers: Dict, token_index: int):
+                nonlocal cache_key
+                cache_key = self.cache.make_key(url, params, attempt_headers, self._token_identity(token_index))
+                attempt_headers.pop('If-None-Match', None)
+                attempt_headers.pop('If-Modified-Since', None)
+                attempt_headers.update(self.cache.validators(cache_key))
+            
+            response = self._send('GET', url, headers, params=params, prepare=revalidate if self.cache else None)
+            
+            if response.status_code == 304 and cache_key:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    data, cached_headers = cached
+                    headers = CaseInsensitiveDict(cached_headers)
+                    headers.update(response.headers)
+                    return data, headers, 200
             
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            data = response.json()
+            if cache_key and response.status_code == 200:
+                self.cache.store(cache_key, response.headers, data)
+            return data, CaseInsensitiveDict(response.headers), response.status_code
+        except self.transport.errors as e:
             print(f"Error making request to {url}: {e}")
+            return None, CaseInsensitiveDict(), None
+    
+    @staticmethod
+    def _parse_last_page(link_header: Optional[str]) -> Optional[int]:
+        """Extract the page number of the rel="last" link from a Link header."""
+        if not link_header:
+            return None
+        match = re.search(r'<([^>]+)>;\s*rel="last"', link_header)
+        if not match:
+            return None
+        page = parse_qs(urlparse(match.group(1)).query).get('page')
+        try:
+            return int(page[0]) if page else None
+        except ValueError:
             return None
     
-    def _get_all_pages(self, url: str, params: Optional[Dict] = None) -> List[Any]:
-        """Fetch all pages of paginated results."""
-        all_results = []
-        page = 1
+    def _fetch_page(self, url: str, page_params: Dict) -> Optional[Any]:
+        """Fetch one page of a listing, holding the per-host concurrency limit."""
+        host = urlparse(url).netloc
+        with self._host_semaphores_lock:
+            semaphore = self._host_semaphores[host]
+        with semaphore:
+            return self._make_request(url, page_params)
+    
+    @staticmethod
+    def _page_items(response: Any, items_key: Optional[str]) -> Any:
+        """Items of a listing page, unwrapped from items_key for listings that return an object."""
+        if items_key and isinstance(response, dict):
+            return response.get(items_key)
+        return response
+    
+    def _get_all_pages(self, url: str, params: Optional[Dict] = None, items_key: Optional[str] = None) -> List[Any]:
+        """
+        Fetch all pages of paginated results.
+        
+        When the first response carries a Link header with rel="last", the
+        remaining pages are fetched concurrently and reassembled in page order.
+        Otherwise pages are fetched one after another until a short page.
+        Listings that wrap their items in an object (e.g. workflow_runs) name
+        the key in items_key.
+        """
         per_page = 100
+        first_params = {'page': 1, 'per_page': per_page}
+        if params:
+            first_params.update(params)
+        per_page = first_params['per_page']
         
-        while True:
-            page_params = {'page': page, 'per_page': per_page}
-            if params:
-                page_params.update(params)
-            
-            results = self._make_request(url, page_params)
+        results, headers, _ = self._request(url, first_params)
+        results = self._page_items(results, items_key)
+        if not results or len(results) == 0:
+            return []
+        
+        all_results = list(results)
+        last_page = self._parse_last_page(headers.get('Link'))
+        
+        if last_page is not None:
+            page_params = [dict(first_params, page=page) for page in range(2, last_page + 1)]
+            pages = self._page_executor.map(lambda p: self._fetch_page(url, p), page_params)
+            for results in pages:
+                results = self._page_items(results, items_key)
+                # Stop at the first failed or empty page, as sequential paging would
+                if not results:
+                    break
+                all_results.extend(results)
+            return all_results
+        
+        page = 1
+        while len(results) >= per_page:
+            page += 1
+            results = self._page_items(self._make_request(url, dict(first_params, page=page)), items_key)
             if not results or len(results) == 0:
                 break
-            
             all_results.extend(results)
-            
-            if len(results) < per_page:
-                break
-            
-            page += 1
         
         return all_results
     
@@ -101,8 +3034,18 @@ class GitHubMetricsTracker:
             if user_data:
                 self.username = user_data.get('login')
         else:
-            user_data = self._make_request(f'{self.base_url}/users/{self.username}')
+            user_data = self._make_request(self._owner_url())
         
+        return self._build_user_info(user_data)
+    
+    def _owner_url(self) -> str:
+        """API URL of the tracked account: the organization, or else the user."""
+        if self.org:
+            return f'{self.base_url}/orgs/{self.org}'
+        return f'{self.base_url}/users/{self.username}'
+    
+    def _build_user_info(self, user_data: Optional[Dict]) -> Dict[str, Any]:
+        """Build user metrics from a user API response and record them."""
         if not user_data:
             return {}
         
@@ -138,7 +3081,10 @@ class GitHubMetricsTracker:
     def get_repository_basic_metrics(self, repo_full_name: str) -> Dict[str, Any]:
         """Fetch basic repository metrics."""
         repo_data = self._make_request(f'{self.base_url}/repos/{repo_full_name}')
-        
+        return self._build_basic_metrics(repo_data)
+    
+    def _build_basic_metrics(self, repo_data: Optional[Dict]) -> Dict[str, Any]:
+        """Build basic repository metrics from a repository API response."""
         if not repo_data:
             return {}
         
@@ -182,18 +3128,34 @@ class GitHubMetricsTracker:
     def get_contributors(self, repo_full_name: str) -> List[Dict[str, Any]]:
         """Fetch contributor statistics."""
         contributors = self._get_all_pages(f'{self.base_url}/repos/{repo_full_name}/contributors')
-        
+        return self._build_contributors(contributors)
+    
+    def _build_contributors(self, contributors: List[Dict]) -> List[Dict[str, Any]]:
+        """Build contributor statistics from the contributors listing."""
         return [{
             'login': c.get('login'),
             'contributions': c.get('contributions', 0),
             'type': c.get('type')
         } for c in contributors]
     
+    def _get_stats(self, repo_full_name: str, endpoint: str) -> Optional[Any]:
+        """
+        Fetch a /stats/* endpoint.
+        
+        While the stats prefetcher is running, its result is used instead (None if
+        still pending); the final values are merged in by _apply_prefetched_stats.
+        """
+        if self.stats_prefetcher:
+            return self.stats_prefetcher.get(repo_full_name, endpoint)
+        return self._make_request(f'{self.base_url}/repos/{repo_full_name}/stats/{endpoint}')
+    
     def get_commit_activity(self, repo_full_name: str) -> Dict[str, Any]:
         """Fetch commit activity statistics."""
         # Get commit activity for the last year
-        commit_activity = self._make_request(f'{self.base_url}/repos/{repo_full_name}/stats/commit_activity')
-        
+        return self._build_commit_activity(self._get_stats(repo_full_name, 'commit_activity'))
+    
+    def _build_commit_activity(self, commit_activity: Optional[List]) -> Dict[str, Any]:
+        """Build commit activity statistics from weekly commit counts."""
         if not commit_activity:
             return {'total_commits': 0, 'weekly_activity': []}
         
@@ -206,8 +3168,10 @@ class GitHubMetricsTracker:
     
     def get_code_frequency(self, repo_full_name: str) -> Dict[str, Any]:
         """Fetch code frequency statistics (additions/deletions)."""
-        code_freq = self._make_request(f'{self.base_url}/repos/{repo_full_name}/stats/code_frequency')
-        
+        return self._build_code_frequency(self._get_stats(repo_full_name, 'code_frequency'))
+    
+    def _build_code_frequency(self, code_freq: Optional[List]) -> Dict[str, Any]:
+        """Build code frequency statistics from weekly addition/deletion counts."""
         if not code_freq:
             return {'total_additions': 0, 'total_deletions': 0}
         
@@ -223,8 +3187,10 @@ class GitHubMetricsTracker:
     
     def get_participation(self, repo_full_name: str) -> Dict[str, Any]:
         """Fetch participation statistics."""
-        participation = self._make_request(f'{self.base_url}/repos/{repo_full_name}/stats/participation')
-        
+        return self._build_participation(self._get_stats(repo_full_name, 'participation'))
+    
+    def _build_participation(self, participation: Optional[Dict]) -> Dict[str, Any]:
+        """Build participation statistics from owner/all weekly commit counts."""
         if not participation:
             return {}
         
@@ -236,6 +3202,9 @@ class GitHubMetricsTracker:
     
     def get_issues_metrics(self, repo_full_name: str) -> Dict[str, Any]:
         """Fetch comprehensive issue metrics."""
+        if self.counter_store:
+            return self._get_issues_metrics_delta(repo_full_name)
+        
         # Open issues
         open_issues = self._get_all_pages(
             f'{self.base_url}/repos/{repo_full_name}/issues',
@@ -248,6 +3217,10 @@ class GitHubMetricsTracker:
             {'state': 'closed', 'per_page': 100}
         )
         
+        return self._build_issues_metrics(open_issues, closed_issues)
+    
+    def _build_issues_metrics(self, open_issues: List[Dict], closed_issues: List[Dict]) -> Dict[str, Any]:
+        """Build issue metrics from open and closed issue listings."""
         # Filter out pull requests (they show up in issues endpoint)
         open_issues_only = [i for i in open_issues if 'pull_request' not in i]
         closed_issues_only = [i for i in closed_issues if 'pull_request' not in i]
@@ -260,8 +3233,76 @@ class GitHubMetricsTracker:
             'closed_prs': len(closed_issues) - len(closed_issues_only),
         }
     
+    def _get_issues_metrics_delta(self, repo_full_name: str) -> Dict[str, Any]:
+        """Fetch issue metrics by applying issues updated since the stored watermark to stored counters."""
+        entry = self.counter_store.get(repo_full_name, 'issues')
+        seeding = not (entry and entry['watermark'])
+        if seeding:
+            entry = {'watermark': '', 'states': {}, 'counts': {}}
+        
+        # Ascending update order makes a partial fetch a prefix, so the watermark of a
+        # partial update stays safe. A seed cut short is not stored.
+        items, complete = self._get_updated_since(f'{self.base_url}/repos/{repo_full_name}/issues',
+                                                  entry['watermark'])
+        entry = IssueCounterStore.apply(
+            entry, items,
+            lambda i: ('pr_' if 'pull_request' in i else 'issue_') + ('open' if i.get('state') == 'open' else 'closed')
+        )
+        if seeding and not complete:
+            print(f"Warning: issue counters of {repo_full_name} could not be seeded completely; "
+                  f"they will be seeded again next run")
+        else:
+            self.counter_store.put(repo_full_name, 'issues', entry)
+        
+        counts = entry['counts']
+        return {
+            'open_count': counts.get('issue_open', 0),
+            'closed_count': counts.get('issue_closed', 0),
+            'total_count': counts.get('issue_open', 0) + counts.get('issue_closed', 0),
+            'open_prs': counts.get('pr_open', 0),
+            'closed_prs': counts.get('pr_closed', 0),
+        }
+    
+    def _get_updated_since(self, url: str, since: str) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Fetch the items of a listing updated since a watermark, in ascending update order.
+        
+        Pages are fetched one at a time, and each request restarts from the
+        `updated_at` of the last item received rather than asking for the next
+        page number: an item updated during the walk moves to the end of the
+        order, which would shift unseen items back across a page boundary.
+        Items at the restart time come again and are harmless to re-apply. Only
+        a page full of items sharing one `updated_at` is followed by number.
+        
+        Returns:
+            The items, and whether the walk completed; an incomplete walk is a
+            prefix of the ascending order
+        """
+        items = []
+        page = 1
+        while True:
+            params = {'state': 'all', 'sort': 'updated', 'direction': 'asc', 'per_page': 100, 'page': page}
+            if since:
+                params['since'] = since
+            results, _, status = self._request(url, params)
+            if status is None:
+                return items, False
+            if not results:
+                return items, True
+            items.extend(results)
+            if len(results) < 100:
+                return items, True
+            last = results[-1].get('updated_at') or ''
+            if last and last != since:
+                since, page = last, 1
+            else:
+                page += 1
+    
     def get_pull_requests_metrics(self, repo_full_name: str) -> Dict[str, Any]:
         """Fetch comprehensive pull request metrics."""
+        if self.counter_store:
+            return self._get_pull_requests_metrics_delta(repo_full_name)
+        
         # Open PRs
         open_prs = self._get_all_pages(
             f'{self.base_url}/repos/{repo_full_name}/pulls',
@@ -274,6 +3315,89 @@ class GitHubMetricsTracker:
             {'state': 'closed', 'per_page': 100}
         )
         
+        return self._build_pull_requests_metrics(open_prs, closed_prs)
+    
+    def _get_pull_requests_metrics_delta(self, repo_full_name: str) -> Dict[str, Any]:
+        """Fetch pull request metrics by applying pull requests updated since the stored watermark to stored counters."""
+        url = f'{self.base_url}/repos/{repo_full_name}/pulls'
+        entry = self.counter_store.get(repo_full_name, 'pulls')
+        
+        if entry and entry['watermark']:
+            # The pulls endpoint has no `since`; walk newest-updated first and stop at the watermark
+            updated = []
+            page = 1
+            while True:
+                results, _, status = self._request(
+                    url, {'state': 'all', 'sort': 'updated', 'direction': 'desc', 'per_page': 100, 'page': page}
+                )
+                if status is None:
+                    # Keep the stored counters rather than advance past items we never saw
+                    updated = []
+                    break
+                if not results:
+                    break
+                fresh = [pr for pr in results if (pr.get('updated_at') or '') >= entry['watermark']]
+                updated.extend(fresh)
+                if len(fresh) < len(results) or len(results) < 100:
+                    break
+                page += 1
+        else:
+            # Seed in ascending creation order, one page at a time: unlike update order,
+            # a pull request updated during the walk keeps its position, so none is
+            # skipped. A seed cut short is not stored.
+            entry = {'watermark': '', 'states': {}, 'counts': {}}
+            # Pull requests updated during the walk may have been seen in an older
+            # state; a watermark no later than the start (with a margin for clock
+            # skew) makes the next run apply them again
+            started = (datetime.now(timezone.utc) - timedelta(minutes=5)).strftime('%Y-%m-%dT%H:%M:%SZ')
+            updated = []
+            complete = False
+            page = 1
+            while True:
+                results, _, status = self._request(
+                    url, {'state': 'all', 'sort': 'created', 'direction': 'asc', 'per_page': 100, 'page': page}
+                )
+                if status is None:
+                    break
+                updated.extend(results or [])
+                if not results or len(results) < 100:
+                    complete = True
+                    break
+                page += 1
+            entry = IssueCounterStore.apply(entry, updated, self._classify_pull_request)
+            if not complete:
+                print(f"Warning: pull request counters of {repo_full_name} could not be seeded completely; "
+                      f"they will be seeded again next run")
+                return self._pull_request_counts(entry)
+            entry['watermark'] = min(entry['watermark'], started)
+            self.counter_store.put(repo_full_name, 'pulls', entry)
+            return self._pull_request_counts(entry)
+        
+        entry = IssueCounterStore.apply(entry, updated, self._classify_pull_request)
+        self.counter_store.put(repo_full_name, 'pulls', entry)
+        return self._pull_request_counts(entry)
+    
+    @staticmethod
+    def _classify_pull_request(pr: Dict[str, Any]) -> str:
+        return 'open' if pr.get('state') == 'open' else ('merged' if pr.get('merged_at') else 'closed')
+    
+    @staticmethod
+    def _pull_request_counts(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Pull request metrics from stored counters."""
+        counts = entry['counts']
+        open_prs = counts.get('open', 0)
+        merged_prs = counts.get('merged', 0)
+        closed_prs = counts.get('closed', 0) + merged_prs
+        return {
+            'open_count': open_prs,
+            'closed_count': closed_prs,
+            'merged_count': merged_prs,
+            'total_count': open_prs + closed_prs,
+            'merge_rate': merged_prs / closed_prs if closed_prs else 0
+        }
+    
+    def _build_pull_requests_metrics(self, open_prs: List[Dict], closed_prs: List[Dict]) -> Dict[str, Any]:
+        """Build pull request metrics from open and closed pull request listings."""
         # Merged PRs
         merged_prs = [pr for pr in closed_prs if pr.get('merged_at')]
         
@@ -288,7 +3412,10 @@ class GitHubMetricsTracker:
     def get_releases_metrics(self, repo_full_name: str) -> Dict[str, Any]:
         """Fetch release metrics."""
         releases = self._get_all_pages(f'{self.base_url}/repos/{repo_full_name}/releases')
-        
+        return self._build_releases_metrics(releases)
+    
+    def _build_releases_metrics(self, releases: List[Dict]) -> Dict[str, Any]:
+        """Build release metrics from the releases listing."""
         total_downloads = 0
         for release in releases:
             for asset in release.get('assets', []):
@@ -312,7 +3439,10 @@ class GitHubMetricsTracker:
     def get_branches_metrics(self, repo_full_name: str) -> Dict[str, Any]:
         """Fetch branch metrics."""
         branches = self._get_all_pages(f'{self.base_url}/repos/{repo_full_name}/branches')
-        
+        return self._build_branches_metrics(branches)
+    
+    def _build_branches_metrics(self, branches: List[Dict]) -> Dict[str, Any]:
+        """Build branch metrics from the branches listing."""
         return {
             'total_branches': len(branches),
             'branches': [{
@@ -324,7 +3454,10 @@ class GitHubMetricsTracker:
     def get_tags_metrics(self, repo_full_name: str) -> Dict[str, Any]:
         """Fetch tag metrics."""
         tags = self._get_all_pages(f'{self.base_url}/repos/{repo_full_name}/tags')
-        
+        return self._build_tags_metrics(tags)
+    
+    def _build_tags_metrics(self, tags: List[Dict]) -> Dict[str, Any]:
+        """Build tag metrics from the tags listing."""
         return {
             'total_tags': len(tags),
             'latest_tags': [t.get('name') for t in tags[:10]]
@@ -332,10 +3465,18 @@ class GitHubMetricsTracker:
     
     def get_traffic_metrics(self, repo_full_name: str) -> Dict[str, Any]:
         """Fetch traffic metrics (requires push access to the repository)."""
+        views = self._make_request(f'{self.base_url}/repos/{repo_full_name}/traffic/views')
+        clones = self._make_request(f'{self.base_url}/repos/{repo_full_name}/traffic/clones')
+        referrers = self._make_request(f'{self.base_url}/repos/{repo_full_name}/traffic/popular/referrers')
+        paths = self._make_request(f'{self.base_url}/repos/{repo_full_name}/traffic/popular/paths')
+        return self._build_traffic_metrics(views, clones, referrers, paths)
+    
+    def _build_traffic_metrics(self, views: Optional[Dict], clones: Optional[Dict],
+                               referrers: Optional[List], paths: Optional[List]) -> Dict[str, Any]:
+        """Build traffic metrics from the views, clones, referrers and paths responses."""
         traffic_data = {}
         
         # Views
-        views = self._make_request(f'{self.base_url}/repos/{repo_full_name}/traffic/views')
         if views:
             traffic_data['views'] = {
                 'count': views.get('count', 0),
@@ -344,7 +3485,6 @@ class GitHubMetricsTracker:
             }
         
         # Clones
-        clones = self._make_request(f'{self.base_url}/repos/{repo_full_name}/traffic/clones')
         if clones:
             traffic_data['clones'] = {
                 'count': clones.get('count', 0),
@@ -353,7 +3493,6 @@ class GitHubMetricsTracker:
             }
         
         # Popular referrers
-        referrers = self._make_request(f'{self.base_url}/repos/{repo_full_name}/traffic/popular/referrers')
         if referrers:
             traffic_data['top_referrers'] = [{
                 'referrer': r.get('referrer'),
@@ -362,7 +3501,6 @@ class GitHubMetricsTracker:
             } for r in referrers[:10]]
         
         # Popular paths
-        paths = self._make_request(f'{self.base_url}/repos/{repo_full_name}/traffic/popular/paths')
         if paths:
             traffic_data['top_paths'] = [{
                 'path': p.get('path'),
@@ -376,7 +3514,10 @@ class GitHubMetricsTracker:
     def get_community_metrics(self, repo_full_name: str) -> Dict[str, Any]:
         """Fetch community profile metrics."""
         community = self._make_request(f'{self.base_url}/repos/{repo_full_name}/community/profile')
-        
+        return self._build_community_metrics(community)
+    
+    def _build_community_metrics(self, community: Optional[Dict]) -> Dict[str, Any]:
+        """Build community profile metrics from the community profile response."""
         if not community:
             return {}
         
@@ -407,7 +3548,10 @@ class GitHubMetricsTracker:
     def get_dependabot_alerts(self, repo_full_name: str) -> Dict[str, Any]:
         """Fetch Dependabot alerts."""
         alerts = self._get_all_pages(f'{self.base_url}/repos/{repo_full_name}/dependabot/alerts')
-        
+        return self._build_dependabot_alerts(alerts)
+    
+    def _build_dependabot_alerts(self, alerts: List[Dict]) -> Dict[str, Any]:
+        """Build Dependabot alert metrics from the alerts listing."""
         if not alerts:
             return {'total_alerts': 0, 'by_severity': {}, 'by_state': {}}
         
@@ -431,7 +3575,10 @@ class GitHubMetricsTracker:
     def get_code_scanning_alerts(self, repo_full_name: str) -> Dict[str, Any]:
         """Fetch code scanning alerts."""
         alerts = self._get_all_pages(f'{self.base_url}/repos/{repo_full_name}/code-scanning/alerts')
-        
+        return self._build_code_scanning_alerts(alerts)
+    
+    def _build_code_scanning_alerts(self, alerts: List[Dict]) -> Dict[str, Any]:
+        """Build code scanning alert metrics from the alerts listing."""
         if not alerts:
             return {'total_alerts': 0, 'by_severity': {}, 'by_state': {}}
         
@@ -451,38 +3598,146 @@ class GitHubMetricsTracker:
         }
     
     def get_workflows_metrics(self, repo_full_name: str) -> Dict[str, Any]:
-        """Fetch GitHub Actions workflow metrics."""
-        workflows = self._make_request(f'{self.base_url}/repos/{repo_full_name}/actions/workflows')
+        """Fetch GitHub Actions workflows and their run statistics over the run window."""
+        workflows = self._make_request(f'{self.base_url}/repos/{repo_full_name}/actions/workflows', {'per_page': 100})
         
         if not workflows or 'workflows' not in workflows:
             return {'total_workflows': 0, 'workflows': []}
         
+        runs, truncated = [], False
+        if workflows['workflows']:
+            runs, truncated = self._get_workflow_runs(repo_full_name)
+        
+        return self._build_workflows_metrics(workflows, runs, truncated)
+    
+    def _get_workflow_runs(self, repo_full_name: str) -> Tuple[Optional[List[Dict[str, Any]]], bool]:
+        """
+        Fetch the workflow runs created within the run window.
+        
+        A filtered runs listing stops at WORKFLOW_RUNS_LIMIT runs, so a date
+        range whose total_count is above that is split in halves until every
+        part fits. A single day with more runs keeps its first
+        WORKFLOW_RUNS_LIMIT. Returns the runs, or None when a request failed,
+        and whether fewer runs were received than total_count reported.
+        """
+        url = f'{self.base_url}/repos/{repo_full_name}/actions/runs'
+        runs = {}
+        truncated = False
+        ranges = [self._workflow_run_range()]
+        while ranges:
+            start, end = ranges.pop()
+            params = self._workflow_runs_params(start, end)
+            first, _, status = self._request(url, dict(params, page=1))
+            if status is None or not isinstance(first, dict):
+                return None, truncated
+            total = first.get('total_count', 0)
+            if total > self.WORKFLOW_RUNS_LIMIT and start < end:
+                ranges.extend(self._split_run_range(start, end))
+                continue
+            pages = [first] + list(self._page_executor.map(
+                lambda page: self._fetch_page(url, dict(params, page=page)), self._run_pages(total, params)))
+            if any(not isinstance(page, dict) for page in pages):
+                return None, truncated
+            received = [run for page in pages for run in page.get('workflow_runs') or []]
+            truncated = truncated or len(received) < total
+            runs.update((run.get('id'), run) for run in received)
+        return list(runs.values()), truncated
+    
+    def _workflow_run_range(self) -> Tuple[date, date]:
+        """First and last day (UTC) of the run window."""
+        today = datetime.now(timezone.utc).date()
+        return today - timedelta(days=self.workflow_run_window), today
+    
+    @staticmethod
+    def _workflow_runs_params(start: date, end: date) -> Dict[str, Any]:
+        """Query of the repository's workflow runs created from start to end, both days included."""
+        return {'created': f'{start.isoformat()}..{end.isoformat()}', 'exclude_pull_requests': 'true', 'per_page': 100}
+    
+    @staticmethod
+    def _split_run_range(start: date, end: date) -> List[Tuple[date, date]]:
+        """Halves of a date range of more runs than one listing returns."""
+        middle = start + (end - start) // 2
+        return [(start, middle), (middle + timedelta(days=1), end)]
+    
+    def _run_pages(self, total: int, params: Dict[str, Any]) -> range:
+        """Page numbers after the first of a runs listing reporting total runs."""
+        per_page = params['per_page']
+        return range(2, -(-min(total, self.WORKFLOW_RUNS_LIMIT) // per_page) + 1)
+    
+    def _build_workflows_metrics(self, workflows: Dict, runs: Optional[List[Dict[str, Any]]],
+                                 truncated: bool = False) -> Dict[str, Any]:
+        """
+        Build workflow metrics from the workflows listing and the runs of the run window.
+        
+        Runs are grouped by workflow in one pass. The success rate is over
+        completed runs. Durations run from a run's start to its last update,
+        which is its completion for completed runs; queue times from its
+        creation to its start, for first attempts only, as a re-run restarts
+        the clock. Both are reported as p50/p95 in seconds, or None without
+        runs to measure. When the runs could not be listed (runs is None),
+        every run statistic is None and runs_status is 'failed' rather than
+        reporting zero runs; 'truncated' marks windows with runs left out.
+        """
+        if runs is None:
+            runs_status = 'failed'
+        else:
+            runs_status = 'truncated' if truncated else 'complete'
+        grouped = {workflow['id']: {'total': 0, 'completed': 0, 'successful': 0, 'failed': 0,
+                                    'durations': [], 'queue_times': []}
+                   for workflow in workflows['workflows']}
+        for run in runs or []:
+            stats = grouped.get(run.get('workflow_id'))
+            # Runs of workflows deleted since are not listed
+            if stats is None:
+                continue
+            stats['total'] += 1
+            conclusion = run.get('conclusion')
+            created = self._parse_github_datetime(run.get('created_at'))
+            started = self._parse_github_datetime(run.get('run_started_at'))
+            if conclusion:
+                stats['completed'] += 1
+                stats['successful'] += conclusion == 'success'
+                stats['failed'] += conclusion == 'failure'
+                updated = self._parse_github_datetime(run.get('updated_at'))
+                if started and updated:
+                    stats['durations'].append(max(0.0, (updated - started).total_seconds()))
+            if created and started and run.get('run_attempt', 1) == 1:
+                stats['queue_times'].append(max(0.0, (started - created).total_seconds()))
+        
+        def percentiles(values: List[float]) -> Tuple[Optional[float], Optional[float]]:
+            if not values:
+                return None, None
+            values.sort()
+            return round(_percentile(values, 50), 1), round(_percentile(values, 95), 1)
+        
         workflow_stats = []
         for workflow in workflows['workflows']:
-            workflow_id = workflow['id']
-            runs = self._make_request(
-                f'{self.base_url}/repos/{repo_full_name}/actions/workflows/{workflow_id}/runs',
-                {'per_page': 100}
-            )
-            
-            if runs and 'workflow_runs' in runs:
-                successful = sum(1 for r in runs['workflow_runs'] if r.get('conclusion') == 'success')
-                failed = sum(1 for r in runs['workflow_runs'] if r.get('conclusion') == 'failure')
-                total = len(runs['workflow_runs'])
-                
-                workflow_stats.append({
-                    'name': workflow.get('name'),
-                    'state': workflow.get('state'),
-                    'path': workflow.get('path'),
-                    'total_runs': total,
-                    'successful_runs': successful,
-                    'failed_runs': failed,
-                    'success_rate': successful / total if total > 0 else 0
-                })
+            stats = grouped[workflow['id']]
+            duration_p50, duration_p95 = percentiles(stats['durations'])
+            queue_p50, queue_p95 = percentiles(stats['queue_times'])
+            details = {
+                'name': workflow.get('name'),
+                'state': workflow.get('state'),
+                'path': workflow.get('path'),
+                'total_runs': stats['total'],
+                'successful_runs': stats['successful'],
+                'failed_runs': stats['failed'],
+                'success_rate': stats['successful'] / stats['completed'] if stats['completed'] > 0 else 0,
+                'duration_p50_seconds': duration_p50,
+                'duration_p95_seconds': duration_p95,
+                'queue_p50_seconds': queue_p50,
+                'queue_p95_seconds': queue_p95,
+            }
+            if runs is None:
+                # Unknown rather than zero: every field after name, state and path is a run statistic
+                details.update(dict.fromkeys(list(details)[3:]))
+            workflow_stats.append(details)
         
         return {
             'total_workflows': len(workflows['workflows']),
             'active_workflows': sum(1 for w in workflows['workflows'] if w.get('state') == 'active'),
+            'run_window_days': self.workflow_run_window,
+            'runs_status': runs_status,
             'workflows': workflow_stats
         }
     
@@ -538,8 +3793,85 @@ class GitHubMetricsTracker:
         
         return custom
     
+    @classmethod
+    def select_collectors(cls, metrics: Optional[List[str]] = None,
+                          skip_metrics: Optional[List[str]] = None) -> List[Collector]:
+        """
+        Resolve a metrics selection against the collector registry.
+        
+        Selected collectors pull in their dependencies; skipped collectors take
+        the collectors depending on them along. Raises ValueError on unknown names.
+        """
+        registry = {collector.name: collector for collector in cls.COLLECTORS}
+        unknown = [name for name in list(metrics or []) + list(skip_metrics or []) if name not in registry]
+        if unknown:
+            raise ValueError(f"Unknown metrics: {', '.join(unknown)} (available: {', '.join(registry)})")
+        
+        selected = set(metrics or registry)
+        stack = list(selected)
+        while stack:
+            for dependency in registry[stack.pop()].depends:
+                if dependency not in selected:
+                    selected.add(dependency)
+                    stack.append(dependency)
+        
+        skipped = set(skip_metrics or [])
+        for collector in cls.COLLECTORS:
+            missing = [d for d in collector.depends if d in skipped]
+            if missing and collector.name not in skipped:
+                if collector.name in selected:
+                    print(f"Skipping {collector.name}: it depends on {', '.join(missing)}")
+                skipped.add(collector.name)
+        
+        return [c for c in cls.COLLECTORS if c.name in selected and c.name not in skipped]
+    
+    @property
+    def collector_names(self) -> List[str]:
+        """Names of the sections this tracker collects, in record order."""
+        return [collector.name for collector in self.collectors]
+    
+    def _count_contributors(self, repo_full_name: str, contributors: List[Dict[str, Any]]) -> int:
+        """Count a repository's contributors."""
+        return len(contributors)
+    
+    def _run_collector(self, collector: Collector, repo_full_name: str, sections: Dict[str, Any]) -> Any:
+        """Run one collector, passing it the sections it depends on."""
+        return getattr(self, collector.method)(repo_full_name, *[sections[d] for d in collector.depends])
+    
+    def _run_collectors(self, repo_full_name: str, prefetched: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the selected collectors for one repository and return their sections.
+        
+        A collector starts as soon as its dependencies are done. Up to
+        collector_concurrency collectors are in flight at once; derived
+        collectors (cost 0) run inline.
+        """
+        sections = {}
+        pending = list(self.collectors)
+        running = {}
+        while pending or running:
+            for collector in list(pending):
+                if not all(d in sections for d in collector.depends):
+                    continue
+                if collector.name in prefetched:
+                    sections[collector.name] = prefetched[collector.name]
+                elif collector.cost == 0 or not self._collector_executor:
+                    sections[collector.name] = self._run_collector(collector, repo_full_name, sections)
+                elif len(running) < self.collector_concurrency:
+                    future = self._collector_executor.submit(self._run_collector, collector, repo_full_name, sections)
+                    running[future] = collector.name
+                else:
+                    continue
+                pending.remove(collector)
+            
+            if running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    sections[running.pop(future)] = future.result()
+        return sections
+    
     def collect_all_metrics_for_repo(self, repo_full_name: str) -> Dict[str, Any]:
-        """Collect all available metrics for a single repository."""
+        """Collect the selected metrics for a single repository."""
         print(f"Collecting metrics for {repo_full_name}...")
         
         repo_metrics = {
@@ -547,151 +3879,633 @@ class GitHubMetricsTracker:
             'collected_at': datetime.now(timezone.utc).isoformat()
         }
         
-        # Basic metrics
-        repo_metrics['basic'] = self.get_repository_basic_metrics(repo_full_name)
+        # Sections already fetched by the GraphQL backend, if any
+        prefetched = self._prefetched.pop(repo_full_name, {})
         
-        # Language metrics
-        repo_metrics['languages'] = self.get_languages(repo_full_name)
+        sections = self._run_collectors(repo_full_name, prefetched)
+        for name in self.collector_names:
+            repo_metrics[name] = sections[name]
         
-        # Contributors
-        repo_metrics['contributors'] = self.get_contributors(repo_full_name)
-        repo_metrics['contributor_count'] = len(repo_metrics['contributors'])
-        
-        # Commit activity
-        repo_metrics['commit_activity'] = self.get_commit_activity(repo_full_name)
+        return repo_metrics
+    
+    def _graphql_query(self, query: str, variables: Optional[Dict] = None,
+                       repos: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Run a GraphQL query, tracking its cost against the GraphQL point budget.
         
-        # Code frequency
-        repo_metrics['code_frequency'] = self.get_code_frequency(repo_full_name)
+        `repos` lists the repositories the query touches, so it is only sent with
+        a token that can see all of them.
+        """
+        try:
+            response = self._send(
+                'POST', f'{self.base_url}/graphql', self.headers,
+                json_body={'query': query, 'variables': variables or {}},
+                repos=repos or []
+            )
+            response.raise_for_status()
+            payload = response.json()
+        except self.transport.errors as e:
+            print(f"Error making GraphQL request: {e}")
+            return None
         
-        # Participation
-        repo_metrics['participation'] = self.get_participation(repo_full_name)
+        for error in payload.get('errors') or []:
+            print(f"GraphQL error: {error.get('message')}")
         
-        # Issues
-        repo_metrics['issues'] = self.get_issues_metrics(repo_full_name)
+        data = payload.get('data') or {}
+        rate_limit = data.get('rateLimit')
+        if rate_limit:
+            # The remaining budget is also reported in the X-RateLimit-* headers
+            # and tracked by the governor of the token that sent the query
+            self.graphql_points_used += rate_limit.get('cost', 0)
+        return data
+    
+    def _build_graphql_sections(self, node: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Build the basic, issues, pull_requests, releases, branches and tags sections
+        from a GraphQL repository node, in the same shape as the REST collectors.
         
-        # Pull requests
-        repo_metrics['pull_requests'] = self.get_pull_requests_metrics(repo_full_name)
+        Fields GraphQL does not expose (has_pages, has_downloads, network_count) are None.
+        Branches are listed up to the first 100; downloads are summed over the latest
+        100 releases.
+        """
+        open_issues = node['openIssues']['totalCount']
+        closed_issues = node['closedIssues']['totalCount']
+        open_prs = node['openPullRequests']['totalCount']
+        merged_prs = node['mergedPullRequests']['totalCount']
+        # REST state=closed pull requests include merged ones
+        closed_prs = node['closedPullRequests']['totalCount'] + merged_prs
+        releases = node['releases']['nodes']
         
-        # Releases
-        repo_metrics['releases'] = self.get_releases_metrics(repo_full_name)
+        basic = {
+            'name': node.get('name'),
+            'full_name': node.get('nameWithOwner'),
+            'description': node.get('description'),
+            'private': node.get('isPrivate', False),
+            'fork': node.get('isFork', False),
+            'created_at': node.get('createdAt'),
+            'updated_at': node.get('updatedAt'),
+            'pushed_at': node.get('pushedAt'),
+            'size': node.get('diskUsage') or 0,
+            'stargazers_count': node.get('stargazerCount', 0),
+            # REST reports watchers_count as the star count and subscribers as watchers
+            'watchers_count': node.get('stargazerCount', 0),
+            'forks_count': node.get('forkCount', 0),
+            'open_issues_count': open_issues + open_prs,
+            'default_branch': (node.get('defaultBranchRef') or {}).get('name'),
+            'language': (node.get('primaryLanguage') or {}).get('name'),
+            'has_issues': node.get('hasIssuesEnabled', False),
+            'has_projects': node.get('hasProjectsEnabled', False),
+            'has_downloads': None,
+            'has_wiki': node.get('hasWikiEnabled', False),
+            'has_pages': None,
+            'has_discussions': node.get('hasDiscussionsEnabled', False),
+            'archived': node.get('isArchived', False),
+            'disabled': node.get('isDisabled', False),
+            'visibility': (node.get('visibility') or '').lower() or None,
+            'license': (node.get('licenseInfo') or {}).get('name'),
+            'topics': [t['topic']['name'] for t in node['repositoryTopics']['nodes']],
+            'homepage': node.get('homepageUrl'),
+            'network_count': None,
+            'subscribers_count': node['watchers']['totalCount'],
+        }
         
-        # Branches
-        repo_metrics['branches'] = self.get_branches_metrics(repo_full_name)
+        return {
+            'basic': basic,
+            'issues': {
+                'open_count': open_issues,
+                'closed_count': closed_issues,
+                'total_count': open_issues + closed_issues,
+                'open_prs': open_prs,
+                'closed_prs': closed_prs,
+            },
+            'pull_requests': {
+                'open_count': open_prs,
+                'closed_count': closed_prs,
+                'merged_count': merged_prs,
+                'total_count': open_prs + closed_prs,
+                'merge_rate': merged_prs / closed_prs if closed_prs else 0
+            },
+            'releases': {
+                'total_releases': node['releases']['totalCount'],
+                'latest_release': releases[0].get('tagName') if releases else None,
+                'latest_release_date': releases[0].get('publishedAt') if releases else None,
+                'total_asset_downloads': sum(
+                    asset.get('downloadCount', 0)
+                    for r in releases for asset in r['releaseAssets']['nodes']
+                ),
+                'releases': [{
+                    'tag_name': r.get('tagName'),
+                    'name': r.get('name'),
+                    'published_at': r.get('publishedAt'),
+                    'draft': r.get('isDraft'),
+                    'prerelease': r.get('isPrerelease'),
+                    'assets_count': r['releaseAssets']['totalCount']
+                } for r in releases[:10]]  # Last 10 releases
+            },
+            'branches': {
+                'total_branches': node['branches']['totalCount'],
+                'branches': [{
+                    'name': b.get('name'),
+                    'protected': b.get('branchProtectionRule') is not None
+                } for b in node['branches']['nodes']]
+            },
+            'tags': {
+                'total_tags': node['tags']['totalCount'],
+                'latest_tags': [t.get('name') for t in node['tags']['nodes']]
+            },
+        }
+    
+    def collect_graphql_batch(self, repo_names: List[str]) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Fetch per-repository scalar metrics for many repositories with aliased GraphQL queries.
         
-        # Tags
-        repo_metrics['tags'] = self.get_tags_metrics(repo_full_name)
+        Returns the GraphQL-backed sections keyed by repository full name. Repositories
+        that could not be resolved are left out and fall back to REST.
+        """
+        if not self.token:
+            print("Warning: the GraphQL API requires a token, falling back to REST")
+            return {}
         
-        # Traffic (may require special permissions)
-        repo_metrics['traffic'] = self.get_traffic_metrics(repo_full_name)
+        sections = {}
+        for start in range(0, len(repo_names), self.graphql_batch_size):
+            batch = repo_names[start:start + self.graphql_batch_size]
+            declarations = []
+            selections = []
+            variables = {}
+            for i, full_name in enumerate(batch):
+                owner, name = full_name.split('/', 1)
+                declarations.append(f'$owner{i}: String!, $name{i}: String!')
+                selections.append(f'  r{i}: repository(owner: $owner{i}, name: $name{i}) {{ ...RepositoryMetrics }}')
+                variables[f'owner{i}'] = owner
+                variables[f'name{i}'] = name
+            
+            query = (
+                f'query({", ".join(declarations)}) {{\n'
+                + '\n'.join(selections)
+                + '\n  rateLimit { cost remaining resetAt }\n}\n'
+                + self.GRAPHQL_REPOSITORY_FRAGMENT
+            )
+            data = self._graphql_query(query, variables, repos=batch)
+            if not data:
+                continue
+            
+            for i, full_name in enumerate(batch):
+                node = data.get(f'r{i}')
+                if node:
+                    sections[full_name] = self._build_graphql_sections(node)
         
-        # Community
-        repo_metrics['community'] = self.get_community_metrics(repo_full_name)
+        print(f"GraphQL: fetched {len(sections)}/{len(repo_names)} repositories "
+              f"({self.graphql_points_used} points used)")
+        return sections
+    
+    def _list_repositories(self) -> List[Dict[str, Any]]:
+        """List the user's or organization's repositories as returned by the API, restricted to the shard."""
+        if not self.username:
+            self.get_user_info()
         
-        # Security metrics
-        repo_metrics['dependabot_alerts'] = self.get_dependabot_alerts(repo_full_name)
-        repo_metrics['code_scanning_alerts'] = self.get_code_scanning_alerts(repo_full_name)
+        repos = self._get_all_pages(f'{self._owner_url()}/repos', {'per_page': 100})
+        repos = self._select_shard(repos)
+        self._discover_token_visibility(repos)
+        return repos
+    
+    def _select_shard(self, repos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Keep the repositories of this runner's shard, if sharding."""
+        if not self.shard:
+            return repos
+        selected = shard_repositories(repos, *self.shard)
+        print(f"Shard {self.shard[0]}/{self.shard[1]}: {len(selected)} of {len(repos)} repositories")
+        return selected
+    
+    def _discover_token_visibility(self, repos: List[Dict[str, Any]]):
+        """
+        Restrict private repositories to the pool tokens that can see them.
         
-        # Workflows
-        repo_metrics['workflows'] = self.get_workflows_metrics(repo_full_name)
+        The listing was made with the primary token, which therefore sees every
+        repository in it. Each additional token lists the repositories it can
+        access once, and private repositories missing from that list are never
+        routed to it.
+        """
+        private = {repo['full_name'] for repo in repos if repo.get('private')}
+        if not private or len(self.token_pool) < 2:
+            return
         
-        # Custom metrics
-        repo_metrics['custom'] = self.get_custom_metrics(repo_full_name, repo_metrics['basic'])
+        visible_to = {name: [0] for name in private}
+        for index in range(1, len(self.token_pool)):
+            page = 1
+            while True:
+                try:
+                    response = self._send('GET', f'{self.base_url}/user/repos', self.headers,
+                                          params={'per_page': 100, 'page': page}, token_index=index)
+                    if response.status_code != 200:
+                        print(f"Warning: could not list repositories visible to token #{index + 1} "
+                              f"(HTTP {response.status_code}); private repositories will not use it")
+                        break
+                    listed = response.json()
+                except (*self.transport.errors, ValueError) as e:
+                    print(f"Warning: could not list repositories visible to token #{index + 1} "
+                          f"({e}); private repositories will not use it")
+                    break
+                for repo in listed:
+                    if repo.get('full_name') in visible_to:
+                        visible_to[repo['full_name']].append(index)
+                if len(listed) < 100:
+                    break
+                page += 1
         
-        return repo_metrics
+        for name, indexes in visible_to.items():
+            self.token_pool.restrict(name, indexes)
     
     def get_all_repositories(self) -> List[str]:
         """Get all repositories for the user."""
+        return [repo['full_name'] for repo in self._list_repositories()]
+    
+    def get_search_totals(self) -> Dict[str, int]:
+        """
+        Fetch user-wide issue and pull request totals from the Search API.
+        
+        Each total is one search query read through `total_count`, so the cost is
+        constant regardless of how many issues exist. Search has its own rate limit
+        (30 requests per minute when authenticated). Search excludes issues in
+        forked repositories.
+        """
         if not self.username:
             self.get_user_info()
         
-        repos = self._get_all_pages(f'{self.base_url}/users/{self.username}/repos', {'per_page': 100})
-        
-        return [repo['full_name'] for repo in repos]
+        totals = {}
+        for key, query in self._search_queries().items():
+            result = self._make_request(f'{self.base_url}/search/issues', {'q': query, 'per_page': 1})
+            self._add_search_total(totals, key, query, result)
+        return totals
     
-    def track_all_repositories(self) -> Dict[str, Any]:
-        """Track metrics for all repositories."""
-        print("Starting comprehensive GitHub metrics tracking...")
+    def _search_queries(self) -> Dict[str, str]:
+        """Search API queries of the totals reported by get_search_totals, keyed by summary field."""
+        owner = f'org:{self.org}' if self.org else f'user:{self.username}'
+        return {
+            'total_open_issues': f'is:issue {owner} state:open',
+            'total_closed_issues': f'is:issue {owner} state:closed',
+            'total_open_prs': f'is:pr {owner} state:open',
+            'total_merged_prs': f'is:pr {owner} is:merged',
+        }
+    
+    @staticmethod
+    def _add_search_total(totals: Dict[str, int], key: str, query: str, result: Optional[Dict[str, Any]]):
+        """Record the total_count of a search result; failed searches are left out."""
+        if result is None:
+            return
+        if result.get('incomplete_results'):
+            print(f"Warning: search results for '{query}' are incomplete")
+        totals[key] = result.get('total_count', 0)
+    
+    def track_summary_only(self) -> Dict[str, Any]:
+        """
+        Compute summary statistics without deep per-repository collection.
+        
+        Repository counts, stars and forks come from the repository listing, and
+        issue/PR totals from the Search API, so a refresh costs a handful of
+        requests. Totals that need deep collection (contributors, commits, code
+        frequency, releases, languages) are omitted, and no per-repository
+        records are produced.
+        """
+        print("Starting summary-only GitHub metrics tracking...")
         
-        # Get user info
         self.get_user_info()
-        print(f"Tracking repositories for user: {self.username}")
+        print(f"Tracking repositories for {'organization' if self.org else 'user'}: {self.username}")
+        
+        basics = [self._build_basic_metrics(repo) for repo in self._list_repositories()]
+        print(f"Found {len(basics)} repositories")
+        
+        # Search totals cover the whole account and cannot be split by shard
+        search_totals = self.get_search_totals() if basics and not self.shard else {}
+        self.metrics['summary'] = self._listing_summary(basics, search_totals)
+        return self.metrics
+    
+    def _listing_summary(self, basics: List[Dict[str, Any]], search_totals: Dict[str, int]) -> Dict[str, Any]:
+        """Build the summary of track_summary_only from the listed repositories and the search totals."""
+        if not basics:
+            return {}
+        
+        active = sum(
+            1 for b in basics
+            if self.get_custom_metrics(b['full_name'], b).get('is_active', False)
+        )
+        summary = {
+            'total_repositories': len(basics),
+            'total_stars': sum(b.get('stargazers_count', 0) for b in basics),
+            'total_forks': sum(b.get('forks_count', 0) for b in basics),
+            'total_watchers': sum(b.get('watchers_count', 0) for b in basics),
+            'active_repositories': active,
+            'archived_repositories': sum(1 for b in basics if b.get('archived', False)),
+            'private_repositories': sum(1 for b in basics if b.get('private', False)),
+            'public_repositories': sum(1 for b in basics if not b.get('private', False)),
+            'forked_repositories': sum(1 for b in basics if b.get('fork', False)),
+        }
+        summary.update(search_totals)
+        
+        summary['most_starred'] = sorted(
+            [{'name': b['full_name'], 'stars': b.get('stargazers_count', 0)} for b in basics],
+            key=lambda x: x['stars'],
+            reverse=True
+        )[:10]
+        
+        summary['most_forked'] = sorted(
+            [{'name': b['full_name'], 'forks': b.get('forks_count', 0)} for b in basics],
+            key=lambda x: x['forks'],
+            reverse=True
+        )[:10]
+        
+        return summary
+    
+    def _collect_repository_safely(self, repo_name: str) -> Optional[Dict[str, Any]]:
+        """Collect metrics for one repository, isolating any failure to that repository."""
+        try:
+            return self.collect_all_metrics_for_repo(repo_name)
+        except Exception as e:
+            print(f"Error collecting metrics for {repo_name}: {e}")
+            return None
+    
+    def _apply_prefetched_stats(self, repo_metrics: Dict[str, Any]):
+        """Wait for a repository's prefetched statistics, then rebuild its statistics sections."""
+        repo_name = repo_metrics['repository']
+        self.stats_prefetcher.wait_for(repo_name)
+        builders = {
+            'commit_activity': self._build_commit_activity,
+            'code_frequency': self._build_code_frequency,
+            'participation': self._build_participation,
+        }
+        for endpoint in self.stats_prefetcher.endpoints:
+            repo_metrics[endpoint] = builders[endpoint](self.stats_prefetcher.pop(repo_name, endpoint))
+    
+    def _find_unchanged_repositories(self, listing: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Return previous records of repositories whose listing fields have not moved since the last run."""
+        if not self.previous_metrics:
+            return {}
+        
+        previous = {r.get('repository'): r for r in self.previous_metrics.get('repositories', [])}
+        unchanged = {}
+        for repo in listing:
+            record = previous.get(repo['full_name'])
+            if not record or not record.get('basic'):
+                continue
+            # A section selected now but not collected last time needs a fresh collection
+            if any(name not in record for name in self.collector_names):
+                continue
+            if all(record['basic'].get(field) == repo.get(field) for field in self.INCREMENTAL_FIELDS):
+                unchanged[repo['full_name']] = record
+        return unchanged
+    
+    def _load_checkpoint(self) -> Optional[Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]]:
+        """Load the checkpoint to resume from, if resuming and it was taken with the same settings."""
+        if not (self.checkpoint and self.resume):
+            return None
+        state = self.checkpoint.load()
+        if state is None:
+            print(f"No checkpoint to resume at {self.checkpoint.path}, starting a new run")
+            return None
+        header = state[0]
+        if ((self.username and header.get('username') != self.username) or header.get('collectors') != self.collector_names
+                or header.get('shard') != self.metrics.get('shard')):
+            print(f"Warning: checkpoint {self.checkpoint.path} is for a different user, metrics selection or shard, "
+                  f"starting a new run")
+            return None
+        return state
+    
+    def _carried_sections(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Sections of a previous record to reuse for an unchanged repository.
+        
+        The time-windowed sections and the custom metrics, which depend on the
+        current time, are left out so that they are collected again.
+        """
+        return {name: record[name] for name in self.collector_names
+                if name not in self.WINDOWED_COLLECTORS and name != 'custom'}
+    
+    def _iter_collected(self, repo_names: List[str]) -> Iterator[Optional[Dict[str, Any]]]:
+        """
+        Collect the given repositories, yielding their records (None on failure) in order.
+        
+        With several workers, at most twice as many repositories as workers are
+        in flight or waiting to be consumed, so finished records do not pile up.
+        """
+        if self.workers == 1:
+            for repo_name in repo_names:
+                yield self._collect_repository_safely(repo_name)
+            return
+        
+        print(f"Collecting with {self.workers} workers")
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            names = iter(repo_names)
+            window = deque(executor.submit(self._collect_repository_safely, name)
+                           for name in itertools.islice(names, self.workers * 2))
+            while window:
+                future = window.popleft()
+                for name in itertools.islice(names, 1):
+                    window.append(executor.submit(self._collect_repository_safely, name))
+                yield future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def iter_repository_metrics(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the metrics record of every repository, in listing order.
+        
+        Each record is yielded as soon as it is complete and is not retained by
+        the tracker, so a consumer that writes records out as they arrive keeps
+        memory flat regardless of the number of repositories. The user info is
+        stored in self.metrics as usual, and every record is folded into
+        self.running_summary before it is yielded. A record whose /stats/*
+        results GitHub is still computing is held back, along with the records
+        after it, until they are ready or the statistics deadline has passed
+        after the last repository is collected.
+        """
+        # A resumed run keeps the timestamp, user info and repository order it started with
+        resumed = self._load_checkpoint()
+        completed = {}
+        if resumed:
+            header, completed = resumed
+            self.username = header['username']
+            self.metrics['timestamp'] = header['timestamp']
+            self.metrics['user_info'] = header['user_info']
+        else:
+            self.get_user_info()
+        print(f"Tracking repositories for {'organization' if self.org else 'user'}: {self.username}")
         
         # Get all repositories
-        repo_names = self.get_all_repositories()
+        listing = self._list_repositories()
+        repo_names = header['repositories'] if resumed else [repo['full_name'] for repo in listing]
         print(f"Found {len(repo_names)} repositories")
+        self._start_running_summary(len(repo_names))
+        
+        if resumed:
+            print(f"Resuming from {self.checkpoint.path}: {len(completed)} of {len(repo_names)} "
+                  f"repositories already collected")
+            self.checkpoint.resume()
+        elif self.checkpoint:
+            self.checkpoint.start({
+                'timestamp': self.metrics['timestamp'],
+                'username': self.username,
+                'user_info': self.metrics['user_info'],
+                'collectors': self.collector_names,
+                'shard': self.metrics.get('shard'),
+                'repositories': repo_names,
+            })
+        
+        # In incremental mode, unchanged repositories only have their time-windowed sections collected again
+        unchanged = self._find_unchanged_repositories([repo for repo in listing if repo['full_name'] not in completed])
+        to_collect = [name for name in repo_names if name not in completed]
+        if self.previous_metrics:
+            print(f"Incremental: {len(unchanged)} unchanged, {len(to_collect) - len(unchanged)} to collect in full")
+        del listing
+        
+        # Warm up /stats/* endpoints so GitHub computes them while we collect
+        stats_endpoints = [name for name in StatsPrefetcher.ENDPOINTS if name in self.collector_names]
+        if self.stats_deadline > 0 and to_collect and stats_endpoints:
+            self.stats_prefetcher = StatsPrefetcher(self, deadline=self.stats_deadline, endpoints=stats_endpoints)
+            self.stats_prefetcher.start(to_collect)
+        
+        # Batch scalar metrics through GraphQL; REST covers everything else
+        if self.backend == 'graphql' and set(self.GRAPHQL_SECTIONS) & set(self.collector_names):
+            self._prefetched = self.collect_graphql_batch([name for name in to_collect if name not in unchanged])
+        for repo_name, record in unchanged.items():
+            self._prefetched[repo_name] = self._carried_sections(record)
+        
+        # Collect metrics for each repository. Records whose statistics are still
+        # being computed are held, in order, while the collection goes on; the
+        # statistics deadline only starts once every repository is collected.
+        collected = self._iter_collected(to_collect)
+        held = deque()  # (record, restored from the checkpoint, waits for statistics)
+        finished = False
+        try:
+            for repo_name in repo_names + [None]:
+                if repo_name is None:
+                    # Collection is done: give pending statistics the deadline, then release the rest
+                    if self.stats_prefetcher:
+                        self.stats_prefetcher.finish()
+                elif repo_name in completed:
+                    held.append((completed.pop(repo_name), True, False))
+                else:
+                    repo_metrics = next(collected)
+                    if repo_metrics is not None:
+                        held.append((repo_metrics, False, self.stats_prefetcher is not None))
+                
+                while held:
+                    repo_metrics, restored, needs_stats = held[0]
+                    if needs_stats:
+                        if repo_name is not None and not self.stats_prefetcher.ready(repo_metrics['repository']):
+                            break
+                        self._apply_prefetched_stats(repo_metrics)
+                    held.popleft()
+                    if self.checkpoint and not restored:
+                        self.checkpoint.add(repo_metrics)
+                    self._update_running_summary(repo_metrics)
+                    yield repo_metrics
+            finished = True
+        finally:
+            collected.close()
+            if self.checkpoint:
+                self.checkpoint.close()
+            if self.partial_summary_path:
+                self.write_partial_summary(complete=finished)
+            if self.stats_prefetcher:
+                self.stats_prefetcher.close()
+                pending = self.stats_prefetcher.pending_fraction()
+                print(f"Repository statistics still pending at deadline: {pending:.1%}")
+                self.stats_prefetcher = None
+            if self.counter_store:
+                self.counter_store.save()
+    
+    def _start_running_summary(self, total: int):
+        """Reset the running summary at the start of a run of total repositories."""
+        with self._running_summary_lock:
+            self.running_summary = SummaryAggregator(aggregates=self.summary_aggregates)
+            self._repositories_total = total
+    
+    def _update_running_summary(self, repo_metrics: Dict[str, Any]):
+        """Fold a collected record into the running summary, writing the partial summary when due."""
+        with self._running_summary_lock:
+            self.running_summary.add(repo_metrics)
+            due = self.running_summary.count % self.partial_summary_every == 0
+        if due and self.partial_summary_path:
+            self.write_partial_summary()
+    
+    def partial_summary(self) -> Dict[str, Any]:
+        """
+        Return the summary of the repositories collected so far.
+        
+        Safe to call from any thread while a run is in progress; after a run it
+        is the summary of every repository the run collected.
+        """
+        with self._running_summary_lock:
+            return self.running_summary.summary()
+    
+    def write_partial_summary(self, complete: bool = False):
+        """
+        Write the running summary to partial_summary_path.
+        
+        The file is replaced atomically, so readers never see a half-written
+        document.
+        
+        Args:
+            complete: Whether the run has collected every repository
+        """
+        with self._running_summary_lock:
+            document = {
+                'summary': self.running_summary.summary(),
+                'repositories_collected': self.running_summary.count,
+                'repositories_total': self._repositories_total,
+                'complete': complete,
+                'run_timestamp': self.metrics['timestamp'],
+                'timestamp': datetime.now(timezone.utc).isoformat()
+            }
+        temporary = f'{self.partial_summary_path}.tmp'
+        try:
+            with open(temporary, 'w') as f:
+                json.dump(document, f, indent=2)
+            os.replace(temporary, self.partial_summary_path)
+        except OSError as e:
+            print(f"Warning: could not write partial summary to {self.partial_summary_path} ({e})")
+    
+    def track_all_repositories(self) -> Dict[str, Any]:
+        """Track metrics for all repositories."""
+        print("Starting comprehensive GitHub metrics tracking...")
         
-        # Collect metrics for each repository
-        for repo_name in repo_names:
-            try:
-                repo_metrics = self.collect_all_metrics_for_repo(repo_name)
-                self.metrics['repositories'].append(repo_metrics)
-            except Exception as e:
-                print(f"Error collecting metrics for {repo_name}: {e}")
+        for repo_metrics in self.iter_repository_metrics():
+            self.metrics['repositories'].append(repo_metrics)
         
         # Calculate summary statistics
         self.calculate_summary()
         
         return self.metrics
     
-    def calculate_summary(self):
-        """Calculate summary statistics across all repositories."""
-        repos = self.metrics['repositories']
-        
-        if not repos:
-            self.metrics['summary'] = {}
-            return
-        
-        summary = {
-            'total_repositories': len(repos),
-            'total_stars': sum(r['basic'].get('stargazers_count', 0) for r in repos),
-            'total_forks': sum(r['basic'].get('forks_count', 0) for r in repos),
-            'total_watchers': sum(r['basic'].get('watchers_count', 0) for r in repos),
-            'total_open_issues': sum(r['issues'].get('open_count', 0) for r in repos),
-            'total_contributors': sum(r.get('contributor_count', 0) for r in repos),
-            'total_releases': sum(r['releases'].get('total_releases', 0) for r in repos),
-            'total_commits': sum(r['commit_activity'].get('total_commits_last_year', 0) for r in repos),
-            'total_code_additions': sum(r['code_frequency'].get('total_additions', 0) for r in repos),
-            'total_code_deletions': sum(r['code_frequency'].get('total_deletions', 0) for r in repos),
-            'active_repositories': sum(1 for r in repos if r['custom'].get('is_active', False)),
-            'archived_repositories': sum(1 for r in repos if r['basic'].get('archived', False)),
-            'private_repositories': sum(1 for r in repos if r['basic'].get('private', False)),
-            'public_repositories': sum(1 for r in repos if not r['basic'].get('private', False)),
-            'forked_repositories': sum(1 for r in repos if r['basic'].get('fork', False)),
-            'total_open_prs': sum(r['pull_requests'].get('open_count', 0) for r in repos),
-            'total_merged_prs': sum(r['pull_requests'].get('merged_count', 0) for r in repos),
-        }
-        
-        # Language distribution
-        language_stats = defaultdict(int)
-        for repo in repos:
-            for lang, bytes_count in repo.get('languages', {}).items():
-                language_stats[lang] += bytes_count
+    def track_streaming(self, writers: List[Any]) -> Dict[str, Any]:
+        """
+        Track metrics for all repositories, writing each record out as soon as it is collected.
         
-        total_bytes = sum(language_stats.values())
-        summary['languages'] = {
-            lang: {
-                'bytes': bytes_count,
-                'percentage': round((bytes_count / total_bytes * 100), 2) if total_bytes > 0 else 0
-            }
-            for lang, bytes_count in sorted(language_stats.items(), key=lambda x: x[1], reverse=True)
-        }
+        Records are passed to every writer (JSONRecordWriter, NDJSONRecordWriter,
+        CSVRecordWriter) and released; the summary is the running summary.
+        self.metrics['repositories'] stays empty.
         
-        # Most popular repositories
-        summary['most_starred'] = sorted(
-            [{'name': r['basic']['full_name'], 'stars': r['basic'].get('stargazers_count', 0)} 
-             for r in repos],
-            key=lambda x: x['stars'],
-            reverse=True
-        )[:10]
+        Args:
+            writers: Open record writers; they are closed with the final metrics
+        """
+        print("Starting comprehensive GitHub metrics tracking (streaming)...")
         
-        summary['most_forked'] = sorted(
-            [{'name': r['basic']['full_name'], 'forks': r['basic'].get('forks_count', 0)} 
-             for r in repos],
-            key=lambda x: x['forks'],
-            reverse=True
-        )[:10]
+        completed = False
+        try:
+            for repo_metrics in self.iter_repository_metrics():
+                for writer in writers:
+                    writer.write(repo_metrics)
+            self.metrics['summary'] = self.partial_summary()
+            completed = True
+        finally:
+            close_record_writers(writers, self.metrics, completed)
         
-        self.metrics['summary'] = summary
+        return self.metrics
+    
+    def calculate_summary(self):
+        """Calculate summary statistics across all repositories."""
+        columns = ColumnarSummary(self.metrics['repositories'], self.summary_aggregates)
+        self.metrics['summary'] = columns.summary()
     
     def export_to_json(self, filename: str = 'github_metrics.json'):
         """Export metrics to JSON file."""
@@ -705,357 +4519,805 @@ class GitHubMetricsTracker:
             print("No repository data to export")
             return
         
-        with open(filename, 'w', newline='') as f:
-            # Define CSV headers
-            headers = [
-                'repository', 'stars', 'forks', 'watchers', 'open_issues',
-                'language', 'size_kb', 'contributors', 'commits_last_year',
-                'open_prs', 'merged_prs', 'releases', 'age_days', 'is_active',
-                'has_wiki', 'has_pages', 'archived', 'private'
-            ]
-            
-            writer = csv.DictWriter(f, fieldnames=headers)
-            writer.writeheader()
-            
-            for repo in self.metrics['repositories']:
-                writer.writerow({
-                    'repository': repo['basic']['full_name'],
-                    'stars': repo['basic'].get('stargazers_count', 0),
-                    'forks': repo['basic'].get('forks_count', 0),
-                    'watchers': repo['basic'].get('watchers_count', 0),
-                    'open_issues': repo['issues'].get('open_count', 0),
-                    'language': repo['basic'].get('language', 'N/A'),
-                    'size_kb': repo['basic'].get('size', 0),
-                    'contributors': repo.get('contributor_count', 0),
-                    'commits_last_year': repo['commit_activity'].get('total_commits_last_year', 0),
-                    'open_prs': repo['pull_requests'].get('open_count', 0),
-                    'merged_prs': repo['pull_requests'].get('merged_count', 0),
-                    'releases': repo['releases'].get('total_releases', 0),
-                    'age_days': repo['custom'].get('age_days', 0),
-                    'is_active': repo['custom'].get('is_active', False),
-                    'has_wiki': repo['basic'].get('has_wiki', False),
-                    'has_pages': repo['basic'].get('has_pages', False),
-                    'archived': repo['basic'].get('archived', False),
-                    'private': repo['basic'].get('private', False),
-                })
+        writer = CSVRecordWriter(filename)
+        for repo in self.metrics['repositories']:
+            writer.write(repo)
+        writer.close()
         
         print(f"Metrics exported to {filename}")
     
-    def generate_html_report(self, filename: str = 'github_metrics_report.html'):
-        """Generate an HTML report with all metrics."""
-        summary = self.metrics.get('summary', {})
-        user_info = self.metrics.get('user_info', {})
+    def export_shards(self, directory: str = 'github_metrics_data'):
+        """Export the summary, repository index and per-repository shards for the live dashboard."""
+        writer = ShardedJSONWriter(directory)
+        for repo in self.metrics['repositories']:
+            writer.write(repo)
+        writer.close(self.metrics)
+        print(f"Dashboard data exported to {directory}/")
+    
+    def export_columnar(self, directory: str = 'github_metrics_columnar'):
+        """Export the repository records as flattened columnar tables (Parquet when pyarrow is installed)."""
+        writer = ColumnarWriter(directory)
+        for repo in self.metrics['repositories']:
+            writer.write(repo)
+        writer.close(self.metrics)
+        print(f"Columnar tables exported to {directory}/ ({'Parquet' if writer.parquet else 'binary columns'})")
+    
+    def generate_html_report(self, filename: str = 'github_metrics_report.html',
+                             page_size: int = 0, detail_pages: bool = False):
+        """
+        Generate an HTML report with all metrics.
         
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>GitHub Metrics Report</title>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-            background: #0d1117;
-            color: #c9d1d9;
-            padding: 20px;
-            line-height: 1.6;
-        }}
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-        }}
-        h1, h2, h3 {{
-            color: #58a6ff;
-            margin: 20px 0 10px;
-        }}
-        h1 {{
-            font-size: 2.5em;
-            border-bottom: 2px solid #21262d;
-            padding-bottom: 10px;
-        }}
-        .metric-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 20px;
-            margin: 20px 0;
-        }}
-        .metric-card {{
-            background: #161b22;
-            border: 1px solid #30363d;
-            border-radius: 6px;
-            padding: 20px;
-            transition: transform 0.2s;
-        }}
-        .metric-card:hover {{
-            transform: translateY(-2px);
-            border-color: #58a6ff;
-        }}
-        .metric-value {{
-            font-size: 2em;
-            font-weight: bold;
-            color: #58a6ff;
-        }}
-        .metric-label {{
-            color: #8b949e;
-            font-size: 0.9em;
-            margin-top: 5px;
-        }}
-        .repo-list {{
-            list-style: none;
-        }}
-        .repo-item {{
-            background: #161b22;
-            border: 1px solid #30363d;
-            border-radius: 6px;
-            padding: 15px;
-            margin: 10px 0;
-        }}
-        .repo-name {{
-            color: #58a6ff;
-            font-weight: bold;
-            font-size: 1.1em;
-        }}
-        .repo-stats {{
-            display: flex;
-            gap: 20px;
-            margin-top: 10px;
-            color: #8b949e;
-        }}
-        .language-bar {{
-            background: #161b22;
-            border: 1px solid #30363d;
-            border-radius: 6px;
-            padding: 15px;
-            margin: 10px 0;
-        }}
-        .language-item {{
-            display: flex;
-            justify-content: space-between;
-            margin: 8px 0;
-        }}
-        .timestamp {{
-            color: #8b949e;
-            font-size: 0.9em;
-            margin: 20px 0;
-        }}
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin: 20px 0;
-        }}
-        th, td {{
-            padding: 12px;
-            text-align: left;
-            border-bottom: 1px solid #30363d;
-        }}
-        th {{
-            background: #161b22;
-            color: #58a6ff;
-            font-weight: bold;
-        }}
-        tr:hover {{
-            background: #161b22;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>📊 GitHub Metrics Report</h1>
-        <p class="timestamp">Generated: {self.metrics.get('timestamp', 'N/A')}</p>
+        Args:
+            filename: Report file
+            page_size: Repositories per list page file; 0 lists every repository in the report
+            detail_pages: Also write one page per repository
+        """
+        writer = HTMLReportWriter(filename, page_size=page_size, detail_pages=detail_pages)
+        try:
+            for repo in self.metrics.get('repositories', []):
+                writer.write(repo)
+        finally:
+            writer.close(self.metrics)
         
-        <h2>👤 User Information</h2>
-        <div class="metric-grid">
-            <div class="metric-card">
-                <div class="metric-value">{user_info.get('basic_info', {}).get('login', 'N/A')}</div>
-                <div class="metric-label">Username</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value">{user_info.get('account_metrics', {}).get('followers', 0)}</div>
-                <div class="metric-label">Followers</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value">{user_info.get('account_metrics', {}).get('following', 0)}</div>
-                <div class="metric-label">Following</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value">{user_info.get('account_metrics', {}).get('public_repos', 0)}</div>
-                <div class="metric-label">Public Repos</div>
-            </div>
-        </div>
+        print(f"HTML report generated: {filename}")
+
+
+class AsyncGitHubMetricsTracker(GitHubMetricsTracker):
+    """
+    Asyncio counterpart of GitHubMetricsTracker.
+    
+    Requests are awaited instead of blocking the event loop, and the independent
+    sub-collectors of a repository are issued concurrently. Collected data has
+    exactly the same shape as the synchronous tracker. Every method that talks
+    to the API is a coroutine here (get_user_info, get_all_repositories,
+    get_search_totals, collect_graphql_batch, the collectors,
+    collect_all_metrics_for_repo, track_all_repositories, track_summary_only
+    and track_streaming), and iter_repository_metrics is an async generator;
+    the summary and export methods are shared with the synchronous tracker.
+    """
+    
+    def __init__(self, token: Optional[str] = None, username: Optional[str] = None, concurrency: int = 10,
+                 transport: Optional[HTTPTransport] = None, cache: Optional[ConditionalRequestCache] = None,
+                 tokens: Optional[List[str]] = None, metrics: Optional[List[str]] = None,
+                 skip_metrics: Optional[List[str]] = None, aggregates: Optional[List[str]] = None,
+                 partial_summary_path: Optional[str] = None, partial_summary_every: int = 10,
+                 org: Optional[str] = None, shard: Optional[str] = None, workflow_run_window: int = 30):
+        """
+        Initialize the async GitHub Metrics Tracker.
         
-        <h2>📈 Repository Overview</h2>
-        <div class="metric-grid">
-            <div class="metric-card">
-                <div class="metric-value">{summary.get('total_repositories', 0)}</div>
-                <div class="metric-label">Total Repositories</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value">{summary.get('total_stars', 0)}</div>
-                <div class="metric-label">Total Stars</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value">{summary.get('total_forks', 0)}</div>
-                <div class="metric-label">Total Forks</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value">{summary.get('total_watchers', 0)}</div>
-                <div class="metric-label">Total Watchers</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value">{summary.get('total_contributors', 0)}</div>
-                <div class="metric-label">Total Contributors</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value">{summary.get('total_commits', 0)}</div>
-                <div class="metric-label">Commits (Last Year)</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value">{summary.get('total_releases', 0)}</div>
-                <div class="metric-label">Total Releases</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value">{summary.get('active_repositories', 0)}</div>
-                <div class="metric-label">Active Repositories</div>
-            </div>
-        </div>
+        Args:
+            token: GitHub personal access token (optional, but required for private repos and higher rate limits)
+            username: GitHub username to track (if not provided, will track authenticated user)
+            concurrency: Maximum number of requests in flight at once (default: 10)
+            transport: HTTP transport to send requests through (default: pooled keep-alive session)
+            cache: Conditional request cache for ETag/Last-Modified revalidation (default: no caching)
+            tokens: Additional tokens to spread repository requests over
+            metrics: Collectors to run (default: all); their dependencies are added automatically
+            skip_metrics: Collectors not to run, along with the collectors that depend on them
+            aggregates: Extra summary aggregates as FIELD:STAT, e.g. 'stars:median' or 'open_issues:p95'
+            partial_summary_path: JSON file the running summary is written to during the run
+            partial_summary_every: Repositories collected between two writes of partial_summary_path
+            org: Organization to track instead of a user
+            shard: Slice of the repositories to collect as INDEX/COUNT, e.g. '2/4'
+            workflow_run_window: Days of workflow runs the run statistics cover (default: 30)
+        """
+        concurrency = max(1, concurrency)
+        super().__init__(token=token, username=username,
+                         transport=transport or create_transport(pool_size=max(10, concurrency)),
+                         cache=cache, tokens=tokens, metrics=metrics, skip_metrics=skip_metrics,
+                         aggregates=aggregates, partial_summary_path=partial_summary_path,
+                         partial_summary_every=partial_summary_every, org=org, shard=shard,
+                         workflow_run_window=workflow_run_window)
+        self.concurrency = concurrency
+        # Requests run on a bounded pool so the event loop never blocks on I/O
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency)
+    
+    def close(self):
+        """Release the request worker threads and close the HTTP transport."""
+        self._executor.shutdown(wait=False)
+        super().close()
+    
+    async def _make_request(self, url: str, params: Optional[Dict] = None, extra_headers: Optional[Dict] = None) -> Optional[Any]:
+        """Make a request to the GitHub API without blocking the event loop."""
+        return (await self._request(url, params, extra_headers))[0]
+    
+    async def _request(self, url: str, params: Optional[Dict] = None,
+                       extra_headers: Optional[Dict] = None) -> Tuple[Optional[Any], CaseInsensitiveDict, Optional[int]]:
+        """Make a request to the GitHub API, returning the parsed body, response headers and status code."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            functools.partial(GitHubMetricsTracker._request, self, url, params, extra_headers)
+        )
+    
+    async def _get_all_pages(self, url: str, params: Optional[Dict] = None,
+                             items_key: Optional[str] = None) -> List[Any]:
+        """
+        Fetch all pages of paginated results.
+        
+        When the first response carries a Link header with rel="last", the
+        remaining pages are fetched concurrently and reassembled in page order.
+        Otherwise pages are fetched one after another until a short page.
+        Listings that wrap their items in an object (e.g. workflow_runs) name
+        the key in items_key.
+        """
+        per_page = 100
+        first_params = {'page': 1, 'per_page': per_page}
+        if params:
+            first_params.update(params)
+        per_page = first_params['per_page']
+        
+        results, headers, _ = await self._request(url, first_params)
+        results = self._page_items(results, items_key)
+        if not results or len(results) == 0:
+            return []
+        
+        all_results = list(results)
+        last_page = self._parse_last_page(headers.get('Link'))
+        
+        if last_page is not None:
+            pages = await asyncio.gather(*(
+                self._make_request(url, dict(first_params, page=page))
+                for page in range(2, last_page + 1)
+            ))
+            for results in pages:
+                results = self._page_items(results, items_key)
+                # Stop at the first failed or empty page, as sequential paging would
+                if not results:
+                    break
+                all_results.extend(results)
+            return all_results
+        
+        page = 1
+        while len(results) >= per_page:
+            page += 1
+            results = self._page_items(await self._make_request(url, dict(first_params, page=page)), items_key)
+            if not results or len(results) == 0:
+                break
+            all_results.extend(results)
+        
+        return all_results
+    
+    async def get_user_info(self) -> Dict[str, Any]:
+        """Fetch comprehensive user information."""
+        if not self.username:
+            user_data = await self._make_request(f'{self.base_url}/user')
+            if user_data:
+                self.username = user_data.get('login')
+        else:
+            user_data = await self._make_request(self._owner_url())
+        
+        return self._build_user_info(user_data)
+    
+    async def get_repository_basic_metrics(self, repo_full_name: str) -> Dict[str, Any]:
+        """Fetch basic repository metrics."""
+        return self._build_basic_metrics(await self._make_request(f'{self.base_url}/repos/{repo_full_name}'))
+    
+    async def get_languages(self, repo_full_name: str) -> Dict[str, int]:
+        """Fetch language statistics for a repository."""
+        languages = await self._make_request(f'{self.base_url}/repos/{repo_full_name}/languages')
+        return languages or {}
+    
+    async def get_contributors(self, repo_full_name: str) -> List[Dict[str, Any]]:
+        """Fetch contributor statistics."""
+        return self._build_contributors(
+            await self._get_all_pages(f'{self.base_url}/repos/{repo_full_name}/contributors')
+        )
+    
+    async def get_commit_activity(self, repo_full_name: str) -> Dict[str, Any]:
+        """Fetch commit activity statistics."""
+        return self._build_commit_activity(
+            await self._make_request(f'{self.base_url}/repos/{repo_full_name}/stats/commit_activity')
+        )
+    
+    async def get_code_frequency(self, repo_full_name: str) -> Dict[str, Any]:
+        """Fetch code frequency statistics (additions/deletions)."""
+        return self._build_code_frequency(
+            await self._make_request(f'{self.base_url}/repos/{repo_full_name}/stats/code_frequency')
+        )
+    
+    async def get_participation(self, repo_full_name: str) -> Dict[str, Any]:
+        """Fetch participation statistics."""
+        return self._build_participation(
+            await self._make_request(f'{self.base_url}/repos/{repo_full_name}/stats/participation')
+        )
+    
+    async def get_issues_metrics(self, repo_full_name: str) -> Dict[str, Any]:
+        """Fetch comprehensive issue metrics."""
+        url = f'{self.base_url}/repos/{repo_full_name}/issues'
+        open_issues, closed_issues = await asyncio.gather(
+            self._get_all_pages(url, {'state': 'open', 'per_page': 100}),
+            self._get_all_pages(url, {'state': 'closed', 'per_page': 100})
+        )
+        return self._build_issues_metrics(open_issues, closed_issues)
+    
+    async def get_pull_requests_metrics(self, repo_full_name: str) -> Dict[str, Any]:
+        """Fetch comprehensive pull request metrics."""
+        url = f'{self.base_url}/repos/{repo_full_name}/pulls'
+        open_prs, closed_prs = await asyncio.gather(
+            self._get_all_pages(url, {'state': 'open', 'per_page': 100}),
+            self._get_all_pages(url, {'state': 'closed', 'per_page': 100})
+        )
+        return self._build_pull_requests_metrics(open_prs, closed_prs)
+    
+    async def get_releases_metrics(self, repo_full_name: str) -> Dict[str, Any]:
+        """Fetch release metrics."""
+        return self._build_releases_metrics(
+            await self._get_all_pages(f'{self.base_url}/repos/{repo_full_name}/releases')
+        )
+    
+    async def get_branches_metrics(self, repo_full_name: str) -> Dict[str, Any]:
+        """Fetch branch metrics."""
+        return self._build_branches_metrics(
+            await self._get_all_pages(f'{self.base_url}/repos/{repo_full_name}/branches')
+        )
+    
+    async def get_tags_metrics(self, repo_full_name: str) -> Dict[str, Any]:
+        """Fetch tag metrics."""
+        return self._build_tags_metrics(
+            await self._get_all_pages(f'{self.base_url}/repos/{repo_full_name}/tags')
+        )
+    
+    async def get_traffic_metrics(self, repo_full_name: str) -> Dict[str, Any]:
+        """Fetch traffic metrics (requires push access to the repository)."""
+        traffic_url = f'{self.base_url}/repos/{repo_full_name}/traffic'
+        views, clones, referrers, paths = await asyncio.gather(
+            self._make_request(f'{traffic_url}/views'),
+            self._make_request(f'{traffic_url}/clones'),
+            self._make_request(f'{traffic_url}/popular/referrers'),
+            self._make_request(f'{traffic_url}/popular/paths')
+        )
+        return self._build_traffic_metrics(views, clones, referrers, paths)
+    
+    async def get_community_metrics(self, repo_full_name: str) -> Dict[str, Any]:
+        """Fetch community profile metrics."""
+        return self._build_community_metrics(
+            await self._make_request(f'{self.base_url}/repos/{repo_full_name}/community/profile')
+        )
+    
+    async def get_vulnerability_alerts(self, repo_full_name: str) -> Dict[str, Any]:
+        """Fetch vulnerability alerts (requires appropriate permissions)."""
+        alerts = await self._make_request(
+            f'{self.base_url}/repos/{repo_full_name}/vulnerability-alerts',
+            extra_headers={'Accept': 'application/vnd.github.dorian-preview+json'}
+        )
+        
+        return {
+            'has_vulnerability_alerts_enabled': alerts is not None
+        }
+    
+    async def get_dependabot_alerts(self, repo_full_name: str) -> Dict[str, Any]:
+        """Fetch Dependabot alerts."""
+        return self._build_dependabot_alerts(
+            await self._get_all_pages(f'{self.base_url}/repos/{repo_full_name}/dependabot/alerts')
+        )
+    
+    async def get_code_scanning_alerts(self, repo_full_name: str) -> Dict[str, Any]:
+        """Fetch code scanning alerts."""
+        return self._build_code_scanning_alerts(
+            await self._get_all_pages(f'{self.base_url}/repos/{repo_full_name}/code-scanning/alerts')
+        )
+    
+    async def get_workflows_metrics(self, repo_full_name: str) -> Dict[str, Any]:
+        """Fetch GitHub Actions workflows and their run statistics over the run window."""
+        workflows = await self._make_request(f'{self.base_url}/repos/{repo_full_name}/actions/workflows',
+                                             {'per_page': 100})
         
-        <h2>💻 Code Statistics</h2>
-        <div class="metric-grid">
-            <div class="metric-card">
-                <div class="metric-value">{summary.get('total_code_additions', 0):,}</div>
-                <div class="metric-label">Total Lines Added</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value">{summary.get('total_code_deletions', 0):,}</div>
-                <div class="metric-label">Total Lines Deleted</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value">{summary.get('total_open_issues', 0)}</div>
-                <div class="metric-label">Open Issues</div>
-            </div>
-            <div class="metric-card">
-                <div class="metric-value">{summary.get('total_open_prs', 0)}</div>
-                <div class="metric-label">Open Pull Requests</div>
-            </div>
-        </div>
+        if not workflows or 'workflows' not in workflows:
+            return {'total_workflows': 0, 'workflows': []}
         
-        <h2>🌐 Language Distribution</h2>
-        <div class="language-bar">
-"""
+        runs, truncated = [], False
+        if workflows['workflows']:
+            runs, truncated = await self._get_workflow_runs(repo_full_name)
         
-        # Add language statistics
-        languages = summary.get('languages', {})
-        for lang, stats in list(languages.items())[:10]:
-            html += f"""
-            <div class="language-item">
-                <span>{lang}</span>
-                <span>{stats.get('percentage', 0)}%</span>
-            </div>
-"""
+        return self._build_workflows_metrics(workflows, runs, truncated)
+    
+    async def _get_workflow_runs(self, repo_full_name: str) -> Tuple[Optional[List[Dict[str, Any]]], bool]:
+        """Fetch the workflow runs created within the run window, as the sync tracker does."""
+        url = f'{self.base_url}/repos/{repo_full_name}/actions/runs'
+        runs = {}
+        truncated = False
+        ranges = [self._workflow_run_range()]
+        while ranges:
+            start, end = ranges.pop()
+            params = self._workflow_runs_params(start, end)
+            first, _, status = await self._request(url, dict(params, page=1))
+            if status is None or not isinstance(first, dict):
+                return None, truncated
+            total = first.get('total_count', 0)
+            if total > self.WORKFLOW_RUNS_LIMIT and start < end:
+                ranges.extend(self._split_run_range(start, end))
+                continue
+            pages = [first] + list(await asyncio.gather(*(
+                self._make_request(url, dict(params, page=page)) for page in self._run_pages(total, params))))
+            if any(not isinstance(page, dict) for page in pages):
+                return None, truncated
+            received = [run for page in pages for run in page.get('workflow_runs') or []]
+            truncated = truncated or len(received) < total
+            runs.update((run.get('id'), run) for run in received)
+        return list(runs.values()), truncated
+    
+    async def _run_collector_async(self, collector: Collector, repo_full_name: str,
+                                   sections: Dict[str, Any]) -> Any:
+        """Run one collector, awaiting it if it is a coroutine."""
+        result = GitHubMetricsTracker._run_collector(self, collector, repo_full_name, sections)
+        if asyncio.iscoroutine(result):
+            result = await result
+        return result
+    
+    async def collect_all_metrics_for_repo(self, repo_full_name: str) -> Dict[str, Any]:
+        """Collect the selected metrics for a single repository, running independent collectors concurrently."""
+        print(f"Collecting metrics for {repo_full_name}...")
         
-        html += """
-        </div>
+        repo_metrics = {
+            'repository': repo_full_name,
+            'collected_at': datetime.now(timezone.utc).isoformat()
+        }
         
-        <h2>⭐ Most Starred Repositories</h2>
-        <table>
-            <thead>
-                <tr>
-                    <th>Repository</th>
-                    <th>Stars</th>
-                </tr>
-            </thead>
-            <tbody>
-"""
+        sections = {}
+        pending = list(self.collectors)
+        running = {}
+        while pending or running:
+            for collector in list(pending):
+                if all(d in sections for d in collector.depends):
+                    pending.remove(collector)
+                    task = asyncio.ensure_future(self._run_collector_async(collector, repo_full_name, sections))
+                    running[task] = collector.name
+            
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                sections[running.pop(task)] = task.result()
         
-        for repo in summary.get('most_starred', [])[:10]:
-            html += f"""
-                <tr>
-                    <td>{repo['name']}</td>
-                    <td>{repo['stars']}</td>
-                </tr>
-"""
+        # Assemble in the same key order as the synchronous tracker
+        for name in self.collector_names:
+            repo_metrics[name] = sections[name]
         
-        html += """
-            </tbody>
-        </table>
+        return repo_metrics
+    
+    async def _list_repositories(self) -> List[Dict[str, Any]]:
+        """List the user's or organization's repositories as returned by the API, restricted to the shard."""
+        if not self.username:
+            await self.get_user_info()
         
-        <h2>🔱 Most Forked Repositories</h2>
-        <table>
-            <thead>
-                <tr>
-                    <th>Repository</th>
-                    <th>Forks</th>
-                </tr>
-            </thead>
-            <tbody>
-"""
+        repos = self._select_shard(await self._get_all_pages(f'{self._owner_url()}/repos', {'per_page': 100}))
+        await asyncio.get_running_loop().run_in_executor(
+            self._executor, GitHubMetricsTracker._discover_token_visibility, self, repos
+        )
+        return repos
+    
+    async def get_all_repositories(self) -> List[str]:
+        """Get all repositories for the user."""
+        return [repo['full_name'] for repo in await self._list_repositories()]
+    
+    async def get_search_totals(self) -> Dict[str, int]:
+        """Fetch user-wide issue and pull request totals from the Search API, issuing the searches concurrently."""
+        if not self.username:
+            await self.get_user_info()
         
-        for repo in summary.get('most_forked', [])[:10]:
-            html += f"""
-                <tr>
-                    <td>{repo['name']}</td>
-                    <td>{repo['forks']}</td>
-                </tr>
-"""
+        queries = self._search_queries()
+        results = await asyncio.gather(*(
+            self._make_request(f'{self.base_url}/search/issues', {'q': query, 'per_page': 1})
+            for query in queries.values()
+        ))
+        totals = {}
+        for (key, query), result in zip(queries.items(), results):
+            self._add_search_total(totals, key, query, result)
+        return totals
+    
+    async def track_summary_only(self) -> Dict[str, Any]:
+        """Compute summary statistics from the repository listing and the Search API only."""
+        print("Starting summary-only GitHub metrics tracking...")
         
-        html += """
-            </tbody>
-        </table>
+        await self.get_user_info()
+        print(f"Tracking repositories for {'organization' if self.org else 'user'}: {self.username}")
         
-        <h2>📦 All Repositories</h2>
-        <ul class="repo-list">
-"""
+        basics = [self._build_basic_metrics(repo) for repo in await self._list_repositories()]
+        print(f"Found {len(basics)} repositories")
         
-        for repo in self.metrics.get('repositories', []):
-            basic = repo.get('basic', {})
-            html += f"""
-            <li class="repo-item">
-                <div class="repo-name">{basic.get('full_name', 'N/A')}</div>
-                <div>{basic.get('description', 'No description')}</div>
-                <div class="repo-stats">
-                    <span>⭐ {basic.get('stargazers_count', 0)}</span>
-                    <span>🔱 {basic.get('forks_count', 0)}</span>
-                    <span>👁️ {basic.get('watchers_count', 0)}</span>
-                    <span>📝 {repo.get('issues', {}).get('open_count', 0)} issues</span>
-                    <span>💻 {basic.get('language', 'N/A')}</span>
-                </div>
-            </li>
-"""
+        # Search totals cover the whole account and cannot be split by shard
+        search_totals = await self.get_search_totals() if basics and not self.shard else {}
+        self.metrics['summary'] = self._listing_summary(basics, search_totals)
+        return self.metrics
+    
+    async def collect_graphql_batch(self, repo_names: List[str]) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Fetch per-repository scalar metrics for many repositories with aliased GraphQL queries."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, GitHubMetricsTracker.collect_graphql_batch, self, repo_names
+        )
+    
+    async def _collect_repository_safely(self, repo_name: str) -> Optional[Dict[str, Any]]:
+        """Collect metrics for one repository, isolating any failure to that repository."""
+        try:
+            return await self.collect_all_metrics_for_repo(repo_name)
+        except Exception as e:
+            print(f"Error collecting metrics for {repo_name}: {e}")
+            return None
+    
+    async def iter_repository_metrics(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield the metrics record of every repository, in listing order, as they complete.
         
-        html += """
-        </ul>
-    </div>
-</body>
-</html>
-"""
+        At most twice `concurrency` repositories are in flight or waiting to be
+        consumed, so a consumer that writes records out as they arrive keeps
+        memory flat. Records are not retained by the tracker; each is folded into
+        self.running_summary before it is yielded.
+        """
+        await self.get_user_info()
+        print(f"Tracking repositories for {'organization' if self.org else 'user'}: {self.username}")
         
-        with open(filename, 'w') as f:
-            f.write(html)
+        repo_names = await self.get_all_repositories()
+        print(f"Found {len(repo_names)} repositories")
+        self._start_running_summary(len(repo_names))
         
-        print(f"HTML report generated: {filename}")
+        names = iter(repo_names)
+        window = deque(asyncio.ensure_future(self._collect_repository_safely(name))
+                       for name in itertools.islice(names, self.concurrency * 2))
+        finished = False
+        try:
+            while window:
+                repo_metrics = await window.popleft()
+                for name in itertools.islice(names, 1):
+                    window.append(asyncio.ensure_future(self._collect_repository_safely(name)))
+                if repo_metrics is not None:
+                    self._update_running_summary(repo_metrics)
+                    yield repo_metrics
+            finished = True
+        finally:
+            for task in window:
+                task.cancel()
+            if self.partial_summary_path:
+                self.write_partial_summary(complete=finished)
+    
+    async def track_all_repositories(self) -> Dict[str, Any]:
+        """Track metrics for all repositories."""
+        print("Starting comprehensive GitHub metrics tracking...")
+        
+        async for repo_metrics in self.iter_repository_metrics():
+            self.metrics['repositories'].append(repo_metrics)
+        
+        self.calculate_summary()
+        
+        return self.metrics
+    
+    async def track_streaming(self, writers: List[Any]) -> Dict[str, Any]:
+        """
+        Track metrics for all repositories, writing each record out as soon as it is collected.
+        
+        See GitHubMetricsTracker.track_streaming; the writers are closed with the
+        final metrics, or aborted if the run fails.
+        """
+        print("Starting comprehensive GitHub metrics tracking (streaming)...")
+        
+        completed = False
+        try:
+            async for repo_metrics in self.iter_repository_metrics():
+                for writer in writers:
+                    writer.write(repo_metrics)
+            self.metrics['summary'] = self.partial_summary()
+            completed = True
+        finally:
+            close_record_writers(writers, self.metrics, completed)
+        
+        return self.metrics
+
+
+class _JSONStream:
+    """Incremental reader of JSON tokens and values from a text file, holding about one value at a time."""
+    
+    WHITESPACE = ' \t\r\n'
+    
+    def __init__(self, file, chunk_size: int = 1 << 20):
+        self._file = file
+        self._chunk_size = chunk_size
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+    
+    def _fill(self) -> bool:
+        """Read more of the file, dropping what was consumed; the read size doubles for long values."""
+        if self._eof:
+            return False
+        chunk = self._file.read(max(self._chunk_size, len(self._buffer) - self._pos))
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        self._eof = not chunk
+        return bool(chunk)
+    
+    def peek(self) -> str:
+        """Skip whitespace and return the next character without consuming it ('' at the end)."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in self.WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+    
+    def expect(self, characters: str) -> str:
+        """Consume the next character, which must be one of characters."""
+        character = self.peek()
+        if not character or character not in characters:
+            raise ValueError(f"expected one of {characters!r}, found {character or 'end of file'!r}")
+        self._pos += 1
+        return character
+    
+    def value(self) -> Any:
+        """Decode the next JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # A number ending at the buffer end may continue in the next chunk
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill()
+
+
+def iter_metrics_file(path: str) -> Iterator[Tuple[str, Any]]:
+    """
+    Read a metrics file one top-level entry at a time.
+    
+    Yields ('repositories', record) for each repository record and (key, value)
+    for the other top-level keys, in file order, so only one record is in
+    memory at a time. NDJSON files (.ndjson) hold records only.
+    
+    Raises:
+        ValueError: If the file is not a metrics document
+    """
+    with open(path) as f:
+        if path.endswith('.ndjson'):
+            for line in f:
+                if line.strip():
+                    yield 'repositories', json.loads(line)
+            return
+        
+        stream = _JSONStream(f)
+        stream.expect('{')
+        if stream.peek() == '}':
+            return
+        while True:
+            key = stream.value()
+            stream.expect(':')
+            if key == 'repositories' and stream.peek() == '[':
+                stream.expect('[')
+                if stream.peek() == ']':
+                    stream.expect(']')
+                else:
+                    while True:
+                        yield key, stream.value()
+                        if stream.expect(',]') == ']':
+                            break
+            else:
+                yield key, stream.value()
+            if stream.expect(',}') == '}':
+                return
+
+
+def merge_metrics(paths: List[str], writers: List[Any],
+                  aggregates: Optional[List[Tuple[str, str]]] = None) -> Dict[str, Any]:
+    """
+    Merge metrics files, writing the combined records through record writers.
+    
+    A repository found in several files is kept once, from the record with the
+    newest collected_at (the later file on ties). The files are streamed twice:
+    the first pass only notes where each repository's newest record is, the
+    second writes the kept records in file order and folds them into the
+    summary, so memory grows with the number of repositories, not records.
+    A record without a collected_at counts as the oldest. The merged document
+    takes the newest timestamp of the files (ignoring missing or null ones),
+    and their user info if they all track the same account.
+    
+    Args:
+        paths: Metrics files (JSON or NDJSON)
+        writers: Open record writers; they are closed with the merged metrics
+        aggregates: Extra summary aggregates, as returned by parse_aggregates
+    
+    Returns:
+        The merged metrics, with an empty 'repositories' list
+    """
+    newest = {}
+    records = 0
+    timestamp, user_info, logins = '', {}, set()
+    for file_index, path in enumerate(paths):
+        record_index = 0
+        for key, value in iter_metrics_file(path):
+            if key == 'repositories':
+                name = value.get('repository') or value.get('basic', {}).get('full_name')
+                collected_at = value.get('collected_at')
+                if not isinstance(collected_at, str):
+                    collected_at = ''
+                if name and (name not in newest or collected_at >= newest[name][0]):
+                    newest[name] = (collected_at, file_index, record_index)
+                record_index += 1
+            elif key == 'timestamp' and isinstance(value, str) and value > timestamp:
+                timestamp = value
+            elif key == 'user_info' and value:
+                logins.add(value.get('basic_info', {}).get('login'))
+                user_info = value
+        records += record_index
+    
+    kept = defaultdict(set)
+    for _, file_index, record_index in newest.values():
+        kept[file_index].add(record_index)
+    if len(logins) > 1:
+        print(f"Files track different accounts ({', '.join(sorted(map(str, logins)))}), user info left out")
+        user_info = {}
+    
+    metrics = {
+        'repositories': [],
+        'summary': {},
+        'timestamp': timestamp or datetime.now(timezone.utc).isoformat(),
+        'user_info': user_info,
+    }
+    summary = SummaryAggregator(aggregates=aggregates)
+    completed = False
+    try:
+        for file_index, path in enumerate(paths):
+            record_indexes = kept[file_index]
+            record_index = 0
+            for key, value in iter_metrics_file(path):
+                if key != 'repositories':
+                    continue
+                if record_index in record_indexes:
+                    summary.add(value)
+                    for writer in writers:
+                        writer.write(value)
+                record_index += 1
+        metrics['summary'] = summary.summary()
+        completed = True
+    finally:
+        close_record_writers(writers, metrics, completed)
+    
+    print(f"Merged {len(newest)} repositories from {len(paths)} files "
+          f"({records - len(newest)} duplicate or older records dropped)")
+    return metrics
+
+
+def create_record_writers(output: str, output_format: str, html_page_size: int = 0,
+                          html_detail_pages: bool = False) -> List[Any]:
+    """Open the record writers of an output format for the output prefix."""
+    writers = []
+    if output_format in ['json', 'all']:
+        writers.append(JSONRecordWriter(f'{output}.json'))
+    if output_format == 'ndjson':
+        writers.append(NDJSONRecordWriter(f'{output}.ndjson'))
+    if output_format in ['csv', 'all']:
+        writers.append(CSVRecordWriter(f'{output}.csv'))
+    if output_format in ['html', 'all']:
+        writers.append(HTMLReportWriter(f'{output}_report.html', page_size=html_page_size,
+                                        detail_pages=html_detail_pages))
+    if output_format in ['shards', 'all']:
+        writers.append(ShardedJSONWriter(f'{output}_data'))
+    if output_format == 'columnar':
+        writers.append(ColumnarWriter(f'{output}_columnar'))
+    return writers
+
+
+def close_record_writers(writers: List[Any], metrics: Dict[str, Any], completed: bool):
+    """
+    Close record writers at the end of a run.
+    
+    After a failed run, writers with an abort method (all of this module's)
+    are aborted, leaving the previous output in place; others are closed with
+    what was written.
+    """
+    for writer in writers:
+        if completed or not hasattr(writer, 'abort'):
+            writer.close(metrics)
+            print(f"Metrics exported to {writer.filename}")
+        else:
+            writer.abort()
+            print(f"Run did not complete, previous {writer.filename} left in place")
+
+
+def merge_main(argv: List[str]):
+    """Entry point of `merge`: combine metrics files into one set of outputs."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        prog='github_metrics_tracker.py merge',
+        description='Merge metrics files (e.g. from shards, partial runs or several accounts), '
+                    'keeping the newest record of each repository'
+    )
+    parser.add_argument(
+        'files',
+        nargs='+',
+        help='Metrics files to merge (JSON or NDJSON output)'
+    )
+    parser.add_argument(
+        '--output',
+        default='github_metrics_merged',
+        help='Output filename prefix (default: github_metrics_merged)'
+    )
+    parser.add_argument(
+        '--format',
+        choices=['json', 'ndjson', 'csv', 'html', 'shards', 'columnar', 'all'],
+        default='all',
+        help='Output format (default: all)'
+    )
+    parser.add_argument(
+        '--aggregates',
+        help='Comma-separated extra summary aggregates as FIELD:STAT (see the main command)'
+    )
+    parser.add_argument(
+        '--html-page-size',
+        type=int,
+        default=0,
+        help='Split the HTML repository list into page files of this many repositories (default: 0, one page)'
+    )
+    parser.add_argument(
+        '--html-detail-pages',
+        action='store_true',
+        help='Also write one HTML page per repository'
+    )
+    args = parser.parse_args(argv)
+    
+    try:
+        aggregates = parse_aggregates([name.strip() for name in (args.aggregates or '').split(',') if name.strip()])
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    outputs = {os.path.abspath(f'{args.output}.{extension}') for extension in ('json', 'ndjson', 'csv')}
+    for path in args.files:
+        if not os.path.isfile(path):
+            print(f"Error: {path} does not exist")
+            sys.exit(1)
+        if os.path.abspath(path) in outputs:
+            print(f"Error: {path} would be overwritten by the merged output; choose another --output")
+            sys.exit(1)
+    
+    writers = create_record_writers(args.output, args.format, args.html_page_size, args.html_detail_pages)
+    try:
+        metrics = merge_metrics(args.files, writers, aggregates)
+    except ValueError as e:
+        print(f"Error: could not read metrics ({e})")
+        sys.exit(1)
+    
+    print("\n✅ Merge complete!")
+    print(f"Total repositories: {metrics['summary'].get('total_repositories', 0)}")
+    print(f"Total stars: {metrics['summary'].get('total_stars', 0)}")
+    print(f"Total forks: {metrics['summary'].get('total_forks', 0)}")
 
 
 def main():
     """Main function to run the metrics tracker."""
     import argparse
     
+    if sys.argv[1:2] == ['merge']:
+        merge_main(sys.argv[2:])
+        return
+    
     parser = argparse.ArgumentParser(
         description='Comprehensive GitHub Metrics Tracker - Track all GitHub metrics exhaustively'
     )
     parser.add_argument(
         '--token',
-        help='GitHub personal access token (or set GITHUB_TOKEN env variable)'
+        action='append',
+        help='GitHub personal access token (or set GITHUB_TOKEN env variable); repeat to spread requests over several tokens'
+    )
+    parser.add_argument(
+        '--tokens-file',
+        help='File with one GitHub token per line, added to the token pool'
     )
     parser.add_argument(
         '--username',
         help='GitHub username to track (defaults to authenticated user)'
     )
+    parser.add_argument(
+        '--org',
+        help='GitHub organization to track instead of a user'
+    )
+    parser.add_argument(
+        '--shard',
+        metavar='INDEX/COUNT',
+        help='Collect only one of COUNT balanced slices of the repositories (e.g. 2/4), '
+             'for splitting a run across runners; outputs get a _shard_INDEXofCOUNT suffix'
+    )
     parser.add_argument(
         '--output',
         default='github_metrics',
@@ -1063,33 +5325,324 @@ def main():
     )
     parser.add_argument(
         '--format',
-        choices=['json', 'csv', 'html', 'all'],
+        choices=['json', 'ndjson', 'csv', 'html', 'shards', 'columnar', 'all'],
         default='all',
         help='Output format (default: all)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Number of repositories to collect concurrently (default: 1)'
+    )
+    parser.add_argument(
+        '--pool-size',
+        type=int,
+        help='Keep-alive connections held open to the API (default: max(10, workers))'
+    )
+    parser.add_argument(
+        '--http2',
+        action='store_true',
+        help='Multiplex requests over HTTP/2 (requires httpx[http2])'
+    )
+    parser.add_argument(
+        '--cache',
+        help='SQLite file for the conditional request (ETag) cache (default: disabled)'
+    )
+    parser.add_argument(
+        '--cache-size',
+        type=int,
+        default=100,
+        help='Maximum size of the request cache in MB (default: 100)'
+    )
+    parser.add_argument(
+        '--backend',
+        choices=['rest', 'graphql'],
+        default='rest',
+        help='Fetch per-repository scalar metrics via REST or batched GraphQL queries (default: rest)'
+    )
+    parser.add_argument(
+        '--graphql-batch-size',
+        type=int,
+        default=10,
+        help='Repositories per GraphQL query with --backend graphql (default: 10)'
+    )
+    parser.add_argument(
+        '--stats-deadline',
+        type=float,
+        default=120.0,
+        help='Seconds to keep re-polling /stats/* endpoints that answer 202 Accepted once every repository is '
+             'collected; 0 disables prefetching (default: 120)'
+    )
+    parser.add_argument(
+        '--incremental',
+        metavar='PREVIOUS_JSON',
+        help='Previous JSON output; repositories unchanged since then are carried over, '
+             'only their time-windowed sections are collected again'
+    )
+    parser.add_argument(
+        '--issue-counters',
+        metavar='STATE_JSON',
+        help='State file of per-repository issue/PR counters; later runs only fetch items updated since the last run'
+    )
+    parser.add_argument(
+        '--summary-only',
+        action='store_true',
+        help='Only compute summary totals from the repository listing and the Search API (seconds, not minutes)'
+    )
+    parser.add_argument(
+        '--page-concurrency',
+        type=int,
+        default=4,
+        help='Pages of a paginated listing fetched concurrently per API host (default: 4)'
+    )
+    parser.add_argument(
+        '--metrics',
+        help='Comma-separated metrics sections to collect (default: all; see --list-metrics)'
+    )
+    parser.add_argument(
+        '--skip-metrics',
+        help='Comma-separated metrics sections not to collect'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Write each repository to the outputs as soon as it is collected, '
+             'keeping memory flat on large accounts'
+    )
+    parser.add_argument(
+        '--html-page-size',
+        type=int,
+        default=0,
+        help='Split the HTML repository list into page files of this many repositories, '
+             'linked from the report (default: 0, one page)'
+    )
+    parser.add_argument(
+        '--html-detail-pages',
+        action='store_true',
+        help='Also write one HTML page per repository, with every collected section'
+    )
+    parser.add_argument(
+        '--workflow-window',
+        type=int,
+        default=30,
+        help='Days of GitHub Actions runs the workflow run statistics cover (default: 30)'
+    )
+    parser.add_argument(
+        '--collector-concurrency',
+        type=int,
+        default=4,
+        help='Independent metrics sections of one repository collected concurrently (default: 4)'
+    )
+    parser.add_argument(
+        '--list-metrics',
+        action='store_true',
+        help='List the available metrics sections with their cost and dependencies, then exit'
+    )
+    parser.add_argument(
+        '--aggregates',
+        help='Comma-separated extra summary aggregates as FIELD:STAT, where STAT is min, max, mean, '
+             'median or a percentile such as p90 (e.g. stars:median,open_issues:p95)'
+    )
+    parser.add_argument(
+        '--partial-summary',
+        metavar='FILE',
+        help='Write the summary of the repositories collected so far to FILE during the run '
+             '(e.g. summary.partial.json)'
+    )
+    parser.add_argument(
+        '--partial-summary-every',
+        type=int,
+        default=10,
+        help='Repositories collected between two writes of --partial-summary (default: 10)'
+    )
+    parser.add_argument(
+        '--checkpoint',
+        metavar='FILE',
+        help='Record completed repositories in FILE during the run so it can be resumed '
+             '(default with --resume: OUTPUT.checkpoint)'
+    )
+    parser.add_argument(
+        '--checkpoint-every',
+        type=int,
+        default=10,
+        help='Repositories recorded between two syncs of the checkpoint to disk (default: 10)'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continue the run recorded in the checkpoint, collecting only the repositories still pending'
+    )
+    parser.add_argument(
+        '--snapshot-db',
+        help='SQLite file that keeps the history of every run; this run is appended to it'
+    )
+    parser.add_argument(
+        '--query',
+        metavar='FIELD',
+        help='Print the history of FIELD from --snapshot-db and exit: a summary total (e.g. total_stars), '
+             'a repository field with --repo (e.g. stars), or a weekly series with --repo (commits, additions, deletions)'
+    )
+    parser.add_argument(
+        '--repo',
+        help='Repository full name for --query'
+    )
+    parser.add_argument(
+        '--since',
+        help='Earliest date or timestamp (ISO format, UTC unless it has an offset) returned by --query'
+    )
+    parser.add_argument(
+        '--until',
+        help='Latest date (including that whole day) or timestamp (ISO format) returned by --query'
+    )
     
     args = parser.parse_args()
     
+    if args.list_metrics:
+        for collector in GitHubMetricsTracker.COLLECTORS:
+            depends = f" (needs {', '.join(collector.depends)})" if collector.depends else ''
+            endpoints = ', '.join(collector.endpoints) or 'derived'
+            print(f"{collector.name:<22} cost {collector.cost}  {endpoints}{depends}")
+        return
+    
+    if args.org and args.username:
+        print("Error: --org and --username cannot be combined")
+        sys.exit(1)
+    
+    if args.query:
+        if not args.snapshot_db or not os.path.exists(args.snapshot_db):
+            print("Error: --query needs an existing --snapshot-db")
+            sys.exit(1)
+        store = SnapshotStore(args.snapshot_db)
+        try:
+            if args.query in SnapshotStore.WEEKLY_SERIES:
+                if not args.repo:
+                    raise ValueError(f"the weekly series {args.query!r} needs --repo")
+                rows = [(datetime.fromtimestamp(week, timezone.utc).date().isoformat(), value)
+                        for week, value in store.weekly_series(args.repo, args.query, args.since, args.until)]
+            elif args.repo:
+                rows = store.repository_series(args.repo, args.query, args.since, args.until)
+            else:
+                rows = store.total_series(args.query, args.since, args.until)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        finally:
+            store.close()
+        for when, value in rows:
+            print(f"{when}\t{value if value is not None else ''}")
+        return
+    
+    def split_names(value: Optional[str]) -> Optional[List[str]]:
+        return [name.strip() for name in value.split(',') if name.strip()] if value else None
+    
+    tokens = list(args.token or [])
+    if args.tokens_file:
+        try:
+            with open(args.tokens_file) as f:
+                tokens += [line.strip() for line in f if line.strip() and not line.startswith('#')]
+        except OSError as e:
+            print(f"Error: could not read tokens from {args.tokens_file} ({e})")
+            sys.exit(1)
+    
+    previous_metrics = None
+    if args.incremental:
+        try:
+            with open(args.incremental) as f:
+                previous_metrics = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: could not load previous metrics from {args.incremental} ({e}), collecting everything")
+    
     # Initialize tracker
-    tracker = GitHubMetricsTracker(token=args.token, username=args.username)
+    pool_size = args.pool_size or max(10, args.workers * args.collector_concurrency + args.page_concurrency)
+    transport = create_transport(pool_size=pool_size, http2=args.http2)
+    cache = ConditionalRequestCache(args.cache, max_bytes=args.cache_size * 1024 * 1024) if args.cache else None
+    if args.shard:
+        args.output = f"{args.output}_shard_{args.shard.replace('/', 'of')}"
+    checkpoint_path = args.checkpoint or (f'{args.output}.checkpoint' if args.resume else None)
+    checkpoint = RunCheckpoint(checkpoint_path, every=args.checkpoint_every) if checkpoint_path else None
+    try:
+        tracker = GitHubMetricsTracker(token=tokens[0] if tokens else None, tokens=tokens[1:],
+                                       username=args.username, workers=args.workers,
+                                       transport=transport, cache=cache, page_concurrency=args.page_concurrency,
+                                       backend=args.backend, graphql_batch_size=args.graphql_batch_size,
+                                       stats_deadline=args.stats_deadline, previous_metrics=previous_metrics,
+                                       counter_store=IssueCounterStore(args.issue_counters) if args.issue_counters else None,
+                                       metrics=split_names(args.metrics), skip_metrics=split_names(args.skip_metrics),
+                                       collector_concurrency=args.collector_concurrency,
+                                       aggregates=split_names(args.aggregates),
+                                       partial_summary_path=args.partial_summary,
+                                       partial_summary_every=args.partial_summary_every,
+                                       checkpoint=checkpoint, resume=args.resume,
+                                       org=args.org, shard=args.shard, workflow_run_window=args.workflow_window)
+    except ValueError as e:
+        print(f"Error: {e}")
+        transport.close()
+        if cache:
+            cache.close()
+        sys.exit(1)
     
     # Track all repositories
-    metrics = tracker.track_all_repositories()
+    if args.summary_only:
+        metrics = tracker.track_summary_only()
+    elif args.stream:
+        writers = create_record_writers(args.output, args.format, args.html_page_size, args.html_detail_pages)
+        snapshot_writer = None
+        if args.snapshot_db:
+            snapshot_writer = SnapshotRecordWriter(SnapshotStore(args.snapshot_db), tracker.metrics['timestamp'])
+            writers.append(snapshot_writer)
+        metrics = tracker.track_streaming(writers)
+        if snapshot_writer:
+            snapshot_writer.store.close()
+    else:
+        metrics = tracker.track_all_repositories()
     
     # Export in requested formats
-    if args.format in ['json', 'all']:
-        tracker.export_to_json(f'{args.output}.json')
+    if not args.stream or args.summary_only:
+        if args.format in ['json', 'all']:
+            tracker.export_to_json(f'{args.output}.json')
+        
+        if args.format == 'ndjson':
+            writer = NDJSONRecordWriter(f'{args.output}.ndjson')
+            for repo in metrics['repositories']:
+                writer.write(repo)
+            writer.close()
+            print(f"Metrics exported to {writer.filename}")
+        
+        if args.format in ['csv', 'all']:
+            tracker.export_to_csv(f'{args.output}.csv')
+        
+        if args.format in ['html', 'all']:
+            tracker.generate_html_report(f'{args.output}_report.html', page_size=args.html_page_size,
+                                         detail_pages=args.html_detail_pages)
+        
+        if args.format in ['shards', 'all']:
+            tracker.export_shards(f'{args.output}_data')
+        
+        if args.format == 'columnar':
+            tracker.export_columnar(f'{args.output}_columnar')
     
-    if args.format in ['csv', 'all']:
-        tracker.export_to_csv(f'{args.output}.csv')
+    if args.snapshot_db and not (args.stream and not args.summary_only):
+        store = SnapshotStore(args.snapshot_db)
+        run_id = store.record(metrics)
+        store.close()
+        print(f"Snapshot #{run_id} appended to {args.snapshot_db}")
     
-    if args.format in ['html', 'all']:
-        tracker.generate_html_report(f'{args.output}_report.html')
+    # The run's output is written, so there is nothing left to resume
+    if checkpoint and not args.summary_only:
+        checkpoint.discard()
     
     print("\n✅ Metrics tracking complete!")
-    print(f"Total repositories tracked: {len(metrics['repositories'])}")
+    print(f"Total repositories tracked: {metrics['summary'].get('total_repositories', len(metrics['repositories']))}")
     print(f"Total stars: {metrics['summary'].get('total_stars', 0)}")
     print(f"Total forks: {metrics['summary'].get('total_forks', 0)}")
+    if tracker.graphql_points_used:
+        print(f"GraphQL points used: {tracker.graphql_points_used}")
+    if cache:
+        print(f"Request cache: {cache.hits} hits / {cache.hits + cache.misses} requests "
+              f"({cache.hit_rate():.1%} hit rate)")
+    
+    tracker.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,170 @@
+"""An in-memory stand-in for the GitHub API, plugged into the tracker as its HTTP transport."""
+
+import json
+import os
+import sys
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from github_metrics_tracker import HTTPTransport  # noqa: E402
+
+# A handler gets (method, path, query, headers, json body) and returns (status, body, response headers)
+Handler = Callable[[str, str, Dict[str, str], Dict[str, str], Any], Tuple[int, Any, Dict[str, str]]]
+
+
+def make_response(url: str, status: int, body: Any = None, headers: Optional[Dict[str, str]] = None):
+    """Build a requests.Response the way the pooled transport would return it."""
+    response = requests.Response()
+    response.url = url
+    response.status_code = status
+    response.reason = 'OK' if status < 400 else 'Error'
+    response.headers = CaseInsensitiveDict(headers or {})
+    response._content = b'' if body is None else json.dumps(body).encode()
+    return response
+
+
+def paged(path: str, query: Dict[str, str], items: List[Any], headers: Optional[Dict[str, str]] = None):
+    """Answer a listing request with one page of items and a Link header, as the REST API does."""
+    page = int(query.get('page', 1))
+    per_page = int(query.get('per_page', 30))
+    last = max(1, -(-len(items) // per_page))
+    headers = dict(headers or {})
+    if last > 1:
+        url = f'https://api.github.com{path}'
+        links = [f'<{url}?page={page + 1}&per_page={per_page}>; rel="next"'] if page < last else []
+        links.append(f'<{url}?page={last}&per_page={per_page}>; rel="last"')
+        headers['Link'] = ', '.join(links)
+    return 200, items[(page - 1) * per_page:page * per_page], headers
+
+
+def without_times(value):
+    """Drop the collection timestamps, which differ between two runs."""
+    if isinstance(value, dict):
+        return {key: without_times(item) for key, item in value.items() if key not in ('collected_at', 'timestamp')}
+    if isinstance(value, list):
+        return [without_times(item) for item in value]
+    return value
+
+
+class FakeTransport(HTTPTransport):
+    """Answers requests from a handler instead of the network and records each one."""
+
+    def __init__(self, handler: Handler):
+        super().__init__(pool_size=1)
+        self.handler = handler
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def request(self, method: str, url: str, headers: Optional[Dict] = None,
+                params: Optional[Dict] = None, json: Optional[Any] = None):
+        parsed = urlparse(url)
+        query = dict(parse_qsl(parsed.query))
+        query.update({key: str(value) for key, value in (params or {}).items()})
+        headers = dict(headers or {})
+        with self._lock:
+            self.requests.append((method, parsed.path, query, headers))
+        status, body, response_headers = self.handler(method, parsed.path, query, headers, json)
+        return make_response(url, status, body, response_headers)
+
+    def paths(self, method: str = 'GET') -> List[str]:
+        """Paths requested so far with the given method, in order."""
+        with self._lock:
+            return [path for m, path, _, _ in self.requests if m == method]
+
+
+def repository(index: int, owner: str = 'alice') -> Dict[str, Any]:
+    """A repository as the listing and /repos/{owner}/{name} return it."""
+    return {
+        'name': f'repo-{index}', 'full_name': f'{owner}/repo-{index}', 'private': index % 3 == 2,
+        'fork': False, 'archived': False, 'size': 100 * (index + 1), 'language': 'Python',
+        'stargazers_count': 3 * index, 'watchers_count': 3 * index, 'forks_count': index,
+        'open_issues_count': 2, 'default_branch': 'main', 'topics': ['metrics'],
+        'created_at': '2020-01-01T00:00:00Z', 'updated_at': '2026-01-01T00:00:00Z',
+        'pushed_at': '2026-01-01T00:00:00Z',
+    }
+
+
+class FakeGitHub:
+    """
+    A small account served the way the REST API serves it.
+    
+    Every repository has issues, pull requests, releases, statistics and
+    workflow runs; endpoints it does not know answer 404, which the tracker
+    treats like a repository without that feature.
+    """
+
+    def __init__(self, count: int = 3, owner: str = 'alice'):
+        self.owner = owner
+        self.repositories = [repository(index, owner) for index in range(count)]
+        self.search_totals = {'is:issue': 7, 'is:pr': 3}
+        self.fail = set()
+
+    def transport(self) -> FakeTransport:
+        return FakeTransport(self.handle)
+
+    def handle(self, method, path, query, headers, body):
+        if path in self.fail:
+            return 500, {'message': 'Server Error'}, {}
+        if path == '/user' or path == f'/users/{self.owner}':
+            return 200, {'login': self.owner, 'public_repos': len(self.repositories), 'followers': 2}, {}
+        if path == f'/users/{self.owner}/repos':
+            return paged(path, query, self.repositories)
+        if path == '/search/issues':
+            kind = query['q'].split()[0]
+            return 200, {'total_count': self.search_totals[kind], 'incomplete_results': False, 'items': []}, {}
+        prefix = f'/repos/{self.owner}/'
+        if not path.startswith(prefix):
+            return 404, {'message': 'Not Found'}, {}
+        name, _, section = path[len(prefix):].partition('/')
+        index = int(name.rsplit('-', 1)[1])
+        return self.repository_endpoint(index, section, path, query)
+
+    def repository_endpoint(self, index: int, section: str, path: str, query: Dict[str, str]):
+        if section == '':
+            return 200, self.repositories[index], {}
+        if section == 'languages':
+            return 200, {'Python': 1000 * (index + 1), 'Shell': 10}, {}
+        if section == 'contributors':
+            return paged(path, query, [{'login': f'user-{k}', 'contributions': k + 1, 'type': 'User'}
+                                       for k in range(index + 1)])
+        if section == 'stats/commit_activity':
+            return 200, [{'days': [0, 1, 0, 0, 2, 0, 0], 'total': 3, 'week': 1700000000 + week * 604800}
+                         for week in range(52)], {}
+        if section == 'stats/code_frequency':
+            return 200, [[1700000000 + week * 604800, 10, -4] for week in range(52)], {}
+        if section == 'stats/participation':
+            return 200, {'all': [2] * 52, 'owner': [1] * 52}, {}
+        if section == 'issues':
+            issues = [{'number': k, 'state': 'open' if k % 3 else 'closed', 'updated_at': '2026-01-01T00:00:00Z',
+                       **({'pull_request': {}} if k % 4 == 0 else {})} for k in range(1, 40)]
+            state = query.get('state', 'open')
+            return paged(path, query, [i for i in issues if state == 'all' or i['state'] == state])
+        if section == 'pulls':
+            pulls = [{'number': k, 'state': 'open' if k % 2 else 'closed', 'updated_at': '2026-01-01T00:00:00Z',
+                      'created_at': '2025-12-01T00:00:00Z',
+                      'merged_at': '2026-01-01T00:00:00Z' if k % 4 == 0 else None} for k in range(1, 25)]
+            state = query.get('state', 'open')
+            return paged(path, query, [p for p in pulls if state == 'all' or p['state'] == state])
+        if section == 'releases':
+            return paged(path, query, [{'tag_name': f'v{k}', 'assets': [{'download_count': 5}]} for k in range(2)])
+        if section == 'branches':
+            return paged(path, query, [{'name': f'branch-{k}', 'protected': k == 0} for k in range(3)])
+        if section == 'tags':
+            return paged(path, query, [{'name': f'v{k}'} for k in range(2)])
+        if section == 'actions/workflows':
+            return 200, {'total_count': 1, 'workflows': [{'id': 1, 'name': 'CI', 'state': 'active',
+                                                          'path': '.github/workflows/ci.yml'}]}, {}
+        if section == 'actions/runs':
+            runs = [{'id': k, 'workflow_id': 1, 'conclusion': 'success' if k % 4 else 'failure', 'run_attempt': 1,
+                     'created_at': '2026-01-01T00:00:00Z', 'run_started_at': '2026-01-01T00:00:10Z',
+                     'updated_at': f'2026-01-01T00:0{k % 5 + 1}:00Z'} for k in range(1, 6)]
+            page = int(query.get('page', 1))
+            per_page = int(query.get('per_page', 30))
+            return 200, {'total_count': len(runs),
+                         'workflow_runs': runs[(page - 1) * per_page:page * per_page]}, {}
+        return 404, {'message': 'Not Found'}, {}
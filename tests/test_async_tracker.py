@@ -0,0 +1,164 @@
+"""Tests for AsyncGitHubMetricsTracker against the synchronous tracker."""
+
+import asyncio
+import inspect
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from fake_api import FakeGitHub, without_times  # noqa: E402
+from github_metrics_tracker import AsyncGitHubMetricsTracker, GitHubMetricsTracker, NDJSONRecordWriter  # noqa: E402
+
+
+class RecordingWriter:
+    """A record writer that remembers what happened to it, failing on a given repository."""
+
+    filename = 'recording'
+
+    def __init__(self, fail_on=None):
+        self.records = []
+        self.fail_on = fail_on
+        self.closed = self.aborted = False
+
+    def write(self, repo_metrics):
+        if repo_metrics['repository'] == self.fail_on:
+            raise OSError('disk full')
+        self.records.append(repo_metrics['repository'])
+
+    def close(self, metrics):
+        self.closed = True
+
+    def abort(self):
+        self.aborted = True
+
+
+class AsyncTrackerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.api = FakeGitHub(count=4)
+        self.sync = GitHubMetricsTracker(token='x', transport=self.api.transport(), stats_deadline=0)
+        self.tracker = AsyncGitHubMetricsTracker(token='x', transport=self.api.transport(), concurrency=4)
+
+    def tearDown(self):
+        self.sync.close()
+        self.tracker.close()
+
+    def run_async(self, coroutine):
+        with redirect_stdout(io.StringIO()):
+            return asyncio.run(coroutine)
+
+    def run_sync(self, function, *args):
+        with redirect_stdout(io.StringIO()):
+            return function(*args)
+
+
+class AsyncEntryPointTests(AsyncTrackerTestCase):
+    def test_user_info(self):
+        self.assertEqual(self.run_async(self.tracker.get_user_info()), self.run_sync(self.sync.get_user_info))
+        self.assertEqual(self.tracker.username, 'alice')
+
+    def test_all_repositories(self):
+        self.assertEqual(self.run_async(self.tracker.get_all_repositories()),
+                         ['alice/repo-0', 'alice/repo-1', 'alice/repo-2', 'alice/repo-3'])
+
+    def test_sharded_repositories_match_the_sync_tracker(self):
+        for index in (1, 2):
+            with self.subTest(index=index):
+                sync = GitHubMetricsTracker(token='x', transport=self.api.transport(), shard=f'{index}/2')
+                tracker = AsyncGitHubMetricsTracker(token='x', transport=self.api.transport(), shard=f'{index}/2')
+                try:
+                    self.assertEqual(self.run_async(tracker.get_all_repositories()),
+                                     self.run_sync(sync.get_all_repositories))
+                finally:
+                    sync.close()
+                    tracker.close()
+
+    def test_search_totals(self):
+        totals = self.run_async(self.tracker.get_search_totals())
+        self.assertEqual(totals, self.run_sync(self.sync.get_search_totals))
+        self.assertEqual(totals['total_open_issues'], 7)
+        self.assertEqual(totals['total_merged_prs'], 3)
+
+    def test_failed_search_is_left_out(self):
+        self.api.fail.add('/search/issues')
+        self.assertEqual(self.run_async(self.tracker.get_search_totals()), {})
+
+    def test_repository_metrics_match_the_sync_tracker(self):
+        self.assertEqual(without_times(self.run_async(self.tracker.collect_all_metrics_for_repo('alice/repo-2'))),
+                         without_times(self.run_sync(self.sync.collect_all_metrics_for_repo, 'alice/repo-2')))
+
+    def test_selected_collectors(self):
+        tracker = AsyncGitHubMetricsTracker(token='x', transport=self.api.transport(), metrics=['languages'])
+        try:
+            record = self.run_async(tracker.collect_all_metrics_for_repo('alice/repo-1'))
+        finally:
+            tracker.close()
+        self.assertEqual(list(record), ['repository', 'collected_at', 'languages'])
+
+    def test_track_all_repositories_matches_the_sync_tracker(self):
+        metrics = self.run_async(self.tracker.track_all_repositories())
+        expected = self.run_sync(self.sync.track_all_repositories)
+        self.assertEqual(without_times(metrics), without_times(expected))
+        self.assertEqual(self.tracker.partial_summary()['total_repositories'], 4)
+
+    def test_summary_only_matches_the_sync_tracker(self):
+        metrics = self.run_async(self.tracker.track_summary_only())
+        self.assertEqual(without_times(metrics), without_times(self.run_sync(self.sync.track_summary_only)))
+        self.assertEqual(metrics['summary']['total_open_issues'], 7)
+
+    def test_graphql_batch_without_token(self):
+        tracker = AsyncGitHubMetricsTracker(transport=self.api.transport())
+        try:
+            self.assertEqual(self.run_async(tracker.collect_graphql_batch(['alice/repo-0'])), {})
+        finally:
+            tracker.close()
+
+    def test_iter_repository_metrics_yields_in_listing_order(self):
+        async def collect():
+            return [record['repository'] async for record in self.tracker.iter_repository_metrics()]
+        self.tracker.concurrency = 1
+        self.assertEqual(self.run_async(collect()), ['alice/repo-0', 'alice/repo-1', 'alice/repo-2', 'alice/repo-3'])
+        self.assertEqual(self.tracker.metrics['repositories'], [])
+        self.assertEqual(self.tracker.partial_summary()['total_repositories'], 4)
+
+    def test_streaming_matches_the_sync_tracker(self):
+        with tempfile.TemporaryDirectory() as directory:
+            def stream(tracker, name):
+                path = os.path.join(directory, name)
+                result = tracker.track_streaming([NDJSONRecordWriter(path)])
+                if asyncio.iscoroutine(result):
+                    result = self.run_async(result)
+                with open(path) as f:
+                    return result, [json.loads(line) for line in f]
+
+            with redirect_stdout(io.StringIO()):
+                expected_metrics, expected = stream(self.sync, 'sync.ndjson')
+            metrics, records = stream(self.tracker, 'async.ndjson')
+        self.assertEqual(without_times(records), without_times(expected))
+        self.assertEqual(without_times(metrics), without_times(expected_metrics))
+        self.assertEqual(metrics['repositories'], [])
+
+    def test_failed_stream_aborts_the_writers(self):
+        writer = RecordingWriter(fail_on='alice/repo-2')
+        with self.assertRaises(OSError):
+            self.run_async(self.tracker.track_streaming([writer]))
+        self.assertEqual(writer.records, ['alice/repo-0', 'alice/repo-1'])
+        self.assertTrue(writer.aborted)
+        self.assertFalse(writer.closed)
+
+    def test_api_methods_are_coroutines(self):
+        for name in ('get_user_info', 'get_all_repositories', 'get_search_totals', 'collect_graphql_batch',
+                     'collect_all_metrics_for_repo', 'track_all_repositories', 'track_summary_only',
+                     'track_streaming', 'get_repository_basic_metrics',
+                     'get_issues_metrics', 'get_workflows_metrics'):
+            with self.subTest(name=name):
+                self.assertTrue(asyncio.iscoroutinefunction(getattr(self.tracker, name)))
+        self.assertTrue(inspect.isasyncgenfunction(self.tracker.iter_repository_metrics))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""Tests for RunCheckpoint (--checkpoint / --resume)."""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from github_metrics_tracker import RunCheckpoint  # noqa: E402
+
+HEADER = {'timestamp': '2026-01-01T00:00:00+00:00', 'username': 'alice', 'user_info': {},
+          'collectors': ['basic'], 'shard': None, 'repositories': ['alice/a', 'alice/b', 'alice/c']}
+
+
+def record(name: str) -> dict:
+    return {'repository': name, 'collected_at': '2026-01-01T00:00:00+00:00', 'basic': {'stargazers_count': 1}}
+
+
+class RunCheckpointTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'run.checkpoint')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_run(self, names):
+        checkpoint = RunCheckpoint(self.path, every=1)
+        checkpoint.start(HEADER)
+        for name in names:
+            checkpoint.add(record(name))
+        checkpoint.close()
+
+    def test_round_trip(self):
+        self.write_run(['alice/a', 'alice/b'])
+        header, records = RunCheckpoint(self.path).load()
+        self.assertEqual(header['repositories'], HEADER['repositories'])
+        self.assertEqual(header['checkpoint'], RunCheckpoint.VERSION)
+        self.assertEqual(records, {'alice/a': record('alice/a'), 'alice/b': record('alice/b')})
+
+    def test_missing_file(self):
+        self.assertIsNone(RunCheckpoint(self.path).load())
+
+    def test_torn_last_line_is_dropped_and_truncated_on_resume(self):
+        self.write_run(['alice/a', 'alice/b'])
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(record('alice/c'))[:20])
+
+        checkpoint = RunCheckpoint(self.path)
+        _, records = checkpoint.load()
+        self.assertEqual(list(records), ['alice/a', 'alice/b'])
+
+        checkpoint.resume()
+        checkpoint.add(record('alice/c'))
+        checkpoint.close()
+        _, records = RunCheckpoint(self.path).load()
+        self.assertEqual(list(records), ['alice/a', 'alice/b', 'alice/c'])
+
+    def test_unparsable_line_ends_the_records(self):
+        self.write_run(['alice/a'])
+        with open(self.path, 'a') as f:
+            f.write('{"repository": \n')
+            f.write(json.dumps(record('alice/b')) + '\n')
+        _, records = RunCheckpoint(self.path).load()
+        self.assertEqual(list(records), ['alice/a'])
+
+    def test_other_version_is_ignored(self):
+        with open(self.path, 'w') as f:
+            f.write(json.dumps(dict(HEADER, checkpoint=RunCheckpoint.VERSION + 1)) + '\n')
+        self.assertIsNone(RunCheckpoint(self.path).load())
+
+    def test_discard_removes_the_file(self):
+        self.write_run(['alice/a'])
+        checkpoint = RunCheckpoint(self.path)
+        checkpoint.discard()
+        self.assertFalse(os.path.exists(self.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+"""Tests for the collector registry (--metrics / --skip-metrics) and its scheduler."""
+
+import io
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from fake_api import FakeGitHub, without_times  # noqa: E402
+from github_metrics_tracker import GitHubMetricsTracker  # noqa: E402
+
+
+def names(collectors):
+    return [collector.name for collector in collectors]
+
+
+class SelectCollectorsTests(unittest.TestCase):
+    select = staticmethod(GitHubMetricsTracker.select_collectors)
+
+    def test_default_is_every_collector_in_record_order(self):
+        self.assertEqual(names(self.select()), names(GitHubMetricsTracker.COLLECTORS))
+
+    def test_dependencies_are_added(self):
+        self.assertEqual(names(self.select(['custom', 'contributor_count'])),
+                         ['basic', 'contributors', 'contributor_count', 'custom'])
+
+    def test_skipping_a_dependency_skips_its_dependents(self):
+        with redirect_stdout(io.StringIO()) as output:
+            selected = names(self.select(['contributor_count', 'languages'], ['contributors']))
+        self.assertEqual(selected, ['languages'])
+        self.assertIn('Skipping contributor_count', output.getvalue())
+        self.assertNotIn('basic', names(self.select(skip_metrics=['basic'])))
+        self.assertNotIn('custom', names(self.select(skip_metrics=['basic'])))
+
+    def test_unknown_names(self):
+        with self.assertRaisesRegex(ValueError, 'Unknown metrics: stars'):
+            self.select(['stars'])
+        with self.assertRaises(ValueError):
+            self.select(skip_metrics=['nope'])
+
+
+class CollectorSchedulingTests(unittest.TestCase):
+    def setUp(self):
+        self.api = FakeGitHub(count=2)
+
+    def collect(self, **options):
+        transport = self.api.transport()
+        tracker = GitHubMetricsTracker(token='x', transport=transport, stats_deadline=0, **options)
+        try:
+            with redirect_stdout(io.StringIO()):
+                return tracker.collect_all_metrics_for_repo('alice/repo-1'), transport
+        finally:
+            tracker.close()
+
+    def test_only_selected_sections_are_requested(self):
+        record, transport = self.collect(metrics=['languages', 'contributor_count'])
+        self.assertEqual(list(record), ['repository', 'collected_at', 'languages', 'contributors', 'contributor_count'])
+        self.assertEqual(record['contributor_count'], 2)
+        self.assertEqual(sorted(transport.paths()), ['/repos/alice/repo-1/contributors', '/repos/alice/repo-1/languages'])
+
+    def test_concurrent_collectors_build_the_same_record(self):
+        sequential, _ = self.collect()
+        concurrent, _ = self.collect(collector_concurrency=4)
+        self.assertEqual(list(concurrent), list(sequential))
+        self.assertEqual(without_times(concurrent), without_times(sequential))
+        self.assertEqual(concurrent['custom'], sequential['custom'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""Tests for the columnar export (--format columnar) and load_columnar_table."""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from github_metrics_tracker import ColumnarWriter, load_columnar_table, pyarrow  # noqa: E402
+
+RECORDS = [
+    {
+        'repository': 'alice/a',
+        'basic': {'stargazers_count': 3, 'description': 'Snowman ☃', 'archived': False, 'size': 2 ** 40},
+        'languages': {'Python': 1200, 'C': 30},
+        'custom': {'engagement_score': 1.5},
+        'commit_activity': {'total_commits_last_year': 3,
+                            'weekly_activity': [{'days': [0, 1, 2, 0, 0, 0, 0], 'total': 3, 'week': 1700000000}]},
+        'releases': {'releases': [{'tag_name': 'v1', 'downloads': 7}, {'tag_name': 'v2', 'downloads': None}]},
+    },
+    {
+        'repository': 'alice/b',
+        'basic': {'stargazers_count': 5, 'description': None, 'archived': True, 'size': 0},
+        'languages': {},
+        'custom': {'engagement_score': 2},
+        'commit_activity': {'total_commits_last_year': 0, 'weekly_activity': []},
+        'releases': {'releases': []},
+    },
+]
+
+
+class ColumnarRoundTripMixin:
+    parquet = False
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.directory.name, 'columnar')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def table(self, name: str) -> str:
+        return os.path.join(self.output, f'{name}.parquet' if self.parquet else name)
+
+    def write(self, records, row_group_rows: int = ColumnarWriter.ROW_GROUP_ROWS, abort: bool = False):
+        writer = ColumnarWriter(self.output, parquet=self.parquet)
+        writer.ROW_GROUP_ROWS = row_group_rows
+        for repo_metrics in records:
+            writer.write(repo_metrics)
+        if abort:
+            writer.abort()
+        else:
+            writer.close({'timestamp': '2026-01-01T00:00:00+00:00'})
+
+    def test_repositories_round_trip(self):
+        self.write(RECORDS, row_group_rows=1)
+        table = load_columnar_table(self.table('repositories'))
+        self.assertEqual(table['repository'], ['alice/a', 'alice/b'])
+        self.assertEqual(table['basic.stargazers_count'], [3, 5])
+        self.assertEqual(table['basic.description'], ['Snowman ☃', None])
+        self.assertEqual(table['basic.archived'], [False, True])
+        self.assertEqual(table['basic.size'], [2 ** 40, 0])
+        # An int among floats widens the column to float64
+        self.assertEqual(table['custom.engagement_score'], [1.5, 2.0])
+
+    def test_child_tables(self):
+        self.write(RECORDS)
+        self.assertEqual(load_columnar_table(self.table('languages')),
+                         {'repository': ['alice/a', 'alice/a'], 'language': ['Python', 'C'], 'bytes': [1200, 30]})
+        releases = load_columnar_table(self.table('releases.releases'), columns=['position', 'downloads'])
+        self.assertEqual(releases, {'position': [0, 1], 'downloads': [7, None]})
+        weekly = load_columnar_table(self.table('commit_activity.weekly_activity'))
+        self.assertEqual(weekly['week'], [1700000000])
+        self.assertEqual([weekly[f'day_{day}'][0] for day in range(7)], [0, 1, 2, 0, 0, 0, 0])
+
+    def test_unknown_column(self):
+        self.write(RECORDS)
+        with self.assertRaises((ValueError, KeyError)):
+            load_columnar_table(self.table('repositories'), columns=['nope'])
+
+    def test_abort_keeps_the_previous_tables(self):
+        self.write(RECORDS[:1])
+        self.write(RECORDS, abort=True)
+        self.assertEqual(load_columnar_table(self.table('repositories'))['repository'], ['alice/a'])
+        self.assertEqual(os.listdir(self.directory.name), ['columnar'])
+        self.assertFalse([name for name in os.listdir(self.output) if name.startswith('.')])
+
+    def test_close_replaces_the_previous_tables(self):
+        self.write(RECORDS[:1])
+        self.write(RECORDS)
+        self.assertEqual(load_columnar_table(self.table('repositories'))['repository'], ['alice/a', 'alice/b'])
+
+    def test_close_drops_tables_of_the_previous_run(self):
+        self.write(RECORDS)
+        self.write([{'repository': 'alice/c', 'basic': {'stargazers_count': 1}}])
+        self.assertEqual(sorted(os.listdir(self.output)), [os.path.basename(self.table('repositories'))])
+        self.assertEqual(os.listdir(self.directory.name), ['columnar'])
+
+
+class ArrayLayoutTests(ColumnarRoundTripMixin, unittest.TestCase):
+    parquet = False
+
+    def test_schema_file(self):
+        self.write(RECORDS)
+        self.assertTrue(os.path.exists(os.path.join(self.table('repositories'), 'schema.json')))
+
+
+@unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+class ParquetLayoutTests(ColumnarRoundTripMixin, unittest.TestCase):
+    parquet = True
+
+    def test_format_switch_leaves_one_layout(self):
+        self.write(RECORDS)
+        self.parquet = False
+        self.write(RECORDS)
+        self.assertFalse([name for name in os.listdir(self.output) if name.endswith('.parquet')])
+        self.assertEqual(load_columnar_table(self.table('repositories'))['repository'], ['alice/a', 'alice/b'])
+
+
+if __name__ == '__main__':
+    unittest.main()
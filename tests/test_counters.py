@@ -0,0 +1,226 @@
+"""Tests for the persistent issue and pull request counters (--issue-counters)."""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from requests.structures import CaseInsensitiveDict
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from github_metrics_tracker import GitHubMetricsTracker, IssueCounterStore  # noqa: E402
+
+
+def timestamp(minute: int) -> str:
+    return f'2026-01-01T{minute // 60:02d}:{minute % 60:02d}:00Z'
+
+
+class FakeRepository:
+    """Issues and pull requests of one repository, listed the way the REST API sorts and pages them."""
+
+    def __init__(self):
+        self.issues = {}
+        self.pulls = {}
+        self.clock = 0
+        self.requests = 0
+        self.fail_after = None
+        self.on_request = None
+
+    def tick(self) -> str:
+        self.clock += 1
+        return timestamp(self.clock)
+
+    def add_issue(self, number: int, state: str = 'open', pull_request: bool = False):
+        self.issues[number] = {'number': number, 'state': state, 'updated_at': self.tick()}
+        if pull_request:
+            self.issues[number]['pull_request'] = {}
+
+    def update_issue(self, number: int, state: str):
+        self.issues[number].update(state=state, updated_at=self.tick())
+
+    def add_pull(self, number: int, state: str = 'open', merged: bool = False):
+        now = self.tick()
+        self.pulls[number] = {'number': number, 'state': state, 'created_at': now, 'updated_at': now,
+                              'merged_at': now if merged else None}
+
+    def update_pull(self, number: int, state: str, merged: bool = False):
+        now = self.tick()
+        self.pulls[number].update(state=state, updated_at=now, merged_at=now if merged else None)
+
+    def listing(self, url: str, params: dict):
+        self.requests += 1
+        if self.fail_after is not None and self.requests > self.fail_after:
+            return None, CaseInsensitiveDict(), None
+        if self.on_request:
+            self.on_request(self.requests)
+        items = list((self.issues if url.endswith('/issues') else self.pulls).values())
+        if params.get('since'):
+            items = [item for item in items if item['updated_at'] >= params['since']]
+        key = 'created_at' if params.get('sort') == 'created' else 'updated_at'
+        items.sort(key=lambda item: (item[key], item['number']), reverse=params.get('direction') == 'desc')
+        per_page = params.get('per_page', 30)
+        start = (params.get('page', 1) - 1) * per_page
+        return [dict(item) for item in items[start:start + per_page]], CaseInsensitiveDict(), 200
+
+
+class FakeTracker(GitHubMetricsTracker):
+    def __init__(self, repository: FakeRepository, store: IssueCounterStore):
+        super().__init__(token='x', counter_store=store)
+        self.repository = repository
+
+    def _request(self, url, params=None, extra_headers=None):
+        return self.repository.listing(url, params or {})
+
+
+def full_issue_counts(repository: FakeRepository) -> dict:
+    issues = [i for i in repository.issues.values() if 'pull_request' not in i]
+    prs = [i for i in repository.issues.values() if 'pull_request' in i]
+    return {
+        'open_count': sum(i['state'] == 'open' for i in issues),
+        'closed_count': sum(i['state'] == 'closed' for i in issues),
+        'total_count': len(issues),
+        'open_prs': sum(i['state'] == 'open' for i in prs),
+        'closed_prs': sum(i['state'] == 'closed' for i in prs),
+    }
+
+
+def full_pull_counts(repository: FakeRepository) -> dict:
+    pulls = list(repository.pulls.values())
+    merged = sum(bool(pr['merged_at']) for pr in pulls)
+    closed = sum(pr['state'] == 'closed' for pr in pulls)
+    return {
+        'open_count': len(pulls) - closed,
+        'closed_count': closed,
+        'merged_count': merged,
+        'total_count': len(pulls),
+        'merge_rate': merged / closed if closed else 0,
+    }
+
+
+class CounterTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'counters.json')
+        self.repository = FakeRepository()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_tracker(self, method: str) -> dict:
+        """Run one collection with counters loaded from and saved to disk, as separate runs do."""
+        store = IssueCounterStore(self.path)
+        tracker = FakeTracker(self.repository, store)
+        try:
+            return getattr(tracker, method)('owner/repo')
+        finally:
+            store.save()
+            tracker.close()
+
+
+class IssueCounterTests(CounterTestCase):
+    def test_delta_run_matches_full_count(self):
+        for number in range(1, 251):
+            self.repository.add_issue(number, pull_request=number % 5 == 0)
+        self.assertEqual(self.run_tracker('get_issues_metrics'), full_issue_counts(self.repository))
+
+        for number in range(1, 251, 3):
+            self.repository.update_issue(number, 'closed')
+        self.repository.add_issue(251)
+        self.repository.requests = 0
+        self.assertEqual(self.run_tracker('get_issues_metrics'), full_issue_counts(self.repository))
+        self.assertLessEqual(self.repository.requests, 2)
+
+    def test_update_during_walk_does_not_skip_items(self):
+        for number in range(1, 351):
+            self.repository.add_issue(number)
+
+        # An item of the first page is updated, and so moves to the end, before the second page
+        def update(request):
+            if request == 2:
+                self.repository.update_issue(1, 'closed')
+        self.repository.on_request = update
+        self.assertEqual(self.run_tracker('get_issues_metrics'), full_issue_counts(self.repository))
+
+    def test_failed_walk_keeps_a_safe_watermark(self):
+        for number in range(1, 351):
+            self.repository.add_issue(number)
+        self.run_tracker('get_issues_metrics')
+
+        for number in range(1, 351, 2):
+            self.repository.update_issue(number, 'closed')
+        self.repository.requests = 0
+        self.repository.fail_after = 1
+        self.run_tracker('get_issues_metrics')
+        self.assertLess(IssueCounterStore(self.path).get('owner/repo', 'issues')['watermark'],
+                        timestamp(self.repository.clock))
+
+        self.repository.fail_after = None
+        self.assertEqual(self.run_tracker('get_issues_metrics'), full_issue_counts(self.repository))
+
+    def test_partial_seed_is_not_stored(self):
+        for number in range(1, 351):
+            self.repository.add_issue(number)
+        self.repository.fail_after = 2
+        with redirect_stdout(io.StringIO()) as output:
+            self.run_tracker('get_issues_metrics')
+        self.assertIn('could not be seeded completely', output.getvalue())
+        self.assertIsNone(IssueCounterStore(self.path).get('owner/repo', 'issues'))
+
+        self.repository.fail_after = None
+        self.assertEqual(self.run_tracker('get_issues_metrics'), full_issue_counts(self.repository))
+
+
+class PullRequestCounterTests(CounterTestCase):
+    def test_delta_run_matches_full_count(self):
+        for number in range(1, 251):
+            self.repository.add_pull(number, 'closed' if number % 4 == 0 else 'open', merged=number % 8 == 0)
+        self.assertEqual(self.run_tracker('get_pull_requests_metrics'), full_pull_counts(self.repository))
+
+        for number in range(1, 251, 7):
+            self.repository.update_pull(number, 'closed', merged=number % 2 == 0)
+        self.repository.add_pull(251)
+        self.assertEqual(self.run_tracker('get_pull_requests_metrics'), full_pull_counts(self.repository))
+
+    def test_update_during_seed_is_counted_next_run(self):
+        for number in range(1, 351):
+            self.repository.add_pull(number)
+
+        # The seed saw pull request 1 before it was merged; the stored watermark makes the next run apply it
+        def update(request):
+            if request == 2:
+                self.repository.update_pull(1, 'closed', merged=True)
+        self.repository.on_request = update
+        self.assertEqual(self.run_tracker('get_pull_requests_metrics')['total_count'], 350)
+
+        self.repository.on_request = None
+        self.assertEqual(self.run_tracker('get_pull_requests_metrics'), full_pull_counts(self.repository))
+
+    def test_partial_seed_is_not_stored(self):
+        for number in range(1, 351):
+            self.repository.add_pull(number)
+        self.repository.fail_after = 2
+        self.run_tracker('get_pull_requests_metrics')
+        self.assertIsNone(IssueCounterStore(self.path).get('owner/repo', 'pulls'))
+
+        self.repository.fail_after = None
+        self.assertEqual(self.run_tracker('get_pull_requests_metrics'), full_pull_counts(self.repository))
+
+
+class ApplyTests(unittest.TestCase):
+    def test_reapplying_an_item_is_a_no_op(self):
+        entry = {'watermark': '', 'states': {}, 'counts': {}}
+        item = {'number': 1, 'state': 'open', 'updated_at': timestamp(1)}
+        classify = lambda i: i['state']  # noqa: E731
+        IssueCounterStore.apply(entry, [item], classify)
+        IssueCounterStore.apply(entry, [item], classify)
+        self.assertEqual(entry['counts'], {'open': 1})
+
+        IssueCounterStore.apply(entry, [dict(item, state='closed', updated_at=timestamp(2))], classify)
+        self.assertEqual(entry['counts'], {'open': 0, 'closed': 1})
+        self.assertEqual(entry['watermark'], timestamp(2))
+
+
+if __name__ == '__main__':
+    unittest.main()
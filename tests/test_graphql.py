@@ -0,0 +1,124 @@
+"""Tests for the GraphQL backend (--backend graphql)."""
+
+import io
+import os
+import re
+import sys
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from fake_api import FakeGitHub  # noqa: E402
+from github_metrics_tracker import GitHubMetricsTracker  # noqa: E402
+
+
+class FakeGraphQL(FakeGitHub):
+    """FakeGitHub that also answers aliased repository queries on /graphql."""
+
+    def __init__(self, count: int = 3):
+        super().__init__(count)
+        self.queries = []
+        self.missing = set()
+
+    def node(self, repo):
+        return {
+            'name': repo['name'], 'nameWithOwner': repo['full_name'], 'description': None,
+            'isPrivate': repo['private'], 'isFork': False, 'createdAt': repo['created_at'],
+            'updatedAt': repo['updated_at'], 'pushedAt': repo['pushed_at'], 'diskUsage': repo['size'],
+            'stargazerCount': repo['stargazers_count'], 'forkCount': repo['forks_count'],
+            'watchers': {'totalCount': 1}, 'defaultBranchRef': {'name': 'main'},
+            'primaryLanguage': {'name': 'Python'}, 'visibility': 'PUBLIC',
+            'repositoryTopics': {'nodes': [{'topic': {'name': 'metrics'}}]},
+            'openIssues': {'totalCount': 4}, 'closedIssues': {'totalCount': 6},
+            'openPullRequests': {'totalCount': 1}, 'closedPullRequests': {'totalCount': 2},
+            'mergedPullRequests': {'totalCount': 3},
+            'releases': {'totalCount': 1, 'nodes': [{
+                'tagName': 'v1', 'name': 'One', 'publishedAt': '2026-01-01T00:00:00Z', 'isDraft': False,
+                'isPrerelease': False, 'releaseAssets': {'totalCount': 2, 'nodes': [{'downloadCount': 5},
+                                                                                    {'downloadCount': 7}]}}]},
+            'branches': {'totalCount': 2, 'nodes': [{'name': 'main', 'branchProtectionRule': {'id': 'x'}},
+                                                    {'name': 'dev', 'branchProtectionRule': None}]},
+            'tags': {'totalCount': 1, 'nodes': [{'name': 'v1'}]},
+        }
+
+    def handle(self, method, path, query, headers, body):
+        if method != 'POST' or path != '/graphql':
+            return super().handle(method, path, query, headers, body)
+        self.queries.append(body['query'])
+        variables = body['variables']
+        by_name = {repo['name']: repo for repo in self.repositories}
+        data = {'rateLimit': {'cost': 1, 'remaining': 4999, 'resetAt': '2026-01-01T01:00:00Z'}}
+        for alias in re.findall(r'(r\d+): repository', body['query']):
+            index = alias[1:]
+            name = variables[f'name{index}']
+            data[alias] = None if name in self.missing else self.node(by_name[name])
+        return 200, {'data': data}, {}
+
+
+class GraphQLBackendTests(unittest.TestCase):
+    def setUp(self):
+        self.api = FakeGraphQL(count=7)
+
+    def tracker(self, **options):
+        options.setdefault('token', 'x')
+        return GitHubMetricsTracker(transport=self.api.transport(), backend='graphql', stats_deadline=0, **options)
+
+    def test_repositories_are_batched(self):
+        tracker = self.tracker(graphql_batch_size=3)
+        try:
+            with redirect_stdout(io.StringIO()):
+                sections = tracker.collect_graphql_batch([repo['full_name'] for repo in self.api.repositories])
+        finally:
+            tracker.close()
+        self.assertEqual([query.count(': repository(') for query in self.api.queries], [3, 3, 1])
+        self.assertEqual(list(sections), [repo['full_name'] for repo in self.api.repositories])
+        self.assertEqual(tracker.graphql_points_used, 3)
+
+    def test_sections_have_the_rest_shape(self):
+        tracker = self.tracker()
+        try:
+            with redirect_stdout(io.StringIO()):
+                sections = tracker.collect_graphql_batch(['alice/repo-2'])['alice/repo-2']
+                rest = tracker.get_repository_basic_metrics('alice/repo-2')
+        finally:
+            tracker.close()
+        self.assertEqual(set(sections['basic']), set(rest))
+        for field in ('full_name', 'stargazers_count', 'forks_count', 'size', 'private', 'topics'):
+            self.assertEqual(sections['basic'][field], rest[field], field)
+        self.assertEqual(sections['issues'], {'open_count': 4, 'closed_count': 6, 'total_count': 10,
+                                              'open_prs': 1, 'closed_prs': 5})
+        # REST counts merged pull requests as closed
+        self.assertEqual(sections['pull_requests']['closed_count'], 5)
+        self.assertEqual(sections['pull_requests']['merge_rate'], 3 / 5)
+        self.assertEqual(sections['releases']['total_asset_downloads'], 12)
+        self.assertEqual(sections['branches']['branches'][0], {'name': 'main', 'protected': True})
+
+    def test_unresolved_repositories_fall_back_to_rest(self):
+        self.api.missing.add('repo-1')
+        transport = self.api.transport()
+        tracker = GitHubMetricsTracker(token='x', transport=transport, backend='graphql', stats_deadline=0,
+                                       metrics=['basic', 'issues'])
+        try:
+            with redirect_stdout(io.StringIO()):
+                metrics = tracker.track_all_repositories()
+        finally:
+            tracker.close()
+        issues = {r['repository']: r['issues']['open_count'] for r in metrics['repositories']}
+        self.assertEqual(issues.pop('alice/repo-1'), 20)
+        self.assertEqual(set(issues.values()), {4})
+        self.assertEqual({path for path in transport.paths() if path.startswith('/repos/')},
+                         {'/repos/alice/repo-1', '/repos/alice/repo-1/issues'})
+
+    def test_no_token_uses_rest(self):
+        tracker = self.tracker(token=None)
+        try:
+            with redirect_stdout(io.StringIO()) as output:
+                self.assertEqual(tracker.collect_graphql_batch(['alice/repo-0']), {})
+        finally:
+            tracker.close()
+        self.assertIn('requires a token', output.getvalue())
+        self.assertEqual(self.api.queries, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""Tests for the streaming HTML report (--html-page-size, --html-detail-pages)."""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from fake_api import FakeGitHub  # noqa: E402
+from github_metrics_tracker import GitHubMetricsTracker, HTMLReportWriter  # noqa: E402
+
+
+def record(index: int) -> dict:
+    name = f'alice/repo-{index}'
+    return {'repository': name, 'basic': {'stargazers_count': index, 'forks_count': 0, 'language': 'C&C++'},
+            'issues': {'open_count': index}, 'releases': {'total_releases': 1, 'releases': [{}, {}]},
+            'contributor_count': 4}
+
+
+METRICS = {'summary': {'total_repositories': 5, 'total_stars': 12345, 'total_code_additions': 12345,
+                       'most_starred': [{'name': 'alice/repo-4', 'stars': 4}],
+                       'languages': {'C&C++': {'bytes': 1, 'percentage': 100.0}}},
+           'timestamp': '2026-01-01T00:00:00+00:00', 'user_info': {'basic_info': {'login': 'alice'}}}
+
+
+class HTMLReportTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.report = os.path.join(self.directory.name, 'report.html')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read(self, name: str) -> str:
+        with open(os.path.join(self.directory.name, name), encoding='utf-8') as f:
+            return f.read()
+
+    def write(self, count: int = 5, **options):
+        writer = HTMLReportWriter(self.report, **options)
+        for index in range(count):
+            writer.write(record(index))
+        writer.close(METRICS)
+
+    def test_single_page_report(self):
+        self.write()
+        report = self.read('report.html')
+        self.assertEqual(os.listdir(self.directory.name), ['report.html'])
+        positions = [report.index(f'alice/repo-{index}</div>') for index in range(5)]
+        self.assertEqual(positions, sorted(positions))
+        self.assertIn('12345', report)
+        self.assertIn('12,345', report)
+        # Sections missing from the summary read N/A rather than 0
+        self.assertIn('<div class="metric-value">N/A</div>\n                <div class="metric-label">Total Forks', report)
+        self.assertIn('C&amp;C++', report)
+        self.assertTrue(report.rstrip().endswith('</html>'))
+
+    def test_pages_link_to_each_other(self):
+        self.write(page_size=2)
+        report = self.read('report.html')
+        self.assertNotIn('alice/repo-0</div>', report)
+        self.assertIn('<a href="report_page_2.html">Page 2</a>', report)
+        self.assertIn('alice/repo-2 … alice/repo-3', report)
+
+        first, middle, last = (self.read(f'report_page_{number}.html') for number in (1, 2, 3))
+        self.assertIn('report_page_2.html">Next', first)
+        self.assertNotIn('Previous', first)
+        self.assertIn('report_page_1.html">Previous', middle)
+        self.assertIn('report_page_3.html">Next', middle)
+        self.assertNotIn('Next', last)
+        self.assertIn('alice/repo-4', last)
+
+    def test_detail_pages(self):
+        self.write(detail_pages=True, workers=2)
+        details = sorted(os.listdir(os.path.join(self.directory.name, 'report_repos')))
+        self.assertEqual(details, sorted(HTMLReportWriter.detail_filename(f'alice/repo-{i}') for i in range(5)))
+        page = self.read(os.path.join('report_repos', 'alice__repo-3.html'))
+        self.assertIn('<h2>releases</h2>', page)
+        self.assertIn('<td>2 entries</td>', page)
+        self.assertIn('<th>value</th><td>4</td>', page)
+        self.assertIn('href="../report.html"', page)
+        self.assertIn('<a href="report_repos/alice__repo-4.html">alice/repo-4</a>', self.read('report.html'))
+
+    def test_tracker_report_matches_the_streamed_one(self):
+        tracker = GitHubMetricsTracker(token='x', transport=FakeGitHub(count=3).transport(), stats_deadline=0)
+        try:
+            with redirect_stdout(io.StringIO()):
+                metrics = tracker.track_all_repositories()
+                tracker.generate_html_report(self.report, page_size=2)
+        finally:
+            tracker.close()
+        generated = [self.read(name) for name in ('report.html', 'report_page_1.html', 'report_page_2.html')]
+
+        writer = HTMLReportWriter(self.report, page_size=2)
+        for repo in metrics['repositories']:
+            writer.write(repo)
+        writer.close(metrics)
+        self.assertEqual([self.read(name) for name in ('report.html', 'report_page_1.html', 'report_page_2.html')],
+                         generated)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""Tests for incremental runs that carry unchanged repositories over (--incremental)."""
+
+import copy
+import io
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from fake_api import FakeGitHub, without_times  # noqa: E402
+from github_metrics_tracker import GitHubMetricsTracker  # noqa: E402
+
+
+class IncrementalRunTests(unittest.TestCase):
+    def setUp(self):
+        self.api = FakeGitHub(count=4)
+        self.previous = self.track()[0]
+
+    def track(self, previous=None, **options):
+        transport = self.api.transport()
+        tracker = GitHubMetricsTracker(token='x', transport=transport, stats_deadline=0,
+                                       previous_metrics=copy.deepcopy(previous), **options)
+        try:
+            with redirect_stdout(io.StringIO()):
+                return tracker.track_all_repositories(), transport
+        finally:
+            tracker.close()
+
+    @staticmethod
+    def sections(transport, name: str):
+        """Sections requested for one repository, by the path after /repos/alice/NAME."""
+        prefix = f'/repos/alice/{name}'
+        return {path[len(prefix):] for path in transport.paths() if path.startswith(prefix)}
+
+    def test_unchanged_repositories_only_refresh_windowed_sections(self):
+        self.api.repositories[2]['stargazers_count'] += 1
+        metrics, transport = self.track(self.previous)
+
+        windowed = {'/stats/commit_activity', '/stats/code_frequency', '/stats/participation',
+                    '/traffic/views', '/traffic/clones', '/traffic/popular/referrers', '/traffic/popular/paths',
+                    '/actions/workflows', '/actions/runs'}
+        self.assertLessEqual(self.sections(transport, 'repo-0'), windowed)
+        self.assertIn('/issues', self.sections(transport, 'repo-2'))
+        self.assertEqual(metrics['repositories'][2]['basic']['stargazers_count'],
+                         self.api.repositories[2]['stargazers_count'])
+
+        # Apart from the changed repository, the records are those of a full run
+        full, _ = self.track()
+        self.assertEqual(without_times(metrics), without_times(full))
+
+    def test_newly_selected_section_forces_a_full_collection(self):
+        previous, _ = self.track(metrics=['basic', 'languages'])
+        _, transport = self.track(previous, metrics=['basic', 'languages', 'tags'])
+        self.assertIn('', self.sections(transport, 'repo-1'))
+        self.assertIn('/tags', self.sections(transport, 'repo-1'))
+
+    def test_new_repository_is_collected_in_full(self):
+        self.api.repositories.append(dict(self.api.repositories[0], name='repo-4', full_name='alice/repo-4'))
+        metrics, transport = self.track(self.previous)
+        self.assertIn('/languages', self.sections(transport, 'repo-4'))
+        self.assertNotIn('/languages', self.sections(transport, 'repo-3'))
+        self.assertEqual(len(metrics['repositories']), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+"""Tests for the streaming metrics file reader and the merge entry point."""
+
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from github_metrics_tracker import (  # noqa: E402
+    JSONRecordWriter, _JSONStream, iter_metrics_file, merge_metrics
+)
+
+
+def record(name: str, collected_at: str, stars: int) -> dict:
+    return {'repository': name, 'collected_at': collected_at,
+            'basic': {'full_name': name, 'stargazers_count': stars, 'forks_count': 0}}
+
+
+def document(records, timestamp: str, login: str = 'alice') -> dict:
+    return {'repositories': records, 'summary': {}, 'timestamp': timestamp,
+            'user_info': {'basic_info': {'login': login}}}
+
+
+class JSONStreamTests(unittest.TestCase):
+    VALUES = [
+        12345678901234567890, -0.5e-7, 'ascii', 'esc\\"aped é \U0001F600 "quoted"', True, None,
+        [], {}, [1, [2, [3, {'a': 'b'}]]], {'k': [1.25, False, {'deep': 'x' * 40}]},
+    ]
+
+    def test_values_split_at_every_chunk_boundary(self):
+        text = ' \n'.join(json.dumps(value) for value in self.VALUES)
+        for chunk_size in (1, 2, 3, 5, 8, 64):
+            with self.subTest(chunk_size=chunk_size):
+                stream = _JSONStream(io.StringIO(text), chunk_size=chunk_size)
+                self.assertEqual([stream.value() for _ in self.VALUES], self.VALUES)
+                self.assertEqual(stream.peek(), '')
+
+    def test_expect_reports_the_unexpected_character(self):
+        stream = _JSONStream(io.StringIO('  x'), chunk_size=1)
+        with self.assertRaisesRegex(ValueError, "found 'x'"):
+            stream.expect('{')
+
+
+class IterMetricsFileTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory.name, name)
+
+    def test_entries_in_file_order(self):
+        metrics = document([record('alice/a', '1', 1), record('alice/b', '2', 2)], '2026-01-01')
+        with open(self.path('m.json'), 'w') as f:
+            json.dump(metrics, f, indent=2)
+        self.assertEqual(list(iter_metrics_file(self.path('m.json'))), [
+            ('repositories', metrics['repositories'][0]),
+            ('repositories', metrics['repositories'][1]),
+            ('summary', {}),
+            ('timestamp', '2026-01-01'),
+            ('user_info', metrics['user_info']),
+        ])
+
+    def test_empty_documents(self):
+        for text, expected in (('{}', []), ('{"repositories": []}', []),
+                               ('{"repositories": [], "timestamp": "t"}', [('timestamp', 't')])):
+            with self.subTest(text=text):
+                with open(self.path('m.json'), 'w') as f:
+                    f.write(text)
+                self.assertEqual(list(iter_metrics_file(self.path('m.json'))), expected)
+
+    def test_ndjson_holds_records_only(self):
+        with open(self.path('m.ndjson'), 'w') as f:
+            f.write(json.dumps(record('alice/a', '1', 1)) + '\n\n' + json.dumps(record('alice/b', '2', 2)) + '\n')
+        self.assertEqual([key for key, _ in iter_metrics_file(self.path('m.ndjson'))], ['repositories'] * 2)
+
+    def test_not_a_metrics_document(self):
+        with open(self.path('m.json'), 'w') as f:
+            f.write('[1, 2]')
+        with self.assertRaises(ValueError):
+            list(iter_metrics_file(self.path('m.json')))
+
+
+class MergeMetricsTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name: str, metrics: dict) -> str:
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w') as f:
+            json.dump(metrics, f, indent=2)
+        return path
+
+    def merge(self, paths):
+        output = os.path.join(self.directory.name, 'merged.json')
+        with redirect_stdout(io.StringIO()):
+            metrics = merge_metrics(paths, [JSONRecordWriter(output)])
+        with open(output) as f:
+            return metrics, json.load(f)
+
+    def test_newest_record_of_each_repository_is_kept(self):
+        first = self.write('1.json', document(
+            [record('alice/a', '2026-01-01T00:00:00', 1), record('alice/b', '2026-01-02T00:00:00', 2)], '2026-01-02'))
+        second = self.write('2.json', document(
+            [record('alice/a', '2026-01-03T00:00:00', 10), record('alice/c', '2026-01-01T00:00:00', 3)], '2026-01-03'))
+        metrics, merged = self.merge([first, second])
+
+        self.assertEqual([r['repository'] for r in merged['repositories']], ['alice/b', 'alice/a', 'alice/c'])
+        self.assertEqual(merged['repositories'][1]['basic']['stargazers_count'], 10)
+        self.assertEqual(merged['summary']['total_stars'], 15)
+        self.assertEqual(merged['timestamp'], '2026-01-03')
+        self.assertEqual(merged['user_info']['basic_info']['login'], 'alice')
+        self.assertEqual(metrics['repositories'], [])
+
+    def test_later_file_wins_ties(self):
+        first = self.write('1.json', document([record('alice/a', 't', 1)], 't'))
+        second = self.write('2.json', document([record('alice/a', 't', 2)], 't'))
+        _, merged = self.merge([first, second])
+        self.assertEqual([r['basic']['stargazers_count'] for r in merged['repositories']], [2])
+
+    def test_missing_or_null_timestamps_are_ignored(self):
+        first = self.write('1.json', document([record('alice/a', '2026-01-01T00:00:00', 1)], None))
+        second = self.write('2.json', {'repositories': [record('alice/a', None, 2), record('alice/b', None, 3)]})
+        third = self.write('3.json', document([record('alice/b', '2026-01-01T00:00:00', 4)], '2026-01-02'))
+        _, merged = self.merge([first, second, third])
+        self.assertEqual(merged['timestamp'], '2026-01-02')
+        self.assertEqual([r['basic']['stargazers_count'] for r in merged['repositories']], [1, 4])
+
+        _, merged = self.merge([second])
+        self.assertTrue(merged['timestamp'])
+
+    def test_user_info_of_different_accounts_is_dropped(self):
+        first = self.write('1.json', document([record('alice/a', 't', 1)], 't', login='alice'))
+        second = self.write('2.json', document([record('bob/a', 't', 1)], 't', login='bob'))
+        _, merged = self.merge([first, second])
+        self.assertEqual(merged['user_info'], {})
+        self.assertEqual(len(merged['repositories']), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Tests for fetching the pages of a listing concurrently (--page-concurrency)."""
+
+import io
+import os
+import sys
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from fake_api import FakeTransport, paged  # noqa: E402
+from github_metrics_tracker import GitHubMetricsTracker  # noqa: E402
+
+URL = 'https://api.github.com/repos/alice/a/contributors'
+ITEMS = [{'login': f'user-{k}'} for k in range(730)]
+
+
+class SlowListing:
+    """A listing whose early pages answer last, counting the requests in flight."""
+
+    def __init__(self, link: bool = True, fail_page: int = 0):
+        self.link = link
+        self.fail_page = fail_page
+        self.in_flight = 0
+        self.most_in_flight = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, method, path, query, headers, body):
+        page = int(query['page'])
+        with self.lock:
+            self.in_flight += 1
+            self.most_in_flight = max(self.most_in_flight, self.in_flight)
+        try:
+            if page > 1:
+                time.sleep(0.02 / page)
+            if page == self.fail_page:
+                return 502, {'message': 'Bad Gateway'}, {}
+            status, items, headers = paged(path, query, ITEMS)
+            if not self.link:
+                headers.pop('Link', None)
+            return status, items, headers
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+class PageFanOutTests(unittest.TestCase):
+    def fetch(self, listing: SlowListing, page_concurrency: int = 4):
+        transport = FakeTransport(listing)
+        tracker = GitHubMetricsTracker(token='x', transport=transport, page_concurrency=page_concurrency)
+        try:
+            with redirect_stdout(io.StringIO()):
+                return tracker._get_all_pages(URL), transport
+        finally:
+            tracker.close()
+
+    def test_pages_are_reassembled_in_order(self):
+        listing = SlowListing()
+        items, transport = self.fetch(listing)
+        self.assertEqual(items, ITEMS)
+        self.assertEqual(sorted(int(query['page']) for _, _, query, _ in transport.requests), list(range(1, 9)))
+        self.assertGreater(listing.most_in_flight, 1)
+
+    def test_concurrency_is_bounded_per_host(self):
+        listing = SlowListing()
+        self.assertEqual(self.fetch(listing, page_concurrency=2)[0], ITEMS)
+        self.assertLessEqual(listing.most_in_flight, 2)
+
+    def test_without_link_header_pages_are_fetched_until_a_short_one(self):
+        listing = SlowListing(link=False)
+        items, transport = self.fetch(listing)
+        self.assertEqual(items, ITEMS)
+        self.assertEqual(listing.most_in_flight, 1)
+        self.assertEqual(len(transport.requests), 8)
+
+    def test_failed_page_ends_the_listing(self):
+        items, _ = self.fetch(SlowListing(fail_page=4))
+        self.assertEqual(items, ITEMS[:300])
+
+    def test_last_page_of_the_link_header(self):
+        parse = GitHubMetricsTracker._parse_last_page
+        self.assertEqual(parse('<https://x/y?per_page=100&page=2>; rel="next", '
+                               '<https://x/y?per_page=100&page=17>; rel="last"'), 17)
+        self.assertIsNone(parse('<https://x/y?page=2>; rel="next"'))
+        self.assertIsNone(parse('<https://x/y?page=z>; rel="last"'))
+        self.assertIsNone(parse(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
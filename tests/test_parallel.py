@@ -0,0 +1,56 @@
+"""Tests for collecting several repositories at once (--workers)."""
+
+import io
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from fake_api import FakeGitHub, without_times  # noqa: E402
+from github_metrics_tracker import GitHubMetricsTracker  # noqa: E402
+
+
+class ParallelCollectionTests(unittest.TestCase):
+    def setUp(self):
+        self.api = FakeGitHub(count=12)
+
+    def track(self, workers: int) -> dict:
+        tracker = GitHubMetricsTracker(token='x', workers=workers, transport=self.api.transport(), stats_deadline=0)
+        try:
+            with redirect_stdout(io.StringIO()):
+                return tracker.track_all_repositories()
+        finally:
+            tracker.close()
+
+    def test_workers_match_a_sequential_run(self):
+        sequential = self.track(1)
+        parallel = self.track(4)
+        self.assertEqual([r['repository'] for r in parallel['repositories']],
+                         [repo['full_name'] for repo in self.api.repositories])
+        self.assertEqual(without_times(parallel), without_times(sequential))
+
+    def test_failing_endpoint_only_affects_its_repository(self):
+        self.api.fail.add('/repos/alice/repo-3/languages')
+        metrics = self.track(4)
+        languages = {r['repository']: r['languages'] for r in metrics['repositories']}
+        self.assertEqual(languages.pop('alice/repo-3'), {})
+        self.assertTrue(all(languages.values()))
+
+    def test_collection_stays_a_bounded_window_ahead(self):
+        transport = self.api.transport()
+        tracker = GitHubMetricsTracker(token='x', workers=2, transport=transport, stats_deadline=0)
+        try:
+            with redirect_stdout(io.StringIO()):
+                records = tracker.iter_repository_metrics()
+                self.assertEqual(next(records)['repository'], 'alice/repo-0')
+                started = {path.split('/')[3] for path in transport.paths() if path.startswith('/repos/')}
+                records.close()
+        finally:
+            tracker.close()
+        # Twice the workers in flight, plus the one submitted when the first was taken
+        self.assertLessEqual(len(started), 2 * 2 + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+"""Tests for the running summary available mid-run (--partial-summary)."""
+
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from fake_api import FakeGitHub  # noqa: E402
+from github_metrics_tracker import GitHubMetricsTracker  # noqa: E402
+
+
+class PartialSummaryTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'partial.json')
+        self.tracker = GitHubMetricsTracker(token='x', transport=FakeGitHub(count=5).transport(), stats_deadline=0,
+                                            partial_summary_path=self.path, partial_summary_every=2,
+                                            aggregates=['stars:max'])
+
+    def tearDown(self):
+        self.tracker.close()
+        self.directory.cleanup()
+
+    def read(self) -> dict:
+        with open(self.path) as f:
+            return json.load(f)
+
+    def test_summary_is_written_as_the_run_goes(self):
+        seen = []
+        with redirect_stdout(io.StringIO()):
+            for repo_metrics in self.tracker.iter_repository_metrics():
+                seen.append(repo_metrics['basic']['stargazers_count'])
+                summary = self.tracker.partial_summary()
+                self.assertEqual(summary['total_repositories'], len(seen))
+                self.assertEqual(summary['total_stars'], sum(seen))
+                self.assertEqual(summary['aggregates'], {'stars': {'max': max(seen)}})
+                if len(seen) == 3:
+                    document = self.read()
+                    self.assertEqual((document['repositories_collected'], document['repositories_total'],
+                                      document['complete']), (2, 5, False))
+                    self.assertEqual(document['run_timestamp'], self.tracker.metrics['timestamp'])
+
+        document = self.read()
+        self.assertTrue(document['complete'])
+        self.assertEqual(document['repositories_collected'], 5)
+        self.assertEqual(document['summary'], self.tracker.partial_summary())
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+
+    def test_summary_matches_the_final_one(self):
+        with redirect_stdout(io.StringIO()):
+            metrics = self.tracker.track_all_repositories()
+        self.assertEqual(self.read()['summary'], metrics['summary'])
+
+    def test_interrupted_run_is_marked_incomplete(self):
+        with redirect_stdout(io.StringIO()):
+            records = self.tracker.iter_repository_metrics()
+            next(records)
+            records.close()
+        document = self.read()
+        self.assertFalse(document['complete'])
+        self.assertEqual(document['repositories_collected'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+"""Tests for RateLimitGovernor, which paces requests against the rate limit budgets."""
+
+import io
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from fake_api import FakeTransport, make_response  # noqa: E402
+from github_metrics_tracker import GitHubMetricsTracker, RateLimitGovernor  # noqa: E402
+
+
+class FakeClock:
+    """Stands in for the time module: sleeping moves the clock instead of waiting."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+        self.slept = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class GovernorTestCase(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch('github_metrics_tracker.time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.governor = RateLimitGovernor(burst=10, pace_below=0.5)
+
+
+class RateLimitGovernorTests(GovernorTestCase):
+    def test_buckets(self):
+        self.assertEqual(RateLimitGovernor.bucket_for('https://api.github.com/repos/a/b'), 'core')
+        self.assertEqual(RateLimitGovernor.bucket_for('https://api.github.com/search/issues?q=x'), 'search')
+        self.assertEqual(RateLimitGovernor.bucket_for('https://api.github.com/graphql'), 'graphql')
+
+    def test_update_reads_the_rate_limit_headers(self):
+        charged = self.governor.update('core', {'X-RateLimit-Resource': 'code_search', 'X-RateLimit-Remaining': '9',
+                                                'X-RateLimit-Reset': '2000', 'X-RateLimit-Limit': '10'})
+        self.assertEqual(charged, 'code_search')
+        self.assertEqual(self.governor.remaining('code_search'), 9)
+        self.assertIsNone(self.governor.remaining('core'))
+        # Headers that do not parse leave the budget alone
+        self.governor.update('core', {'X-RateLimit-Remaining': 'many', 'X-RateLimit-Reset': '2000'})
+        self.assertIsNone(self.governor.remaining('core'))
+
+    def test_requests_are_not_paced_while_the_budget_is_high(self):
+        self.governor.set_budget('core', 4000, self.clock.now + 100, limit=5000)
+        for _ in range(50):
+            self.governor.acquire('core')
+        self.assertEqual(self.clock.slept, [])
+        self.assertEqual(self.governor.remaining('core'), 3950)
+
+    def test_low_budget_is_spread_until_the_reset(self):
+        # 100 requests left for 100 seconds: a burst of 10, then one request a second
+        self.governor.set_budget('core', 100, self.clock.now + 100, limit=5000)
+        for _ in range(30):
+            self.governor.acquire('core')
+        self.assertAlmostEqual(sum(self.clock.slept), 20, delta=1)
+        self.assertTrue(all(seconds <= 1.01 for seconds in self.clock.slept))
+
+    def test_exhausted_budget_waits_for_the_reset(self):
+        self.governor.set_budget('search', 0, self.clock.now + 30, limit=30)
+        with redirect_stdout(io.StringIO()):
+            self.governor.acquire('search')
+        self.assertEqual(self.clock.slept, [31])
+        self.assertEqual(self.governor.available('core'), (True, float('inf')))
+
+
+class BackoffTests(GovernorTestCase):
+    def backoff(self, status: int, headers=None, body=None):
+        return self.governor.backoff('core', make_response('https://api.github.com/x', status, body, headers))
+
+    def test_not_rate_limited(self):
+        self.assertIsNone(self.backoff(200))
+        self.assertIsNone(self.backoff(403, body={'message': 'Resource not accessible by integration'}))
+        self.assertTrue(self.governor.available('core')[0])
+
+    def test_retry_after(self):
+        self.assertEqual(self.backoff(429, {'Retry-After': '30'}), 30.0)
+        self.assertEqual(self.governor.available('core')[0], False)
+        self.clock.now += 30
+        self.assertEqual(self.governor.available('core')[0], True)
+
+    def test_exhausted_primary_limit(self):
+        self.assertEqual(self.backoff(403, {'X-RateLimit-Remaining': '0',
+                                            'X-RateLimit-Reset': str(self.clock.now + 90)}), 91)
+
+    def test_secondary_limit_without_retry_after(self):
+        self.assertEqual(self.backoff(403, body={'message': 'You have exceeded a secondary rate limit'}), 60.0)
+
+
+class SendRetryTests(GovernorTestCase):
+    def test_rate_limited_request_is_retried_after_the_wait(self):
+        answers = [(429, {'message': 'slow down'}, {'Retry-After': '5'}), (200, {'ok': True}, {})]
+        transport = FakeTransport(lambda method, path, query, headers, body: answers.pop(0))
+        tracker = GitHubMetricsTracker(token='x', transport=transport)
+        try:
+            with redirect_stdout(io.StringIO()) as output:
+                self.assertEqual(tracker._make_request('https://api.github.com/repos/a/b'), {'ok': True})
+        finally:
+            tracker.close()
+        self.assertEqual(len(transport.requests), 2)
+        self.assertEqual(self.clock.slept, [5])
+        self.assertIn('Waiting 5 seconds', output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+"""Tests for the record writers used by --stream and merge."""
+
+import csv
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from github_metrics_tracker import (  # noqa: E402
+    CSVRecordWriter, HTMLReportWriter, JSONRecordWriter, NDJSONRecordWriter, close_record_writers,
+    create_record_writers
+)
+
+
+def record(index: int) -> dict:
+    name = f'alice/repo-{index}'
+    return {'repository': name, 'collected_at': 't',
+            'basic': {'full_name': name, 'stargazers_count': index, 'forks_count': 1, 'description': '<b>'},
+            'issues': {'open_count': 2}, 'commit_activity': {'total_commits_last_year': 3, 'weekly_activity': []}}
+
+
+METRICS = {'repositories': [], 'summary': {'total_repositories': 3, 'total_stars': 3},
+           'timestamp': '2026-01-01T00:00:00+00:00', 'user_info': {'basic_info': {'login': 'alice'}}}
+
+
+class RecordWriterTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory.name, name)
+
+    def run_writers(self, writers, records, completed: bool = True):
+        for repo_metrics in records:
+            for writer in writers:
+                writer.write(repo_metrics)
+        with redirect_stdout(io.StringIO()):
+            close_record_writers(writers, METRICS, completed)
+
+    def test_json_matches_json_dump(self):
+        records = [record(index) for index in range(3)]
+        self.run_writers([JSONRecordWriter(self.path('m.json'))], records)
+        with open(self.path('m.json')) as f:
+            self.assertEqual(f.read(), json.dumps(dict(METRICS, repositories=records), indent=2))
+
+    def test_json_without_records(self):
+        self.run_writers([JSONRecordWriter(self.path('m.json'))], [])
+        with open(self.path('m.json')) as f:
+            self.assertEqual(f.read(), json.dumps(METRICS, indent=2))
+
+    def test_ndjson_and_csv(self):
+        records = [record(index) for index in range(3)]
+        self.run_writers([NDJSONRecordWriter(self.path('m.ndjson')), CSVRecordWriter(self.path('m.csv'))], records)
+        with open(self.path('m.ndjson')) as f:
+            self.assertEqual([json.loads(line) for line in f], records)
+        with open(self.path('m.csv'), newline='') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual([row['repository'] for row in rows], [r['repository'] for r in records])
+        self.assertEqual(rows[2]['stars'], '2')
+        self.assertEqual(rows[2]['open_prs'], '')
+
+    def test_failed_run_keeps_the_previous_outputs(self):
+        self.run_writers(create_record_writers(self.path('m'), 'all', html_page_size=2, html_detail_pages=True),
+                         [record(index) for index in range(3)])
+        before = {name: open(self.path(name), 'rb').read() for name in os.listdir(self.directory.name)
+                  if os.path.isfile(self.path(name))}
+
+        writers = create_record_writers(self.path('m'), 'all', html_page_size=2, html_detail_pages=True)
+        self.run_writers(writers, [record(index) for index in range(5, 10)], completed=False)
+
+        after = {name: open(self.path(name), 'rb').read() for name in os.listdir(self.directory.name)
+                 if os.path.isfile(self.path(name))}
+        self.assertEqual(after, before)
+        self.assertEqual(sorted(os.listdir(self.path('m_report_repos'))),
+                         [HTMLReportWriter.detail_filename(f'alice/repo-{index}') for index in range(3)])
+        self.assertFalse([name for name in os.listdir(self.directory.name) if name.endswith('.tmp')])
+
+    def test_completed_run_replaces_the_previous_outputs(self):
+        self.run_writers(create_record_writers(self.path('m'), 'all', html_page_size=1, html_detail_pages=True),
+                         [record(index) for index in range(3)])
+        self.run_writers(create_record_writers(self.path('m'), 'all', html_page_size=1, html_detail_pages=True),
+                         [record(7)])
+
+        with open(self.path('m.json')) as f:
+            self.assertEqual([r['repository'] for r in json.load(f)['repositories']], ['alice/repo-7'])
+        # The pages and detail pages of the longer previous report are gone
+        self.assertEqual(sorted(name for name in os.listdir(self.directory.name) if '_page_' in name),
+                         ['m_report_page_1.html'])
+        self.assertEqual(os.listdir(self.path('m_report_repos')), [HTMLReportWriter.detail_filename('alice/repo-7')])
+        self.assertFalse([name for name in os.listdir(self.directory.name) if name.endswith(('.tmp', '.old'))])
+
+    def test_html_escapes_and_paginates(self):
+        writer = HTMLReportWriter(self.path('r.html'), page_size=2)
+        self.run_writers([writer], [record(index) for index in range(5)])
+        with open(self.path('r.html')) as f:
+            report = f.read()
+        self.assertIn('r_page_3.html', report)
+        self.assertNotIn('<b>', report)
+        with open(self.path('r_page_3.html')) as f:
+            last_page = f.read()
+        self.assertIn('alice/repo-4', last_page)
+        self.assertIn('&lt;b&gt;', last_page)
+        self.assertNotIn('Next', last_page)
+
+
+if __name__ == '__main__':
+    unittest.main()
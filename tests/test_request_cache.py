@@ -0,0 +1,91 @@
+"""Tests for the conditional request cache (--cache)."""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from fake_api import FakeTransport, paged  # noqa: E402
+from github_metrics_tracker import ConditionalRequestCache, GitHubMetricsTracker  # noqa: E402
+
+ITEMS = [{'name': f'v{k}'} for k in range(250)]
+
+
+def handler(method, path, query, headers, body):
+    """Tags of alice/a, paged, with an ETag per page that never changes."""
+    etag = f'"page-{query.get("page", "1")}"'
+    if headers.get('If-None-Match') == etag:
+        return 304, None, {'ETag': etag}
+    status, items, response_headers = paged(path, query, ITEMS)
+    response_headers['ETag'] = etag
+    return status, items, response_headers
+
+
+class ConditionalRequestCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'cache', 'responses.sqlite')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_validators_of_stored_responses(self):
+        cache = ConditionalRequestCache(self.path)
+        cache.store('etag', {'ETag': '"a"'}, [1])
+        cache.store('date', {'Last-Modified': 'Thu, 01 Jan 2026 00:00:00 GMT'}, [2])
+        cache.store('none', {}, [3])
+        self.assertEqual(cache.validators('etag'), {'If-None-Match': '"a"'})
+        self.assertEqual(cache.validators('date'), {'If-Modified-Since': 'Thu, 01 Jan 2026 00:00:00 GMT'})
+        self.assertEqual(cache.validators('none'), {})
+        self.assertIsNone(cache.get('none'))
+        cache.close()
+
+    def test_entries_persist_with_their_link_header(self):
+        cache = ConditionalRequestCache(self.path)
+        cache.store('k', {'ETag': '"a"', 'Link': '<u?page=2>; rel="next"', 'X-Other': 'dropped'}, {'a': 1})
+        cache.close()
+        cache = ConditionalRequestCache(self.path)
+        self.assertEqual(cache.get('k'), ({'a': 1}, {'Link': '<u?page=2>; rel="next"'}))
+        self.assertEqual(cache.hit_rate(), 1.0)
+        cache.close()
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = ConditionalRequestCache(self.path, max_bytes=25)
+        clock = iter(range(100))
+        with mock.patch('github_metrics_tracker.time.time', lambda: next(clock)):
+            cache.store('a', {'ETag': '"a"'}, 'x' * 8)
+            cache.store('b', {'ETag': '"b"'}, 'y' * 8)
+            cache.get('a')
+            cache.store('c', {'ETag': '"c"'}, 'z' * 8)
+        self.assertEqual([key for key in 'abc' if cache.validators(key)], ['a', 'c'])
+        # A body larger than the whole cache is not stored
+        cache.store('d', {'ETag': '"d"'}, 'w' * 40)
+        self.assertEqual(cache.validators('d'), {})
+        cache.close()
+
+    def test_second_run_is_served_by_not_modified_responses(self):
+        results = []
+        for _ in range(2):
+            transport = FakeTransport(handler)
+            cache = ConditionalRequestCache(self.path)
+            tracker = GitHubMetricsTracker(token='x', transport=transport, cache=cache, page_concurrency=1)
+            tracker.token_pool.identities[0] = 'user:alice'
+            try:
+                with redirect_stdout(io.StringIO()):
+                    results.append(tracker._get_all_pages('https://api.github.com/repos/alice/a/tags'))
+                statuses = [headers.get('If-None-Match') for _, _, _, headers in transport.requests]
+            finally:
+                tracker.close()
+        self.assertEqual(results[0], ITEMS)
+        self.assertEqual(results[1], ITEMS)
+        # Every page of the second run was revalidated, including the ones found through the cached Link header
+        self.assertEqual(statuses, ['"page-1"', '"page-2"', '"page-3"'])
+        self.assertEqual(cache.hits, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""Tests for splitting a run across runners (--shard)."""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from github_metrics_tracker import parse_shard, shard_repositories  # noqa: E402
+
+
+def listing(count: int, seed: int = 0):
+    sizes = random.Random(seed)
+    return [{'full_name': f'owner/repo-{i}', 'size': sizes.choice([0, 10, 5000, 2 ** 20])} for i in range(count)]
+
+
+class ParseShardTests(unittest.TestCase):
+    def test_valid(self):
+        self.assertEqual(parse_shard('2/4'), (2, 4))
+        self.assertEqual(parse_shard('1/1'), (1, 1))
+
+    def test_invalid(self):
+        for spec in ('0/4', '5/4', '2', 'a/b', '2/4/8', ''):
+            with self.subTest(spec=spec):
+                with self.assertRaises(ValueError):
+                    parse_shard(spec)
+
+
+class ShardRepositoriesTests(unittest.TestCase):
+    def test_shards_partition_the_listing(self):
+        repos = listing(200)
+        for count in (1, 2, 3, 7):
+            with self.subTest(count=count):
+                names = [repo['full_name'] for index in range(1, count + 1)
+                         for repo in shard_repositories(repos, index, count)]
+                self.assertEqual(sorted(names), sorted(repo['full_name'] for repo in repos))
+
+    def test_partition_ignores_listing_order(self):
+        repos = listing(100)
+        shuffled = list(repos)
+        random.Random(1).shuffle(shuffled)
+        for index in (1, 2, 3):
+            self.assertEqual({repo['full_name'] for repo in shard_repositories(repos, index, 3)},
+                             {repo['full_name'] for repo in shard_repositories(shuffled, index, 3)})
+
+    def test_shard_keeps_listing_order(self):
+        repos = listing(50)
+        selected = shard_repositories(repos, 1, 2)
+        self.assertEqual(selected, [repo for repo in repos if repo in selected])
+
+    def test_shards_have_similar_weight(self):
+        repos = listing(400)
+        weights = [sum(1 + (repo['size'] or 0).bit_length() for repo in shard_repositories(repos, index, 4))
+                   for index in range(1, 5)]
+        self.assertLess(max(weights) - min(weights), 2 * 22)
+
+    def test_added_repository_only_moves_neighbours(self):
+        repos = listing(300)
+        before = {index: {r['full_name'] for r in shard_repositories(repos, index, 4)} for index in range(1, 5)}
+        after = {index: {r['full_name'] for r in shard_repositories(repos + [{'full_name': 'owner/new', 'size': 0}],
+                                                                     index, 4)}
+                 for index in range(1, 5)}
+        moved = sum(len(before[index] - after[index]) for index in before)
+        self.assertLessEqual(moved, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+"""Tests for the sharded, precompressed dashboard files (--format shards)."""
+
+import gzip
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from github_metrics_tracker import ShardedJSONWriter  # noqa: E402
+
+
+def record(name: str, stars: int, collected_at: str = '2026-01-01T00:00:00+00:00') -> dict:
+    return {'repository': name, 'collected_at': collected_at,
+            'basic': {'stargazers_count': stars, 'forks_count': 1, 'language': 'Go'}}
+
+
+def metrics(timestamp: str = '2026-01-01T00:00:00+00:00') -> dict:
+    return {'timestamp': timestamp, 'summary': {'total_stars': 3}, 'user_info': {'basic_info': {'login': 'alice'}}}
+
+
+class ShardedJSONWriterTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.directory.name, 'data')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def load(self, name: str):
+        with open(os.path.join(self.output, name), 'rb') as f:
+            data = f.read()
+        with open(os.path.join(self.output, name + '.gz'), 'rb') as f:
+            self.assertEqual(gzip.decompress(f.read()), data)
+        return json.loads(data), data
+
+    def write(self, records, run=None):
+        writer = ShardedJSONWriter(self.output)
+        for repo_metrics in records:
+            writer.write(repo_metrics)
+        writer.close(run or metrics())
+
+    def test_layout_and_hashes(self):
+        self.write([record('alice/a', 1), record('alice/b', 2)])
+        with open(os.path.join(self.output, 'manifest.json')) as f:
+            manifest = json.load(f)
+        self.assertEqual(manifest['repositories'], 2)
+        for name in ('summary.json', 'repos.json'):
+            _, data = self.load(name)
+            self.assertEqual(manifest['files'][name]['hash'], ShardedJSONWriter.content_hash(data))
+            self.assertEqual(manifest['files'][name]['bytes'], len(data))
+
+        index, _ = self.load('repos.json')
+        self.assertEqual([(entry['name'], entry['stars'], entry['shard']) for entry in index['repositories']],
+                         [('alice/a', 1, 'repos/alice__a.json'), ('alice/b', 2, 'repos/alice__b.json')])
+        shard, _ = self.load('repos/alice__b.json')
+        self.assertEqual(shard, record('alice/b', 2))
+        summary, _ = self.load('summary.json')
+        self.assertEqual(summary['summary'], {'total_stars': 3})
+        self.assertFalse([name for name in os.listdir(self.output) if name.endswith('.tmp')])
+
+    def test_unchanged_repository_keeps_its_hash(self):
+        self.write([record('alice/a', 1), record('alice/b', 2)])
+        first, _ = self.load('repos.json')
+        self.write([record('alice/a', 1, '2026-01-02T00:00:00+00:00'), record('alice/b', 3)],
+                   metrics('2026-01-02T00:00:00+00:00'))
+        second, _ = self.load('repos.json')
+        hashes = [[entry['hash'] for entry in index['repositories']] for index in (first, second)]
+        self.assertEqual(hashes[0][0], hashes[1][0])
+        self.assertNotEqual(hashes[0][1], hashes[1][1])
+
+    def test_shards_of_repositories_no_longer_listed_are_removed(self):
+        self.write([record('alice/a', 1), record('alice/b', 2)])
+        self.write([record('alice/b', 2)])
+        self.assertEqual(sorted(os.listdir(os.path.join(self.output, 'repos'))),
+                         ['alice__b.json', 'alice__b.json.gz'])
+
+    def test_abort_keeps_the_published_run(self):
+        self.write([record('alice/a', 1)])
+        writer = ShardedJSONWriter(self.output)
+        writer.write(record('alice/c', 5))
+        writer.abort()
+        index, _ = self.load('repos.json')
+        self.assertEqual([entry['name'] for entry in index['repositories']], ['alice/a'])
+        self.assertTrue(os.path.exists(os.path.join(self.output, 'repos', 'alice__a.json')))
+
+
+if __name__ == '__main__':
+    unittest.main()
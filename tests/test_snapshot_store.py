@@ -0,0 +1,154 @@
+"""Tests for the snapshot history (--snapshot-db) and its time-series queries."""
+
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from fake_api import FakeGitHub  # noqa: E402
+from github_metrics_tracker import GitHubMetricsTracker, SnapshotRecordWriter, SnapshotStore  # noqa: E402
+
+WEEK = 604800
+FIRST_WEEK = 1767225600  # Thursday 2026-01-01 00:00 UTC; any week start will do
+
+
+def record(stars: int, weeks: int = 3) -> dict:
+    return {
+        'repository': 'alice/a',
+        'basic': {'stargazers_count': stars, 'forks_count': 1},
+        'issues': {'open_count': 4},
+        'commit_activity': {'total_commits_last_year': 3 * weeks,
+                            'weekly_activity': [{'days': [0, 1, 2, 0, 0, 0, 0], 'total': 3,
+                                                 'week': FIRST_WEEK + k * WEEK} for k in range(weeks)]},
+        'code_frequency': {'weekly_data': [[FIRST_WEEK + k * WEEK, 10, -4] for k in range(weeks)]},
+    }
+
+
+def run(timestamp: str, stars: int) -> dict:
+    return {'timestamp': timestamp, 'repositories': [record(stars)], 'summary': {'total_stars': stars},
+            'user_info': {'basic_info': {'login': 'alice'}}}
+
+
+class SnapshotStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = SnapshotStore(os.path.join(self.directory.name, 'history.sqlite'))
+        for day, stars in ((1, 10), (2, 12), (3, 15)):
+            self.store.record(run(f'2026-03-0{day}T12:00:00.250000+00:00', stars))
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def stars(self, since=None, until=None):
+        return [value for _, value in self.store.repository_series('alice/a', 'stars', since, until)]
+
+    def test_series_oldest_first(self):
+        self.assertEqual(self.stars(), [10, 12, 15])
+        self.assertEqual([value for _, value in self.store.total_series('total_stars')], [10, 12, 15])
+        self.assertEqual(self.store.repositories(), ['alice/a'])
+
+    def test_date_bounds(self):
+        self.assertEqual(self.stars(since='2026-03-02'), [12, 15])
+        # A date alone as until covers the whole day
+        self.assertEqual(self.stars(until='2026-03-02'), [10, 12])
+        self.assertEqual(self.stars(since='2026-03-02', until='2026-03-02'), [12])
+
+    def test_timestamp_bounds_with_offsets(self):
+        self.assertEqual(self.stars(since='2026-03-02T12:00:00.250000Z'), [12, 15])
+        self.assertEqual(self.stars(since='2026-03-02T12:00:01Z'), [15])
+        # 08:00 at UTC-4 is 12:00 UTC
+        self.assertEqual(self.stars(until='2026-03-02T08:00:00-04:00'), [10])
+        self.assertEqual(self.stars(until='2026-03-02T09:00:00-04:00'), [10, 12])
+        self.assertEqual(self.stars(since='2026-03-02T14:00:00+02:00', until='2026-03-02T12:01:00'), [12])
+        self.assertEqual([value for _, value in self.store.total_series(
+            'total_stars', since='2026-03-02T13:00:00+01:00', until='2026-03-03T11:00:00.000000Z')], [12])
+
+    def test_non_utc_run_timestamps_are_normalized(self):
+        self.store.record(run('2026-03-04T02:00:00+05:00', 20))
+        self.assertEqual(self.store.repository_series('alice/a', 'stars', since='2026-03-03T21:00:00Z'),
+                         [('2026-03-03T21:00:00+00:00', 20)])
+
+    def test_recording_a_run_twice_keeps_one_run(self):
+        self.store.record(run('2026-03-03T12:00:00.250000+00:00', 15))
+        self.assertEqual(self.stars(), [10, 12, 15])
+
+    def test_weekly_series_stores_each_week_once(self):
+        self.assertEqual(self.store.weekly_series('alice/a'),
+                         [(FIRST_WEEK + k * WEEK, 3) for k in range(3)])
+        self.assertEqual(self.store.weekly_series('alice/a', 'deletions')[0], (FIRST_WEEK, 4))
+        self.assertEqual(self.store.weekly_days('alice/a', FIRST_WEEK), [0, 1, 2, 0, 0, 0, 0])
+        self.assertIsNone(self.store.weekly_days('alice/a', 0))
+
+    def test_weekly_series_bounds(self):
+        self.assertEqual([week for week, _ in self.store.weekly_series('alice/a', since='2026-01-02')],
+                         [FIRST_WEEK + WEEK, FIRST_WEEK + 2 * WEEK])
+        self.assertEqual([week for week, _ in self.store.weekly_series('alice/a', until='2026-01-08')],
+                         [FIRST_WEEK, FIRST_WEEK + WEEK])
+        self.assertEqual([week for week, _ in self.store.weekly_series(
+            'alice/a', since='2025-12-31T19:00:00-05:00', until='2026-01-01T00:00:00Z')], [FIRST_WEEK])
+
+    def test_unknown_fields(self):
+        with self.assertRaises(ValueError):
+            self.store.repository_series('alice/a', 'nope')
+        with self.assertRaises(ValueError):
+            self.store.weekly_series('alice/a', 'nope')
+        with self.assertRaises(ValueError):
+            self.stars(since='yesterday')
+
+    def test_record_writer_streams_into_one_run(self):
+        writer = SnapshotRecordWriter(self.store, '2026-03-05T00:00:00+00:00')
+        writer.write(record(30))
+        writer.close({'timestamp': '2026-03-05T00:00:00+00:00', 'summary': {'total_stars': 30}})
+        self.assertEqual(self.stars(since='2026-03-05'), [30])
+        self.assertEqual([value for _, value in self.store.total_series('total_stars', since='2026-03-05')], [30])
+
+
+
+class WeeklyStorageTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = SnapshotStore(os.path.join(self.directory.name, 'history.sqlite'))
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_weeks_repeated_by_later_runs_are_stored_once(self):
+        for day in (1, 2, 3):
+            self.store.record(run(f'2026-03-0{day}T00:00:00+00:00', 10))
+        latest = record(10, weeks=4)
+        latest['commit_activity']['weekly_activity'][0]['total'] = 5
+        self.store.record(dict(run('2026-03-04T00:00:00+00:00', 10), repositories=[latest]))
+        self.assertEqual(self.store._db.execute('SELECT COUNT(*) FROM weekly').fetchone()[0], 3 * 4)
+        self.assertEqual(self.store.weekly_series('alice/a')[0], (FIRST_WEEK, 5))
+
+    def test_daily_counts_are_packed_as_int32(self):
+        short = record(1, weeks=1)
+        short['commit_activity']['weekly_activity'][0]['days'] = [4, 2]
+        self.store.record(dict(run('2026-03-01T00:00:00+00:00', 1), repositories=[short]))
+        blob = self.store._db.execute("SELECT days FROM weekly WHERE series = 'commits'").fetchone()[0]
+        self.assertEqual(len(blob), 7 * 4)
+        self.assertEqual(self.store.weekly_days('alice/a', FIRST_WEEK), [4, 2, 0, 0, 0, 0, 0])
+
+    def test_collected_weekly_series_stay_plain_json(self):
+        api = FakeGitHub(count=1)
+        tracker = GitHubMetricsTracker(token='x', transport=api.transport(), stats_deadline=0,
+                                       metrics=['commit_activity', 'code_frequency'])
+        try:
+            with redirect_stdout(io.StringIO()):
+                collected = tracker.collect_all_metrics_for_repo('alice/repo-0')
+        finally:
+            tracker.close()
+        self.assertEqual(json.loads(json.dumps(collected)), collected)
+        self.store.record(dict(run('2026-03-01T00:00:00+00:00', 1), repositories=[collected]))
+        self.assertEqual(len(self.store.weekly_series('alice/repo-0', 'additions')), 52)
+        self.assertEqual(self.store.weekly_days('alice/repo-0', 1700000000), [0, 1, 0, 0, 2, 0, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""Tests for polling the /stats/* endpoints that answer 202 while GitHub computes them."""
+
+import io
+import os
+import sys
+import threading
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import github_metrics_tracker  # noqa: E402
+from fake_api import FakeGitHub, without_times  # noqa: E402
+from github_metrics_tracker import GitHubMetricsTracker, StatsPrefetcher  # noqa: E402
+
+
+class ComputingGitHub(FakeGitHub):
+    """FakeGitHub whose statistics answer 202 a number of times per repository before they are ready."""
+
+    def __init__(self, count: int = 3, computing: int = 2):
+        super().__init__(count)
+        self.computing = {}
+        self.default_computing = computing
+        self.lock = threading.Lock()
+
+    def repository_endpoint(self, index, section, path, query):
+        if section.startswith('stats/'):
+            with self.lock:
+                left = self.computing.setdefault(path, self.computing.get(index, self.default_computing))
+                self.computing[path] = left - 1
+            if left > 0:
+                return 202, {}, {}
+        return super().repository_endpoint(index, section, path, query)
+
+
+class FastPrefetcher(StatsPrefetcher):
+    def __init__(self, tracker, deadline=120.0, endpoints=None):
+        super().__init__(tracker, deadline=deadline, initial_delay=0.01, max_delay=0.02, endpoints=endpoints)
+
+
+class StatsPrefetcherTests(unittest.TestCase):
+    def setUp(self):
+        self.api = ComputingGitHub()
+        self.transport = self.api.transport()
+        self.tracker = GitHubMetricsTracker(token='x', transport=self.transport)
+        self.names = [repo['full_name'] for repo in self.api.repositories]
+
+    def tearDown(self):
+        self.tracker.close()
+
+    def test_pending_statistics_are_polled_until_ready(self):
+        prefetcher = FastPrefetcher(self.tracker, endpoints=['commit_activity'])
+        prefetcher.start(self.names)
+        prefetcher.wait_for('alice/repo-1')
+        self.assertTrue(prefetcher.ready('alice/repo-1'))
+        self.assertEqual(len(prefetcher.pop('alice/repo-1', 'commit_activity')), 52)
+        self.assertIsNone(prefetcher.get('alice/repo-1', 'commit_activity'))
+        prefetcher.finish()
+        prefetcher.wait()
+        prefetcher.close()
+        self.assertEqual(prefetcher.pending_fraction(), 0.0)
+        self.assertEqual(self.transport.paths().count('/repos/alice/repo-0/stats/commit_activity'), 3)
+
+    def test_statistics_still_pending_at_the_deadline_are_given_up(self):
+        self.api.default_computing = 10 ** 6
+        self.api.computing[0] = 0
+        prefetcher = FastPrefetcher(self.tracker, deadline=0.05, endpoints=['participation'])
+        prefetcher.start(self.names)
+        prefetcher.wait_for('alice/repo-0')
+        # The deadline only runs once the collection is done
+        self.assertFalse(prefetcher.ready('alice/repo-1'))
+        prefetcher.finish()
+        prefetcher.wait()
+        prefetcher.close()
+        self.assertTrue(prefetcher.get('alice/repo-0', 'participation'))
+        self.assertIsNone(prefetcher.get('alice/repo-1', 'participation'))
+        self.assertAlmostEqual(prefetcher.pending_fraction(), 2 / 3)
+
+    def test_failed_statistics_are_not_polled_again(self):
+        self.api.fail.add('/repos/alice/repo-0/stats/code_frequency')
+        prefetcher = FastPrefetcher(self.tracker, endpoints=['code_frequency'])
+        with redirect_stdout(io.StringIO()):
+            prefetcher.start(['alice/repo-0'])
+            prefetcher.wait_for('alice/repo-0')
+        prefetcher.close()
+        self.assertIsNone(prefetcher.get('alice/repo-0', 'code_frequency'))
+        self.assertEqual(self.transport.paths().count('/repos/alice/repo-0/stats/code_frequency'), 1)
+
+
+class PrefetchedRunTests(unittest.TestCase):
+    def test_run_with_computing_statistics_matches_ready_ones(self):
+        ready = GitHubMetricsTracker(token='x', transport=FakeGitHub(count=4).transport(), stats_deadline=0)
+        computing = GitHubMetricsTracker(token='x', transport=ComputingGitHub(count=4).transport(), stats_deadline=5)
+        try:
+            with redirect_stdout(io.StringIO()), \
+                    mock.patch.object(github_metrics_tracker, 'StatsPrefetcher', FastPrefetcher):
+                expected = ready.track_all_repositories()
+                metrics = computing.track_all_repositories()
+        finally:
+            ready.close()
+            computing.close()
+        self.assertEqual(without_times(metrics), without_times(expected))
+        self.assertIsNone(computing.stats_prefetcher)
+
+
+if __name__ == '__main__':
+    unittest.main()
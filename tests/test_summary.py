@@ -0,0 +1,80 @@
+"""Tests for the summary engines: ColumnarSummary and the online SummaryAggregator."""
+
+import os
+import random
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import github_metrics_tracker  # noqa: E402
+from github_metrics_tracker import ColumnarSummary, SummaryAggregator, parse_aggregates  # noqa: E402
+
+AGGREGATES = parse_aggregates(['stars:median', 'stars:p90', 'stars:mean', 'forks:max', 'open_issues:min',
+                               'merged_prs:median'])
+
+
+def records(count: int, seed: int = 0):
+    """Records with repeated star counts and sections missing here and there."""
+    rng = random.Random(seed)
+    repos = []
+    for index in range(count):
+        repo = {'repository': f'alice/repo-{index}', 'contributor_count': rng.randrange(5)}
+        if rng.random() > 0.1:
+            repo['basic'] = {'stargazers_count': rng.choice([0, 1, 5, 5, 40]), 'forks_count': rng.randrange(8),
+                             'watchers_count': 1, 'archived': rng.random() < 0.2, 'private': index % 3 == 0,
+                             'fork': index % 7 == 0}
+        repo['issues'] = {'open_count': rng.randrange(20)} if rng.random() > 0.2 else {}
+        repo['languages'] = {rng.choice(['Python', 'C', 'Go']): rng.randrange(1, 1000)}
+        repo['custom'] = {'is_active': rng.random() < 0.5}
+        repo['commit_activity'] = {'total_commits_last_year': rng.randrange(100)}
+        repos.append(repo)
+    return repos
+
+
+def online_summary(repos, aggregates=None):
+    aggregator = SummaryAggregator(aggregates=aggregates)
+    for repo in repos:
+        aggregator.add(repo)
+    return aggregator.summary()
+
+
+class SummaryEngineTests(unittest.TestCase):
+    def test_engines_agree(self):
+        for count in (0, 1, 9, 10, 11, 250):
+            with self.subTest(count=count):
+                repos = records(count, seed=count)
+                expected = online_summary(repos, AGGREGATES)
+                self.assertEqual(ColumnarSummary(repos, AGGREGATES).summary(), expected)
+                with mock.patch.object(github_metrics_tracker, 'numpy', None):
+                    self.assertEqual(ColumnarSummary(repos, AGGREGATES).summary(), expected)
+
+    def test_ties_keep_the_earliest_repository(self):
+        repos = [{'repository': f'alice/{index}', 'basic': {'stargazers_count': 5, 'forks_count': 0}}
+                 for index in range(15)]
+        names = [entry['name'] for entry in ColumnarSummary(repos).summary()['most_starred']]
+        self.assertEqual(names, [f'alice/{index}' for index in range(10)])
+        self.assertEqual([entry['name'] for entry in online_summary(repos)['most_starred']], names)
+
+    def test_sections_not_collected_are_left_out(self):
+        summary = ColumnarSummary([{'repository': 'alice/a', 'languages': {'C': 3}}]).summary()
+        self.assertEqual(summary, {'total_repositories': 1, 'languages': {'C': {'bytes': 3, 'percentage': 100.0}}})
+
+    def test_aggregates(self):
+        repos = [{'repository': f'alice/{stars}', 'basic': {'stargazers_count': stars}} for stars in (1, 2, 3, 10)]
+        aggregates = parse_aggregates(['stars:median', 'stars:p90', 'stars:mean', 'stars:min', 'open_issues:max'])
+        self.assertEqual(ColumnarSummary(repos, aggregates).summary()['aggregates'], {
+            'stars': {'median': 2.5, 'p90': 7.9, 'mean': 4.0, 'min': 1},
+            'open_issues': {'max': None},
+        })
+
+    def test_parse_aggregates(self):
+        self.assertEqual(parse_aggregates(['stars:p95', 'stars:p95', 'forks:min']), [('stars', 'p95'), ('forks', 'min')])
+        for spec in ('stargazers:min', 'stars:p101', 'stars:mode', 'stars'):
+            with self.subTest(spec=spec):
+                with self.assertRaises(ValueError):
+                    parse_aggregates([spec])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""Tests for the summary-only mode (--summary-only) and its Search API totals."""
+
+import io
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from fake_api import FakeGitHub  # noqa: E402
+from github_metrics_tracker import GitHubMetricsTracker  # noqa: E402
+
+
+class SummaryOnlyTests(unittest.TestCase):
+    def track(self, api: FakeGitHub, **options):
+        transport = api.transport()
+        tracker = GitHubMetricsTracker(token='x', transport=transport, **options)
+        try:
+            with redirect_stdout(io.StringIO()):
+                return tracker.track_summary_only(), transport
+        finally:
+            tracker.close()
+
+    def test_summary_from_listing_and_search(self):
+        metrics, transport = self.track(FakeGitHub(count=4))
+        summary = metrics['summary']
+        self.assertEqual(summary['total_repositories'], 4)
+        self.assertEqual(summary['total_stars'], 0 + 3 + 6 + 9)
+        self.assertEqual(summary['private_repositories'], 1)
+        self.assertEqual((summary['total_open_issues'], summary['total_closed_issues']), (7, 7))
+        self.assertEqual((summary['total_open_prs'], summary['total_merged_prs']), (3, 3))
+        self.assertEqual(summary['most_starred'][0], {'name': 'alice/repo-3', 'stars': 9})
+        self.assertEqual(metrics['repositories'], [])
+        # No per-repository request is made
+        self.assertFalse([path for path in transport.paths() if path.startswith('/repos/')])
+
+    def test_request_count_does_not_grow_with_repositories(self):
+        _, small = self.track(FakeGitHub(count=2))
+        _, large = self.track(FakeGitHub(count=150))
+        # One more listing page, nothing per repository
+        self.assertEqual(len(large.requests), len(small.requests) + 1)
+
+    def test_search_queries_are_scoped_to_the_owner(self):
+        _, transport = self.track(FakeGitHub())
+        queries = [query['q'] for _, path, query, _ in transport.requests if path == '/search/issues']
+        self.assertEqual(queries, ['is:issue user:alice state:open', 'is:issue user:alice state:closed',
+                                   'is:pr user:alice state:open', 'is:pr user:alice is:merged'])
+
+    def test_shard_leaves_out_account_wide_totals(self):
+        metrics, transport = self.track(FakeGitHub(count=6), shard='1/2')
+        self.assertNotIn('total_open_issues', metrics['summary'])
+        self.assertNotIn('/search/issues', transport.paths())
+
+    def test_failed_search_is_left_out(self):
+        api = FakeGitHub()
+        api.fail.add('/search/issues')
+        metrics, _ = self.track(api)
+        self.assertNotIn('total_open_issues', metrics['summary'])
+        self.assertEqual(metrics['summary']['total_repositories'], 3)
+
+    def test_no_repositories(self):
+        metrics, _ = self.track(FakeGitHub(count=0))
+        self.assertEqual(metrics['summary'], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
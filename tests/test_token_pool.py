@@ -0,0 +1,114 @@
+"""Tests for the multi-token pool (--tokens) and the request cache keys it uses."""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from fake_api import FakeTransport  # noqa: E402
+from github_metrics_tracker import ConditionalRequestCache, GitHubMetricsTracker, TokenPool  # noqa: E402
+
+LOGINS = {'token alice-1': 'alice', 'token alice-2': 'Alice', 'token bob': 'bob'}
+INSTALLATION = {'token ghs-1', 'token ghs-2'}
+
+
+def handler(method, path, query, headers, body):
+    authorization = headers.get('Authorization')
+    if path == '/user':
+        if authorization in LOGINS:
+            return 200, {'login': LOGINS[authorization]}, {}
+        return 403, {'message': 'Resource not accessible by integration'}, {}
+    if path == '/installation/repositories':
+        if authorization in INSTALLATION:
+            return 200, {'total_count': 1, 'repositories': [{'full_name': 'alice/a'}]}, {}
+        return 403, {'message': 'Forbidden'}, {}
+    if path == '/repos/alice/a':
+        if headers.get('If-None-Match') == '"v1"':
+            return 304, None, {'ETag': '"v1"'}
+        return 200, {'full_name': 'alice/a', 'stargazers_count': 1}, {'ETag': '"v1"'}
+    return 404, {'message': 'Not Found'}, {}
+
+
+class CacheIdentityTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'cache.sqlite')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def fetch(self, token: str):
+        """Fetch one repository in a fresh run with the given token, returning the hits and the transport."""
+        cache = ConditionalRequestCache(self.path)
+        transport = FakeTransport(handler)
+        tracker = GitHubMetricsTracker(token=token, transport=transport, cache=cache)
+        try:
+            with redirect_stdout(io.StringIO()):
+                self.assertEqual(tracker._make_request('https://api.github.com/repos/alice/a')['stargazers_count'], 1)
+                tracker._make_request('https://api.github.com/repos/alice/a')
+            return cache.hits, transport
+        finally:
+            tracker.close()
+
+    def test_rotated_token_of_the_same_account_hits(self):
+        self.fetch('alice-1')
+        hits, transport = self.fetch('alice-2')
+        self.assertEqual(hits, 2)
+        # The account is resolved once per token, not once per request
+        self.assertEqual(transport.paths().count('/user'), 1)
+
+    def test_other_account_misses(self):
+        self.fetch('alice-1')
+        hits, _ = self.fetch('bob')
+        self.assertEqual(hits, 1)
+
+    def test_installation_tokens_are_keyed_by_their_repositories(self):
+        self.fetch('ghs-1')
+        hits, transport = self.fetch('ghs-2')
+        self.assertEqual(hits, 2)
+        self.assertIn('/installation/repositories', transport.paths())
+
+    def test_unresolvable_token_is_keyed_by_itself(self):
+        self.fetch('unknown-1')
+        self.assertEqual(self.fetch('unknown-2')[0], 1)
+        self.assertEqual(self.fetch('unknown-2')[0], 2)
+
+    def test_key_includes_the_identity(self):
+        key = ConditionalRequestCache.make_key('u', {'b': 2, 'a': 1}, {'Accept': 'x'}, 'user:alice')
+        self.assertEqual(key, 'u?a=1&b=2|x|user:alice')
+        self.assertNotEqual(key, ConditionalRequestCache.make_key('u', {'a': 1, 'b': 2}, {'Accept': 'x'}, 'user:bob'))
+
+
+class TokenPoolTests(unittest.TestCase):
+    def test_single_token_is_always_chosen(self):
+        self.assertEqual(TokenPool(['a']).select('https://api.github.com/repos/alice/a'), 0)
+
+    def test_repository_requests_go_to_the_token_with_most_budget(self):
+        pool = TokenPool(['a', 'b', 'c'])
+        for index, remaining in enumerate((100, 4000, 2000)):
+            pool.governors[index].set_budget('core', remaining, 4102444800)
+        self.assertEqual(pool.select('https://api.github.com/repos/alice/a/issues'), 1)
+        # Search is budgeted separately
+        self.assertEqual(pool.select('https://api.github.com/search/issues'), 0)
+
+    def test_account_requests_use_the_primary_token(self):
+        pool = TokenPool(['a', 'b'])
+        pool.governors[0].set_budget('core', 1, 4102444800)
+        self.assertEqual(pool.select('https://api.github.com/user/repos'), 0)
+
+    def test_private_repositories_only_use_tokens_that_see_them(self):
+        pool = TokenPool(['a', 'b', 'c'])
+        for index, remaining in enumerate((5, 4000, 10)):
+            pool.governors[index].set_budget('core', remaining, 4102444800)
+            pool.governors[index].set_budget('graphql', remaining, 4102444800)
+        pool.restrict('alice/private', [0, 2])
+        self.assertEqual(pool.select('https://api.github.com/repos/alice/private'), 2)
+        self.assertEqual(pool.select('https://api.github.com/repos/alice/a'), 1)
+        self.assertEqual(pool.select('https://api.github.com/graphql', repos=['alice/private', 'alice/a']), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
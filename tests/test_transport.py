@@ -0,0 +1,85 @@
+"""Tests for the pooled HTTP transport and how the tracker handles its errors."""
+
+import io
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from fake_api import FakeTransport, make_response  # noqa: E402
+from github_metrics_tracker import GitHubMetricsTracker, HTTPTransport, create_transport, httpx  # noqa: E402
+
+URL = 'https://api.github.com/repos/alice/a'
+
+
+class HTTPTransportTests(unittest.TestCase):
+    def test_one_pooled_session(self):
+        transport = HTTPTransport(pool_size=7)
+        try:
+            adapter = transport.session.get_adapter(URL)
+            self.assertIs(adapter, transport.session.get_adapter('https://uploads.github.com/'))
+            self.assertEqual(adapter._pool_maxsize, 7)
+            self.assertIn('gzip', transport.session.headers['Accept-Encoding'])
+        finally:
+            transport.close()
+
+    @unittest.skipIf(httpx is not None, 'httpx is installed')
+    def test_http2_falls_back_without_httpx(self):
+        with redirect_stdout(io.StringIO()) as output:
+            transport = create_transport(pool_size=3, http2=True)
+        self.assertIs(type(transport), HTTPTransport)
+        self.assertIn('falling back', output.getvalue())
+        transport.close()
+
+
+class RequestErrorTests(unittest.TestCase):
+    def request(self, handler):
+        transport = FakeTransport(handler)
+        tracker = GitHubMetricsTracker(token='secret', transport=transport)
+        try:
+            with redirect_stdout(io.StringIO()) as output:
+                result = tracker._request(URL)
+            return result, transport, output.getvalue()
+        finally:
+            tracker.close()
+
+    def test_request_carries_the_api_headers(self):
+        (data, headers, status), transport, _ = self.request(
+            lambda method, path, query, headers, body: (200, {'ok': True}, {'ETag': '"v"'}))
+        self.assertEqual((data, headers['etag'], status), ({'ok': True}, '"v"', 200))
+        sent = transport.requests[0][3]
+        self.assertEqual(sent['Authorization'], 'token secret')
+        self.assertEqual(sent['X-GitHub-Api-Version'], '2022-11-28')
+
+    def test_network_error_becomes_a_failed_request(self):
+        def handler(method, path, query, headers, body):
+            raise requests.exceptions.ConnectionError('connection reset')
+        (data, headers, status), _, output = self.request(handler)
+        self.assertEqual((data, dict(headers), status), (None, {}, None))
+        self.assertIn('connection reset', output)
+
+    def test_error_status_becomes_a_failed_request(self):
+        (data, _, status), _, output = self.request(
+            lambda method, path, query, headers, body: (404, {'message': 'Not Found'}, {}))
+        self.assertEqual((data, status), (None, None))
+        self.assertIn('404', output)
+
+    def test_unparsable_body_becomes_a_failed_request(self):
+        class BrokenBodyTransport(FakeTransport):
+            def request(self, method, url, headers=None, params=None, json=None):
+                response = make_response(url, 200)
+                response._content = b'<html>'
+                return response
+        tracker = GitHubMetricsTracker(token='x', transport=BrokenBodyTransport(None))
+        try:
+            with redirect_stdout(io.StringIO()):
+                self.assertIsNone(tracker._make_request(URL))
+        finally:
+            tracker.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
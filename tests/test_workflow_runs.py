@@ -0,0 +1,104 @@
+"""Tests for the workflow run statistics collected from the repository-wide runs listing."""
+
+import io
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+from datetime import date, datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from fake_api import FakeGitHub  # noqa: E402
+from github_metrics_tracker import GitHubMetricsTracker  # noqa: E402
+
+WORKFLOWS = {'total_count': 2, 'workflows': [
+    {'id': 1, 'name': 'CI', 'state': 'active', 'path': '.github/workflows/ci.yml'},
+    {'id': 2, 'name': 'Release', 'state': 'disabled_manually', 'path': '.github/workflows/release.yml'},
+]}
+
+
+class RunsGitHub(FakeGitHub):
+    """FakeGitHub with a number of workflow runs every day, filtered by the created date range."""
+
+    def __init__(self, runs_per_day: int = 3, busy_day: int = -1, limit: int = 1000):
+        super().__init__(count=1)
+        self.limit = limit
+        today = datetime.now(timezone.utc).date()
+        self.runs = []
+        for days_ago in range(31):
+            day = today - timedelta(days=days_ago)
+            for k in range(runs_per_day * (20 if days_ago == busy_day else 1)):
+                self.runs.append({
+                    'id': len(self.runs) + 1, 'workflow_id': 1 + k % 3, 'run_attempt': 1 + (k % 5 == 4),
+                    'conclusion': None if k % 7 == 6 else ('failure' if k % 4 == 3 else 'success'),
+                    'created_at': f'{day.isoformat()}T10:00:00Z', 'run_started_at': f'{day.isoformat()}T10:00:30Z',
+                    'updated_at': f'{day.isoformat()}T10:05:30Z'})
+
+    def repository_endpoint(self, index, section, path, query):
+        if section == 'actions/workflows':
+            return 200, WORKFLOWS, {}
+        if section != 'actions/runs':
+            return super().repository_endpoint(index, section, path, query)
+        start, end = (date.fromisoformat(day) for day in query['created'].split('..'))
+        runs = [run for run in self.runs if start <= date.fromisoformat(run['created_at'][:10]) <= end]
+        page, per_page = int(query['page']), int(query['per_page'])
+        # Like the API, a filtered listing stops after a number of runs
+        listed = runs[:self.limit]
+        return 200, {'total_count': len(runs), 'workflow_runs': listed[(page - 1) * per_page:page * per_page]}, {}
+
+
+class WorkflowRunsTests(unittest.TestCase):
+    def collect(self, api: RunsGitHub):
+        transport = api.transport()
+        tracker = GitHubMetricsTracker(token='x', transport=transport, stats_deadline=0, workflow_run_window=30)
+        tracker.WORKFLOW_RUNS_LIMIT = api.limit
+        try:
+            with redirect_stdout(io.StringIO()):
+                return tracker.get_workflows_metrics('alice/repo-0'), transport
+        finally:
+            tracker.close()
+
+    @staticmethod
+    def expected(api: RunsGitHub, workflow_id: int):
+        runs = [run for run in api.runs if run['workflow_id'] == workflow_id]
+        completed = [run for run in runs if run['conclusion']]
+        return len(runs), sum(run['conclusion'] == 'success' for run in completed) / len(completed)
+
+    def test_statistics_come_from_the_runs_listing(self):
+        api = RunsGitHub()
+        metrics, transport = self.collect(api)
+        ci, release = metrics['workflows']
+        self.assertEqual((ci['total_runs'], ci['success_rate']), self.expected(api, 1))
+        self.assertEqual((release['total_runs'], release['success_rate']), self.expected(api, 2))
+        self.assertEqual((ci['duration_p50_seconds'], ci['queue_p95_seconds']), (300.0, 30.0))
+        self.assertEqual(metrics['runs_status'], 'complete')
+        self.assertEqual(metrics['active_workflows'], 1)
+        # One listing for the repository, not one per workflow
+        self.assertEqual([path for path in transport.paths() if 'runs' in path], ['/repos/alice/repo-0/actions/runs'])
+
+    def test_window_beyond_the_listing_limit_is_split(self):
+        api = RunsGitHub(limit=20)
+        metrics, transport = self.collect(api)
+        self.assertEqual(metrics['workflows'][0]['total_runs'], self.expected(api, 1)[0])
+        self.assertEqual(metrics['runs_status'], 'complete')
+        self.assertGreater(transport.paths().count('/repos/alice/repo-0/actions/runs'), 4)
+
+    def test_day_beyond_the_listing_limit_is_truncated(self):
+        api = RunsGitHub(busy_day=3, limit=20)
+        metrics, _ = self.collect(api)
+        self.assertEqual(metrics['runs_status'], 'truncated')
+        self.assertLess(metrics['workflows'][0]['total_runs'], self.expected(api, 1)[0])
+
+    def test_failed_listing_reports_unknown_statistics(self):
+        api = RunsGitHub()
+        api.fail.add('/repos/alice/repo-0/actions/runs')
+        metrics, _ = self.collect(api)
+        self.assertEqual(metrics['runs_status'], 'failed')
+        self.assertEqual(metrics['total_workflows'], 2)
+        self.assertEqual(metrics['workflows'][0]['name'], 'CI')
+        self.assertIsNone(metrics['workflows'][0]['total_runs'])
+        self.assertIsNone(metrics['workflows'][0]['success_rate'])
+
+
+if __name__ == '__main__':
+    unittest.main()